@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import RollupCursor, StageDailyRollup
+
+
+@admin.register(StageDailyRollup)
+class StageDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("id", "project", "stage", "day", "entries", "exits", "conversions")
+    list_filter = ("day",)
+    autocomplete_fields = ("project", "stage")
+
+
+@admin.register(RollupCursor)
+class RollupCursorAdmin(admin.ModelAdmin):
+    list_display = ("name", "last_event_id", "updated_at")
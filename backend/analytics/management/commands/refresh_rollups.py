@@ -0,0 +1,23 @@
+from analytics.rollups import rebuild_rollups, refresh_rollups
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Update pipeline analytics rollups from new stage change events (run from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--lag", type=int, help="Skip events newer than N seconds (default: settings)"
+        )
+        parser.add_argument(
+            "--rebuild", action="store_true", help="Drop rollups and recompute from scratch"
+        )
+
+    def handle(self, *args, **options):
+        run = rebuild_rollups if options["rebuild"] else refresh_rollups
+        try:
+            processed = run(batch_size=options["batch_size"], lag_seconds=options["lag"])
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} events"))
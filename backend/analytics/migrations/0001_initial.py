@@ -0,0 +1,77 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:17
+
+import analytics.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("pipeline", "0003_application_updated_index"),
+        ("projects", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupCursor",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("last_event_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StageDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("entries", models.PositiveIntegerField(default=0)),
+                ("exits", models.PositiveIntegerField(default=0)),
+                ("conversions", models.PositiveIntegerField(default=0)),
+                ("dwell_count", models.PositiveIntegerField(default=0)),
+                ("dwell_seconds", models.BigIntegerField(default=0)),
+                ("dwell_histogram", models.JSONField(default=analytics.models.empty_histogram)),
+                ("reach_count", models.PositiveIntegerField(default=0)),
+                ("reach_seconds", models.BigIntegerField(default=0)),
+                ("reach_histogram", models.JSONField(default=analytics.models.empty_histogram)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="projects.project",
+                    ),
+                ),
+                (
+                    "stage",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="pipeline.stage",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["day"], name="rollup_day_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "stage", "day"), name="uniq_rollup_project_stage_day"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+from django.db import models
+
+# Межі бакетів гістограми тривалостей (секунди). Останній бакет — «довше за 180 днів».
+# Перцентилі не можна складати між днями, а гістограми — можна.
+HOUR = 3600
+DAY = 24 * HOUR
+DURATION_BUCKETS = [
+    HOUR,
+    4 * HOUR,
+    12 * HOUR,
+    DAY,
+    2 * DAY,
+    3 * DAY,
+    5 * DAY,
+    7 * DAY,
+    10 * DAY,
+    14 * DAY,
+    21 * DAY,
+    30 * DAY,
+    45 * DAY,
+    60 * DAY,
+    90 * DAY,
+    180 * DAY,
+]
+
+
+def empty_histogram() -> list[int]:
+    return [0] * (len(DURATION_BUCKETS) + 1)
+
+
+class StageDailyRollup(models.Model):
+    """
+    Денний агрегат переходів по (проєкт, стадія).
+
+    entries — входи у стадію, exits — виходи зі стадії,
+    conversions — виходи вперед по пайплайну (не у відмову).
+    dwell_* — час перебування у стадії (рахується в день виходу),
+    reach_* — час від створення заявки до входу у стадію (для "hired" — time-to-hire).
+    """
+
+    project = models.ForeignKey("projects.Project", on_delete=models.CASCADE, related_name="+")
+    stage = models.ForeignKey("pipeline.Stage", on_delete=models.CASCADE, related_name="+")
+    day = models.DateField()
+
+    entries = models.PositiveIntegerField(default=0)
+    exits = models.PositiveIntegerField(default=0)
+    conversions = models.PositiveIntegerField(default=0)
+
+    dwell_count = models.PositiveIntegerField(default=0)
+    dwell_seconds = models.BigIntegerField(default=0)
+    dwell_histogram = models.JSONField(default=empty_histogram)
+
+    reach_count = models.PositiveIntegerField(default=0)
+    reach_seconds = models.BigIntegerField(default=0)
+    reach_histogram = models.JSONField(default=empty_histogram)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "stage", "day"], name="uniq_rollup_project_stage_day"
+            ),
+        ]
+        indexes = [
+            # дашборди по всіх видимих проєктах: фільтр за діапазоном днів
+            models.Index(fields=["day"], name="rollup_day_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.project_id}:{self.stage_id}:{self.day}"
+
+
+class RollupCursor(models.Model):
+    """
+    High-water mark: id останнього StageChangeEvent, врахованого в rollup-ах.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    last_event_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name}:{self.last_event_id}"
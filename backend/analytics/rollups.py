@@ -0,0 +1,259 @@
+"""
+Інкрементальне оновлення StageDailyRollup зі StageChangeEvent.
+
+Обробляємо лише події з id > high-water mark (RollupCursor), пачками по id.
+Кожна пачка — одна транзакція: дельти рахуються в Python, існуючі рядки
+rollup-ів дочитуються одним запитом і пишуться через bulk_update/bulk_create,
+а курсор зсувається разом із ними.
+
+Події, молодші за ANALYTICS_ROLLUP_LAG_SECONDS, не беремо: транзакція з меншим
+id може закомітитись пізніше за сусідню, і курсор би її «перестрибнув».
+"""
+
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from pipeline.archive import last_archived_change
+from pipeline.models import Application, ArchivedStageChangeEvent, Stage, StageChangeEvent
+
+from .models import DURATION_BUCKETS, RollupCursor, StageDailyRollup, empty_histogram
+
+CURSOR_NAME = "stage_daily"
+
+# перехід у ці стадії — вихід без конверсії
+LOST_STAGE_KEYS = ("rejected",)
+
+COUNTERS = ("entries", "exits", "conversions", "dwell_count", "dwell_seconds")
+REACH_COUNTERS = ("reach_count", "reach_seconds")
+
+
+def add_sample(histogram: list[int], seconds: float) -> None:
+    histogram[bisect_left(DURATION_BUCKETS, seconds)] += 1
+
+
+def merge_histograms(histograms) -> list[int]:
+    merged = empty_histogram()
+    for histogram in histograms:
+        for idx, value in enumerate(histogram):
+            merged[idx] += value
+    return merged
+
+
+def percentile(histogram: list[int], q: float):
+    """
+    Наближений перцентиль (секунди): лінійна інтерполяція всередині бакета.
+    Для останнього (відкритого) бакета повертає його нижню межу.
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+
+    rank = q * total
+    seen = 0
+    for idx, count in enumerate(histogram):
+        if not count or seen + count < rank:
+            seen += count
+            continue
+        lower = DURATION_BUCKETS[idx - 1] if idx else 0
+        if idx >= len(DURATION_BUCKETS):
+            return lower
+        upper = DURATION_BUCKETS[idx]
+        return round(lower + (upper - lower) * (rank - seen) / count)
+    return DURATION_BUCKETS[-1]
+
+
+def rolled_up_event_id() -> int:
+    """
+    High-water mark: події з меншим або рівним id уже в rollup-ах
+    (лише їх можна переносити в архів — pipeline/archive.py).
+    """
+    cursor = RollupCursor.objects.filter(name=CURSOR_NAME).first()
+    return cursor.last_event_id if cursor else 0
+
+
+def refresh_rollups(batch_size: int = 5000, lag_seconds: int | None = None) -> int:
+    """
+    Доганяє rollup-и до останніх подій. Повертає кількість оброблених подій.
+    """
+    if lag_seconds is None:
+        lag_seconds = settings.ANALYTICS_ROLLUP_LAG_SECONDS
+    cutoff = timezone.now() - timedelta(seconds=lag_seconds)
+
+    processed = 0
+    while True:
+        count, exhausted = _process_batch(batch_size, cutoff)
+        processed += count
+        if exhausted:
+            return processed
+
+
+def rebuild_rollups(batch_size: int = 5000, lag_seconds: int | None = None) -> int:
+    """
+    Повний перерахунок з нуля (після зміни логіки агрегації).
+    Архівні події в перерахунок не потрапляють, тож після архівації він заборонений.
+    """
+    if ArchivedStageChangeEvent.objects.exists():
+        raise RuntimeError("Stage change events were archived; rebuilding would lose them")
+
+    with transaction.atomic():
+        StageDailyRollup.objects.all().delete()
+        RollupCursor.objects.filter(name=CURSOR_NAME).update(last_event_id=0)
+    return refresh_rollups(batch_size=batch_size, lag_seconds=lag_seconds)
+
+
+def _process_batch(batch_size: int, cutoff) -> tuple[int, bool]:
+    with transaction.atomic():
+        RollupCursor.objects.get_or_create(name=CURSOR_NAME)
+        # один оновлювач за раз (на PostgreSQL — блокування рядка курсора)
+        cursor = RollupCursor.objects.select_for_update().get(name=CURSOR_NAME)
+
+        events = list(
+            StageChangeEvent.objects.filter(id__gt=cursor.last_event_id)
+            .order_by("id")
+            .values("id", "application_id", "from_stage_id", "to_stage_id", "changed_at")[
+                :batch_size
+            ]
+        )
+        exhausted = len(events) < batch_size
+
+        # зупиняємось на першій «свіжій» події, щоб не пропустити ще не закомічені
+        for idx, event in enumerate(events):
+            if event["changed_at"] >= cutoff:
+                events = events[:idx]
+                exhausted = True
+                break
+
+        if not events:
+            return 0, True
+
+        deltas = _collect_deltas(events, cursor.last_event_id)
+        _apply_deltas(deltas)
+
+        cursor.last_event_id = events[-1]["id"]
+        cursor.save(update_fields=["last_event_id", "updated_at"])
+
+    return len(events), exhausted
+
+
+def _collect_deltas(events: list[dict], last_event_id: int) -> dict:
+    app_ids = {e["application_id"] for e in events}
+    stage_ids = {e["to_stage_id"] for e in events} | {
+        e["from_stage_id"] for e in events if e["from_stage_id"]
+    }
+
+    applications = {
+        row["id"]: row
+        for row in Application.objects.filter(id__in=app_ids).values(
+            "id", "project_id", "created_at"
+        )
+    }
+    stages = {
+        row["id"]: row
+        for row in Stage.objects.filter(id__in=stage_ids).values("id", "order", "system_key")
+    }
+
+    # коли заявка увійшла у свою поточну стадію до цієї пачки (індекс application+changed_at)
+    entered_at = dict(
+        StageChangeEvent.objects.filter(application_id__in=app_ids, id__lte=last_event_id)
+        .values("application_id")
+        .annotate(last=Max("changed_at"))
+        .values_list("application_id", "last")
+    )
+    # заявка могла зайти у стадію ще до архівації своїх старих подій
+    first_events = {}
+    for event in events:
+        first_events.setdefault(event["application_id"], event)
+    missing = {
+        app_id
+        for app_id, event in first_events.items()
+        if event["from_stage_id"] and app_id not in entered_at
+    }
+    if missing:
+        entered_at.update(last_archived_change(missing))
+
+    deltas: dict[tuple, dict] = {}
+
+    def bucket(project_id, stage_id, day) -> dict:
+        key = (project_id, stage_id, day)
+        if key not in deltas:
+            deltas[key] = {
+                **{name: 0 for name in COUNTERS + REACH_COUNTERS},
+                "dwell_histogram": empty_histogram(),
+                "reach_histogram": empty_histogram(),
+            }
+        return deltas[key]
+
+    for event in events:
+        application = applications.get(event["application_id"])
+        to_stage = stages.get(event["to_stage_id"])
+        if not application or not to_stage:
+            continue
+
+        project_id = application["project_id"]
+        changed_at = event["changed_at"]
+        day = timezone.localdate(changed_at)
+
+        entry = bucket(project_id, to_stage["id"], day)
+        entry["entries"] += 1
+        reach = max((changed_at - application["created_at"]).total_seconds(), 0)
+        entry["reach_count"] += 1
+        entry["reach_seconds"] += int(reach)
+        add_sample(entry["reach_histogram"], reach)
+
+        from_stage = stages.get(event["from_stage_id"])
+        if from_stage:
+            exit_ = bucket(project_id, from_stage["id"], day)
+            exit_["exits"] += 1
+            if (
+                to_stage["order"] > from_stage["order"]
+                and to_stage["system_key"] not in LOST_STAGE_KEYS
+            ):
+                exit_["conversions"] += 1
+
+            since = entered_at.get(event["application_id"])
+            if since is not None:
+                dwell = max((changed_at - since).total_seconds(), 0)
+                exit_["dwell_count"] += 1
+                exit_["dwell_seconds"] += int(dwell)
+                add_sample(exit_["dwell_histogram"], dwell)
+
+        entered_at[event["application_id"]] = changed_at
+
+    return deltas
+
+
+def _apply_deltas(deltas: dict) -> None:
+    if not deltas:
+        return
+
+    project_ids = {key[0] for key in deltas}
+    days = {key[2] for key in deltas}
+    existing = {
+        (row.project_id, row.stage_id, row.day): row
+        for row in StageDailyRollup.objects.filter(project_id__in=project_ids, day__in=days)
+    }
+
+    to_update, to_create = [], []
+    for (project_id, stage_id, day), delta in deltas.items():
+        row = existing.get((project_id, stage_id, day))
+        if row is None:
+            row = StageDailyRollup(project_id=project_id, stage_id=stage_id, day=day)
+            to_create.append(row)
+        else:
+            to_update.append(row)
+
+        for name in COUNTERS + REACH_COUNTERS:
+            setattr(row, name, getattr(row, name) + delta[name])
+        row.dwell_histogram = merge_histograms([row.dwell_histogram, delta["dwell_histogram"]])
+        row.reach_histogram = merge_histograms([row.reach_histogram, delta["reach_histogram"]])
+
+    if to_update:
+        StageDailyRollup.objects.bulk_update(
+            to_update, [*COUNTERS, *REACH_COUNTERS, "dwell_histogram", "reach_histogram"]
+        )
+    if to_create:
+        StageDailyRollup.objects.bulk_create(to_create)
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    """
+    Query-параметри дашбордів. За замовчуванням — останні 90 днів.
+    """
+
+    DEFAULT_DAYS = 90
+
+    project_id = serializers.IntegerField(required=False)
+    department = serializers.CharField(required=False, allow_blank=True)
+    owner_id = serializers.IntegerField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        date_to = attrs.get("date_to") or timezone.localdate()
+        date_from = attrs.get("date_from") or date_to - timedelta(days=self.DEFAULT_DAYS)
+        if date_from > date_to:
+            raise serializers.ValidationError({"date_from": "date_from must be <= date_to"})
+
+        attrs["date_from"] = date_from
+        attrs["date_to"] = date_to
+        return attrs
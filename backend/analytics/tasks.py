@@ -0,0 +1,17 @@
+"""
+Фонові задачі аналітики (jobs/registry.py).
+"""
+
+from jobs.registry import job_handler
+
+from .rollups import rebuild_rollups, refresh_rollups
+
+
+@job_handler("analytics.refresh_rollups", api=True)
+def refresh_rollups_job(ctx) -> dict:
+    return {"processed": refresh_rollups(lag_seconds=ctx.params.get("lag_seconds"))}
+
+
+@job_handler("analytics.rebuild_rollups", max_attempts=1, api=True)
+def rebuild_rollups_job(ctx) -> dict:
+    return {"processed": rebuild_rollups(lag_seconds=ctx.params.get("lag_seconds"))}
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from candidates.models import Candidate
+from django.test import TestCase
+from django.utils import timezone
+from pipeline.models import Application, Stage, StageChangeEvent
+from projects.models import Project, ProjectMember
+from rest_framework.test import APIClient
+from users.models import User
+
+from .models import StageDailyRollup
+from .rollups import rebuild_rollups, refresh_rollups
+
+ROLLUP_FIELDS = (
+    "project_id",
+    "stage_id",
+    "day",
+    "entries",
+    "exits",
+    "conversions",
+    "dwell_count",
+    "dwell_seconds",
+    "dwell_histogram",
+    "reach_count",
+    "reach_seconds",
+    "reach_histogram",
+)
+
+
+class StageRollupTests(TestCase):
+    """
+    Інкрементальні rollup-и мають збігатися з повним перерахунком,
+    а дашборди — читати лише їх.
+    """
+
+    databases = {"default", "archive"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        cls.recruiter = User.objects.create_user(
+            email="rec@example.com", password="x", role=User.Role.RECRUITER
+        )
+        cls.project = Project.objects.create(title="Backend", owner=cls.admin)
+        cls.other = Project.objects.create(title="Hidden", owner=cls.admin)
+        ProjectMember.objects.create(project=cls.project, user=cls.recruiter)
+        cls.stages = {s.system_key: s for s in Stage.objects.filter(project=cls.project)}
+
+        cls.start = timezone.now() - timedelta(days=20)
+        cls.apps = []
+        for idx in range(4):
+            candidate = Candidate.objects.create(
+                first_name="Cand", last_name=str(idx), email=f"c{idx}@example.com"
+            )
+            cls.apps.append(
+                Application.objects.create(
+                    project=cls.project, candidate=candidate, current_stage=cls.stages["new"]
+                )
+            )
+        Application.objects.update(created_at=cls.start)
+
+    def move(self, app, from_key, to_key, days):
+        event = StageChangeEvent.objects.create(
+            application=app,
+            from_stage=self.stages[from_key] if from_key else None,
+            to_stage=self.stages[to_key],
+            changed_by=self.admin,
+        )
+        StageChangeEvent.objects.filter(id=event.id).update(
+            changed_at=self.start + timedelta(days=days)
+        )
+
+    def snapshot(self):
+        return list(
+            StageDailyRollup.objects.order_by("project_id", "stage_id", "day").values(
+                *ROLLUP_FIELDS
+            )
+        )
+
+    def test_incremental_matches_rebuild_and_dashboards(self):
+        for app in self.apps:
+            self.move(app, None, "new", 0)
+        self.move(self.apps[0], "new", "screening", 2)
+        self.move(self.apps[1], "new", "rejected", 3)
+
+        self.assertEqual(refresh_rollups(batch_size=2, lag_seconds=0), 6)
+
+        self.move(self.apps[0], "screening", "hired", 7)
+        self.move(self.apps[2], "new", "screening", 2)
+        self.assertEqual(refresh_rollups(lag_seconds=0), 2)
+        self.assertEqual(refresh_rollups(lag_seconds=0), 0)
+
+        incremental = self.snapshot()
+        self.assertEqual(rebuild_rollups(lag_seconds=0), 8)
+        self.assertEqual(self.snapshot(), incremental)
+
+        client = APIClient()
+        client.force_authenticate(self.recruiter)
+        date_from = (self.start - timedelta(days=1)).date()
+
+        response = client.get("/api/v1/analytics/funnel/", {"date_from": date_from})
+        self.assertEqual(response.status_code, 200, response.content)
+        funnel = {row["system_key"]: row for row in response.json()["stages"]}
+        self.assertEqual(funnel["new"]["entries"], 4)
+        self.assertEqual(funnel["new"]["exits"], 3)
+        self.assertEqual(funnel["new"]["conversions"], 2)
+        self.assertEqual(funnel["screening"]["conversions"], 1)
+
+        response = client.get("/api/v1/analytics/dwell-time/", {"date_from": date_from})
+        dwell = {row["system_key"]: row for row in response.json()["stages"]}
+        self.assertEqual(dwell["new"]["count"], 3)
+        self.assertEqual(dwell["screening"]["avg_seconds"], 5 * 24 * 3600)
+
+        response = client.get("/api/v1/analytics/time-to-hire/", {"date_from": date_from})
+        data = response.json()
+        self.assertEqual(data["overall"]["count"], 1)
+        self.assertEqual(data["overall"]["avg_seconds"], 7 * 24 * 3600)
+        self.assertEqual([row["project_id"] for row in data["by_project"]], [self.project.id])
+
+        # рекрутер не бачить чужі проєкти
+        response = client.get(
+            "/api/v1/analytics/funnel/", {"date_from": date_from, "project_id": self.other.id}
+        )
+        self.assertEqual(response.json()["stages"], [])
@@ -0,0 +1,8 @@
+from rest_framework.routers import DefaultRouter
+
+from .views import AnalyticsViewSet
+
+router = DefaultRouter()
+router.register(r"analytics", AnalyticsViewSet, basename="analytics")
+
+urlpatterns = router.urls
@@ -0,0 +1,178 @@
+from django.db.models import Min, Sum
+from projects.models import Project
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .models import RollupCursor, StageDailyRollup
+from .rollups import CURSOR_NAME, merge_histograms, percentile
+from .serializers import AnalyticsQuerySerializer
+
+
+def duration_stats(count: int, seconds: int, histogram: list[int]) -> dict:
+    return {
+        "count": count,
+        "avg_seconds": round(seconds / count) if count else None,
+        "p50_seconds": percentile(histogram, 0.5),
+        "p90_seconds": percentile(histogram, 0.9),
+    }
+
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """
+    Дашборди пайплайна. Читають лише StageDailyRollup (оновлюється refresh_rollups),
+    а не таблицю подій. Стадії різних проєктів зводяться за system_key.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_rollups(self, request):
+        params = AnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        qs = StageDailyRollup.objects.filter(
+            day__gte=filters["date_from"], day__lte=filters["date_to"]
+        )
+
+        # ADMIN/HR бачать все, інші — тільки проєкти, де вони учасники
+        user = request.user
+        if not (user.is_superuser or getattr(user, "role", None) in ("ADMIN", "HR_MANAGER")):
+            qs = qs.filter(
+                project_id__in=Project.objects.filter(memberships__user=user).values("id")
+            )
+
+        if filters.get("project_id"):
+            qs = qs.filter(project_id=filters["project_id"])
+        if filters.get("department"):
+            qs = qs.filter(project__department=filters["department"])
+        if filters.get("owner_id"):
+            qs = qs.filter(project__owner_id=filters["owner_id"])
+
+        return qs, filters
+
+    def envelope(self, filters, **data) -> dict:
+        cursor = RollupCursor.objects.filter(name=CURSOR_NAME).first()
+        return {
+            "date_from": filters["date_from"],
+            "date_to": filters["date_to"],
+            "refreshed_at": cursor.updated_at if cursor else None,
+            **data,
+        }
+
+    @action(detail=False, methods=["get"], url_path="funnel")
+    def funnel(self, request):
+        """
+        Воронка: входи/виходи/конверсії по стадіях.
+        conversion_rate = conversions / exits (частка виходів уперед, не у відмову).
+        """
+        qs, filters = self.get_rollups(request)
+        rows = (
+            qs.values("stage__system_key")
+            .annotate(
+                name=Min("stage__name"),
+                order=Min("stage__order"),
+                entries=Sum("entries"),
+                exits=Sum("exits"),
+                conversions=Sum("conversions"),
+            )
+            .order_by("order", "stage__system_key")
+        )
+
+        stages = [
+            {
+                "system_key": row["stage__system_key"],
+                "name": row["name"],
+                "entries": row["entries"],
+                "exits": row["exits"],
+                "conversions": row["conversions"],
+                "conversion_rate": (
+                    round(row["conversions"] / row["exits"], 4) if row["exits"] else None
+                ),
+            }
+            for row in rows
+        ]
+        return Response(self.envelope(filters, stages=stages))
+
+    @action(detail=False, methods=["get"], url_path="dwell-time")
+    def dwell_time(self, request):
+        """
+        Час перебування у стадії (за днем виходу): avg / p50 / p90.
+        """
+        qs, filters = self.get_rollups(request)
+        rows = (
+            qs.filter(dwell_count__gt=0)
+            .values_list(
+                "stage__system_key",
+                "stage__name",
+                "stage__order",
+                "dwell_count",
+                "dwell_seconds",
+                "dwell_histogram",
+            )
+            .order_by()
+        )
+
+        grouped: dict[str, dict] = {}
+        for key, name, order, count, seconds, histogram in rows:
+            group = grouped.setdefault(
+                key,
+                {"name": name, "order": order, "count": 0, "seconds": 0, "histograms": []},
+            )
+            group["order"] = min(group["order"], order)
+            group["count"] += count
+            group["seconds"] += seconds
+            group["histograms"].append(histogram)
+
+        stages = [
+            {
+                "system_key": key,
+                "name": group["name"],
+                **duration_stats(
+                    group["count"], group["seconds"], merge_histograms(group["histograms"])
+                ),
+            }
+            for key, group in sorted(grouped.items(), key=lambda item: (item[1]["order"], item[0]))
+        ]
+        return Response(self.envelope(filters, stages=stages))
+
+    @action(detail=False, methods=["get"], url_path="time-to-hire")
+    def time_to_hire(self, request):
+        """
+        Від створення заявки до входу у стадію "hired" — загалом і по проєктах.
+        """
+        qs, filters = self.get_rollups(request)
+        rows = (
+            qs.filter(stage__system_key="hired", reach_count__gt=0)
+            .values_list(
+                "project_id", "project__title", "reach_count", "reach_seconds", "reach_histogram"
+            )
+            .order_by()
+        )
+
+        projects: dict[int, dict] = {}
+        for project_id, title, count, seconds, histogram in rows:
+            group = projects.setdefault(
+                project_id, {"title": title, "count": 0, "seconds": 0, "histograms": []}
+            )
+            group["count"] += count
+            group["seconds"] += seconds
+            group["histograms"].append(histogram)
+
+        by_project = [
+            {
+                "project_id": project_id,
+                "title": group["title"],
+                **duration_stats(
+                    group["count"], group["seconds"], merge_histograms(group["histograms"])
+                ),
+            }
+            for project_id, group in sorted(projects.items())
+        ]
+        overall = duration_stats(
+            sum(group["count"] for group in projects.values()),
+            sum(group["seconds"] for group in projects.values()),
+            merge_histograms(h for group in projects.values() for h in group["histograms"]),
+        )
+        return Response(self.envelope(filters, overall=overall, by_project=by_project))
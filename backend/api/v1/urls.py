@@ -1,10 +1,17 @@
-from core.views import health
+from core.views import batch, health, metrics, profile_detail, profile_folded, profiles
 from django.urls import include, path
 
 urlpatterns = [
     path("health/", health, name="health"),
+    path("batch/", batch, name="batch"),
+    path("metrics/", metrics, name="metrics"),
+    path("profiles/", profiles, name="profiles"),
+    path("profiles/<str:profile_id>/", profile_detail, name="profile-detail"),
+    path("profiles/<str:profile_id>/folded/", profile_folded, name="profile-folded"),
     path("", include("users.urls")),
     path("", include("projects.urls")),
     path("", include("candidates.urls")),
     path("", include("pipeline.urls")),
+    path("", include("analytics.urls")),
+    path("", include("jobs.urls")),
 ]
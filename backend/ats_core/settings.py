@@ -14,6 +14,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -82,9 +84,17 @@ INSTALLED_APPS = [
     "projects.apps.ProjectsConfig",
     "candidates",
     "pipeline",
+    "analytics",
+    "integrations",
+    "jobs",
 ]
 
 MIDDLEWARE = [
+    # першою: міряє весь запит, включно з рештою middleware
+    "core.middleware.MetricsMiddleware",
+    "core.timing.ServerTimingMiddleware",
+    "core.middleware.ProfilingMiddleware",
+    "core.middleware.SqlStatsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     # CORS middleware should be high in the list
     "corsheaders.middleware.CorsMiddleware",
@@ -122,13 +132,120 @@ ASGI_APPLICATION = "ats_core.asgi.application"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 # Database (SQLite)
 DB_NAME = os.environ.get("DB_NAME", "db.sqlite3")
+ARCHIVE_DB_NAME = os.environ.get("ARCHIVE_DB_NAME", "db_archive.sqlite3")
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / DB_NAME,
-    }
+    },
+    # холодний архів StageChangeEvent (pipeline/archive.py);
+    # схема: python manage.py migrate --database archive
+    "archive": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / ARCHIVE_DB_NAME,
+    },
 }
+DATABASE_ROUTERS = ["core.routers.ArchiveRouter"]
 
+# події, старші за N місяців, переносяться в архів (manage.py archive_events)
+EVENT_RETENTION_MONTHS = int(os.environ.get("EVENT_RETENTION_MONTHS", "24"))
+
+
+# Cache
+# "payloads" — серіалізовані kanban/summary/detail payload-и (core/cache.py).
+# LocMemCache — LRU з обмеженням MAX_ENTRIES; для кількох worker-процесів
+# варто перемкнути на FileBasedCache (PAYLOAD_CACHE_BACKEND/PAYLOAD_CACHE_LOCATION).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "payloads": {
+        "BACKEND": os.environ.get(
+            "PAYLOAD_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("PAYLOAD_CACHE_LOCATION", "ats-payloads"),
+        "TIMEOUT": int(os.environ.get("PAYLOAD_CACHE_TIMEOUT", "600")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("PAYLOAD_CACHE_MAX_ENTRIES", "2000")),
+        },
+    },
+}
+PAYLOAD_CACHE_ALIAS = "payloads"
+PAYLOAD_CACHE_ENABLED = _env_bool("PAYLOAD_CACHE_ENABLED", "1")
+
+# In-process кеш стадій проєктів (pipeline/stages.py): максимум проєктів на процес
+STAGE_CACHE_MAX_PROJECTS = int(os.environ.get("STAGE_CACHE_MAX_PROJECTS", "5000"))
+
+# Batch API (core/batch.py): максимум під-запитів в одному виклику
+BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "20"))
+
+# Метрики Prometheus (core/metrics.py, /api/v1/metrics/). METRICS_DIR — спільна
+# тека для знімків процесів; без неї кожен процес віддає лише свої лічильники
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", "1")
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", "5"))
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+# Знімки процесів (METRICS_DIR, SQL_STATS_DIR) з інших хостів, що не оновлювались
+# стільки секунд, видаляються; на своєму хості — одразу після завершення процесу
+PROCESS_SNAPSHOT_MAX_AGE_SECONDS = int(os.environ.get("PROCESS_SNAPSHOT_MAX_AGE_SECONDS", "86400"))
+
+# Server-Timing (core/timing.py): частка запитів з розбивкою по фазах;
+# у DEBUG ще й ?_timing=1 для будь-якого запиту
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.environ.get("SERVER_TIMING_SAMPLE_RATE", "1" if DEBUG else "0")
+)
+
+# Профілювання запитів (core/profiling.py): семплер стеків + SQL з EXPLAIN.
+# Зберігаються PROFILE_SAMPLE_RATE запитів і всі, довші за PROFILE_SLOW_MS (0 — ні)
+PROFILING_ENABLED = _env_bool("PROFILING_ENABLED", "0")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", "1000"))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+# без PROFILE_DIR профілі нікуди зберігати — профілювання не вмикається
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "")
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", "200"))
+PROFILE_MAX_QUERIES = int(os.environ.get("PROFILE_MAX_QUERIES", "500"))
+PROFILE_EXPLAIN_TOP = int(os.environ.get("PROFILE_EXPLAIN_TOP", "3"))
+
+# Статистика SQL по fingerprint-ах (core/sqlstats.py, manage.py sql_report).
+# Запити довші за SLOW_QUERY_MS пишуться в лог core.sqlstats без параметрів.
+# SQL_STATS_DIR — як METRICS_DIR: без неї звіт бачить лише поточний процес
+SQL_STATS_ENABLED = _env_bool("SQL_STATS_ENABLED", "1")
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+SQL_STATS_DIR = os.environ.get("SQL_STATS_DIR", "")
+SQL_STATS_FLUSH_SECONDS = float(os.environ.get("SQL_STATS_FLUSH_SECONDS", "10"))
+SQL_STATS_MAX_KEYS = int(os.environ.get("SQL_STATS_MAX_KEYS", "5000"))
+
+# In-process кеш рядків користувачів (users/cache.py): зміна ролі чи деактивація
+# в інших процесах відхиляє старі access-токени не пізніше ніж за TTL
+USER_CACHE_TTL_SECONDS = int(os.environ.get("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Analytics rollups (analytics/rollups.py): події, молодші за lag, чекають
+# наступного запуску refresh_rollups
+ANALYTICS_ROLLUP_LAG_SECONDS = int(os.environ.get("ANALYTICS_ROLLUP_LAG_SECONDS", "30"))
+
+# Board history (pipeline/history.py): snapshot дошки кожні N подій проєкту,
+# тож replay для історичної дошки обмежений N подіями
+BOARD_SNAPSHOT_EVERY_EVENTS = int(os.environ.get("BOARD_SNAPSHOT_EVERY_EVENTS", "500"))
+BOARD_SNAPSHOT_LAG_SECONDS = int(os.environ.get("BOARD_SNAPSHOT_LAG_SECONDS", "300"))
+
+# Webhooks (integrations/delivery.py, manage.py deliver_webhooks)
+WEBHOOK_BATCH_SIZE = int(os.environ.get("WEBHOOK_BATCH_SIZE", "100"))
+WEBHOOK_CONCURRENCY = int(os.environ.get("WEBHOOK_CONCURRENCY", "4"))
+WEBHOOK_TIMEOUT_SECONDS = float(os.environ.get("WEBHOOK_TIMEOUT_SECONDS", "10"))
+WEBHOOK_DELIVERY_LAG_SECONDS = int(os.environ.get("WEBHOOK_DELIVERY_LAG_SECONDS", "5"))
+WEBHOOK_RETRY_BASE_SECONDS = int(os.environ.get("WEBHOOK_RETRY_BASE_SECONDS", "30"))
+WEBHOOK_RETRY_MAX_SECONDS = int(os.environ.get("WEBHOOK_RETRY_MAX_SECONDS", "3600"))
+# доставлені всім підписникам події зберігаються N днів (deliver_webhooks --prune)
+OUTBOX_RETENTION_DAYS = int(os.environ.get("OUTBOX_RETENTION_DAYS", "7"))
+
+# Фонові задачі (jobs/, manage.py run_worker)
+JOB_FILES_ROOT = BASE_DIR / os.environ.get("JOB_FILES_ROOT", "job_files")
+JOB_LEASE_SECONDS = int(os.environ.get("JOB_LEASE_SECONDS", "300"))
+JOB_RETRY_BASE_SECONDS = int(os.environ.get("JOB_RETRY_BASE_SECONDS", "30"))
+JOB_WORKER_THREADS = int(os.environ.get("JOB_WORKER_THREADS", "2"))
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "1"))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -180,12 +297,16 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 CORS_ALLOWED_ORIGINS = _env_list("CORS_ALLOWED_ORIGINS")
 # For future JWT header auth this is enough; credentials can be enabled later if needed.
 CORS_ALLOW_CREDENTIALS = True
+# фронт читає ETag для conditional GET (If-None-Match)
+CORS_EXPOSE_HEADERS = ["ETag", "Server-Timing"]
+# If-Match з версіями колонок для kanban reorder/move (pipeline/positions.py)
+CORS_ALLOW_HEADERS = (*default_headers, "if-match")
 
 
 # DRF base settings (auth will be added in Step 4)
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.ClaimsJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -198,7 +319,14 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "core.renderers.FastJSONRenderer",
+        "core.renderers.MessagePackRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.FastJSONParser",
+        "core.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
 
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidates", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="candidate",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["-created_at"],
+                name="cand_active_created_idx",
+            ),
+        ),
+    ]
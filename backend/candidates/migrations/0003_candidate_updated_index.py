@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("candidates", "0002_candidate_list_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="candidate",
+            index=models.Index(fields=["updated_at"], name="cand_updated_idx"),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from core.models import TimeStampedModel
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Q
 
 
 class Skill(models.Model):
@@ -38,6 +39,16 @@ class Candidate(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # список кандидатів (дефолт без архіву) + order_by(-created_at)
+            models.Index(
+                fields=["-created_at"],
+                condition=Q(is_archived=False),
+                name="cand_active_created_idx",
+            ),
+            # ETag-валідатор списку: max(updated_at) + count по індексу
+            models.Index(fields=["updated_at"], name="cand_updated_idx"),
+        ]
 
     @property
     def full_name(self) -> str:
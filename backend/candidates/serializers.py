@@ -1,7 +1,11 @@
+from collections import defaultdict
+
+from core.fastserial import DATETIME, compile_row
+from core.timing import timing_phase
 from django.db import transaction
 from rest_framework import serializers
 
-from .models import Candidate, CandidateExperience, Skill
+from .models import Candidate, CandidateExperience, CandidateSkill, Skill
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -189,3 +193,78 @@ class CandidateUpsertSerializer(serializers.ModelSerializer):
         candidate.experiences.all().delete()
         for exp in experiences:
             CandidateExperience.objects.create(candidate=candidate, **exp)
+
+
+# --- fast path: values()-рядки замість CandidateListSerializer ---
+
+
+def skills_by_candidate(candidate_ids) -> dict[int, list[str]]:
+    """
+    Назви навичок для багатьох кандидатів одним запитом
+    (порядок як у prefetch: Skill.Meta.ordering = name).
+    """
+    result = defaultdict(list)
+    if not candidate_ids:
+        return result
+
+    rows = (
+        CandidateSkill.objects.filter(candidate_id__in=candidate_ids)
+        .order_by("skill__name")
+        .values_list("candidate_id", "skill__name")
+    )
+    with timing_phase("prefetch"):
+        for candidate_id, name in rows:
+            result[candidate_id].append(name)
+    return result
+
+
+CANDIDATE_LIST_VALUES = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "city",
+    "experience_years",
+    "rating",
+    "created_at",
+    "stage_system_key",
+    "stage_name",
+    "status_project_id",
+    "submitted_at",
+)
+
+_candidate_list_row = compile_row(
+    [
+        ("id", "id", None),
+        ("first_name", "first_name", None),
+        ("last_name", "last_name", None),
+        ("full_name", lambda r: f"{r['first_name']} {r['last_name']}".strip(), None),
+        ("email", "email", None),
+        ("phone", "phone", None),
+        ("city", "city", None),
+        ("experience_years", "experience_years", None),
+        ("rating", "rating", None),
+        ("created_at", "created_at", DATETIME),
+        ("stage_system_key", "stage_system_key", None),
+        ("stage_name", "stage_name", None),
+        ("status_project_id", "status_project_id", None),
+        ("submitted_at", "submitted_at", DATETIME),
+        ("status", lambda r: r["stage_system_key"] or "unassigned", None),
+        ("skills", "skills", None),
+    ]
+)
+
+
+def candidate_list_rows(rows) -> list[dict]:
+    """
+    rows — результат queryset.values(*CANDIDATE_LIST_VALUES) з анотаціями статусу.
+    Вихід ідентичний CandidateListSerializer(many=True).data.
+    """
+    rows = list(rows)
+    skills = skills_by_candidate([r["id"] for r in rows])
+    result = []
+    for row in rows:
+        row["skills"] = skills.get(row["id"], [])
+        result.append(_candidate_list_row(row))
+    return result
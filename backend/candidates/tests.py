@@ -1 +1,113 @@
-# Create your tests here.
+from django.test import TestCase
+from pipeline.models import Application, Stage
+from projects.models import Project
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from users.models import User
+
+from .models import Candidate, Skill
+from .serializers import CANDIDATE_LIST_VALUES, CandidateListSerializer, candidate_list_rows
+from .views import CandidateViewSet
+
+
+class CandidateListFastPathTests(TestCase):
+    """
+    values()-серіалізація списку кандидатів має давати той самий JSON,
+    що й CandidateListSerializer (включно з анотованим статусом).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        cls.project = Project.objects.create(title="Backend", owner=cls.admin)
+        stage = Stage.objects.get(project=cls.project, system_key="screening")
+
+        assigned = Candidate.objects.create(
+            first_name="Олена", last_name="Коваль", email="olena@example.com", rating=5
+        )
+        for name in ("TypeScript", "React"):
+            assigned.skills.add(Skill.objects.create(name=name))
+        Application.objects.create(project=cls.project, candidate=assigned, current_stage=stage)
+
+        Candidate.objects.create(first_name="Cher", last_name="", email="cher@example.com")
+        Candidate.objects.create(
+            first_name="Old", last_name="One", email="old@example.com", is_archived=True
+        )
+
+    def get_queryset(self, **params):
+        request = Request(APIRequestFactory().get("/api/v1/candidates/", params))
+        request.user = self.admin
+        view = CandidateViewSet(request=request, action="list", kwargs={})
+        return view.get_queryset().order_by("id")
+
+    def test_rows_match_serializer(self):
+        for params in ({}, {"project_id": self.project.id}):
+            qs = self.get_queryset(**params)
+            expected = CandidateListSerializer(qs, many=True).data
+            actual = candidate_list_rows(qs.prefetch_related(None).values(*CANDIDATE_LIST_VALUES))
+            self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_list_endpoint_matches_serializer(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get("/api/v1/candidates/", {"ordering": "last_name"})
+        self.assertEqual(response.status_code, 200)
+
+        expected = CandidateListSerializer(
+            self.get_queryset().order_by("last_name"), many=True
+        ).data
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]), JSONRenderer().render(expected)
+        )
+
+
+class ConditionalGetTests(TestCase):
+    """
+    ETag / If-None-Match: 304 без тіла, поки дані не змінились, і новий ETag після запису.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        self.candidate = Candidate.objects.create(
+            first_name="Ivan", last_name="P", email="ivan@example.com", rating=1
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assert_revalidates(self, url, write):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        write()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_candidate_detail_and_list(self):
+        url = f"/api/v1/candidates/{self.candidate.id}/"
+        self.assert_revalidates(
+            url, lambda: self.client.post(url + "rate/", {"rating": 4}, format="json")
+        )
+        self.assert_revalidates(
+            "/api/v1/candidates/",
+            lambda: Candidate.objects.create(first_name="Olha", email="olha@example.com"),
+        )
+
+    def test_project_kanban(self):
+        project = Project.objects.create(title="Backend", owner=self.user)
+        stage = Stage.objects.get(project=project, system_key="new")
+        self.assert_revalidates(
+            f"/api/v1/projects/{project.id}/kanban/",
+            lambda: Application.objects.create(
+                project=project, candidate=self.candidate, current_stage=stage
+            ),
+        )
@@ -1,7 +1,12 @@
 # Create your views here.
+from core.columnar import ColumnarMixin
+from core.conditional import ConditionalGetMixin, queryset_fingerprint
+from core.timing import ServerTimingMixin
 from django.db import models
 from django.db.models import OuterRef, Q, Subquery
-from pipeline.models import Application
+from pipeline.history import timeline_response
+from pipeline.models import Application, ArchivedStageChangeEvent, Stage, StageChangeEvent
+from projects.models import ProjectMember
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -11,14 +16,18 @@ from .filters import CandidateFilter
 from .models import Candidate, Skill
 from .permissions import CanWriteCandidates
 from .serializers import (
+    CANDIDATE_LIST_VALUES,
     CandidateDetailSerializer,
     CandidateListSerializer,
     CandidateUpsertSerializer,
     SkillSerializer,
+    candidate_list_rows,
 )
 
 
-class CandidateViewSet(viewsets.ModelViewSet):
+class CandidateViewSet(
+    ServerTimingMixin, ConditionalGetMixin, ColumnarMixin, viewsets.ModelViewSet
+):
     queryset = Candidate.objects.all()
     filterset_class = CandidateFilter
     search_fields = ["first_name", "last_name", "email", "phone", "city"]
@@ -26,16 +35,18 @@ class CandidateViewSet(viewsets.ModelViewSet):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        user = self.request.user
-
         qs = Candidate.objects.all().prefetch_related("skills", "experiences")
 
         # дефолт: не показуємо архів, якщо is_archived не передано
         if self.request.query_params.get("is_archived") is None:
             qs = qs.filter(is_archived=False)
 
+        qs = self.annotate_status(qs, self.request.query_params.get("project_id"))
+        return self.limit_to_visible(qs, self.request.user)
+
+    @staticmethod
+    def annotate_status(qs, project_id=None):
         # annotate status/stage/submitted_at від Application
-        project_id = self.request.query_params.get("project_id")
         app_qs = Application.objects.filter(candidate_id=OuterRef("pk"), is_archived=False)
 
         if project_id:
@@ -47,7 +58,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
 
         app_qs = app_qs.order_by("-updated_at")
 
-        qs = qs.annotate(
+        return qs.annotate(
             application_id=Subquery(app_qs.values("id")[:1]),
             status_project_id=Subquery(app_qs.values("project_id")[:1]),
             stage_system_key=Subquery(app_qs.values("current_stage__system_key")[:1]),
@@ -57,6 +68,8 @@ class CandidateViewSet(viewsets.ModelViewSet):
             ),
         )
 
+    @staticmethod
+    def limit_to_visible(qs, user):
         # Visibility scope (MVP):
         # ADMIN/HR -> бачать все
         # інші -> кандидати у їхніх проєктах + "unassigned" (без applications)
@@ -67,6 +80,30 @@ class CandidateViewSet(viewsets.ModelViewSet):
             Q(applications__project__memberships__user=user) | Q(applications__isnull=True)
         ).distinct()
 
+    def get_validator(self, request):
+        if self.action == "list":
+            # статус/стадія кандидата похідні від Application і Stage,
+            # а видимість для не-ADMIN/HR — від членства у проєктах
+            return (
+                queryset_fingerprint(Candidate.objects.all()),
+                queryset_fingerprint(Application.objects.all()),
+                queryset_fingerprint(Stage.objects.all()),
+                queryset_fingerprint(ProjectMember.objects.filter(user=request.user)),
+            )
+
+        if self.action == "retrieve":
+            pk = str(self.kwargs.get("pk", ""))
+            if not pk.isdigit():
+                return None
+            return (
+                queryset_fingerprint(Candidate.objects.filter(pk=pk)),
+                queryset_fingerprint(Application.objects.filter(candidate_id=pk)),
+                queryset_fingerprint(Stage.objects.filter(applications__candidate_id=pk)),
+                queryset_fingerprint(ProjectMember.objects.filter(user=request.user)),
+            )
+
+        return None
+
     def get_permissions(self):
         if self.action in ("create", "update", "partial_update", "destroy", "rate"):
             return [IsAuthenticated(), CanWriteCandidates()]
@@ -79,6 +116,15 @@ class CandidateViewSet(viewsets.ModelViewSet):
             return CandidateDetailSerializer
         return CandidateListSerializer
 
+    def list(self, request, *args, **kwargs):
+        # fast path: values() + один запит на навички замість CandidateListSerializer
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .values(*CANDIDATE_LIST_VALUES)
+        )
+        return self.rows_response(queryset, candidate_list_rows)
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -105,7 +151,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         """
         instance = self.get_object()
         instance.is_archived = True
-        instance.save(update_fields=["is_archived"])
+        instance.save(update_fields=["is_archived", "updated_at"])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=["post"], url_path="rate")
@@ -128,16 +174,49 @@ class CandidateViewSet(viewsets.ModelViewSet):
             )
 
         instance.rating = rating
-        instance.save(update_fields=["rating"])
+        instance.save(update_fields=["rating", "updated_at"])
         instance = self.get_queryset().filter(id=instance.id).first() or instance
         return Response(CandidateDetailSerializer(instance).data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=["get"], url_path="timeline")
+    def timeline(self, request, pk=None):
+        """
+        Timeline переходів кандидата в усіх проєктах (включно з архівом), cursor-пагінація.
+        Не-ADMIN/HR бачать лише події проєктів, де вони учасники.
+        """
+        candidate = self.get_object()
 
-class SkillViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet):
+        hot = StageChangeEvent.objects.filter(application__candidate=candidate)
+        archived = ArchivedStageChangeEvent.objects.filter(candidate_id=candidate.id)
+
+        user = request.user
+        if not (user.is_superuser or getattr(user, "role", None) in ("ADMIN", "HR_MANAGER")):
+            # архів в іншій базі — підзапит неможливий, тож id проєктів списком
+            project_ids = list(
+                ProjectMember.objects.filter(user=user).values_list("project_id", flat=True)
+            )
+            hot = hot.filter(application__project_id__in=project_ids)
+            archived = archived.filter(project_id__in=project_ids)
+
+        return timeline_response(request, hot, archived)
+
+
+class SkillViewSet(
+    ConditionalGetMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    viewsets.GenericViewSet,
+):
     queryset = Skill.objects.all().order_by("name")
     serializer_class = SkillSerializer
     search_fields = ["name"]
 
+    def get_validator(self, request):
+        if self.action == "list":
+            # навички лише додаються — max(id) + count достатньо
+            return queryset_fingerprint(Skill.objects.all(), field="id")
+        return None
+
     def get_permissions(self):
         if self.action == "create":
             return [IsAuthenticated(), CanWriteCandidates()]
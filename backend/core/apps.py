@@ -1,6 +1,16 @@
+import atexit
+
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from . import sqlstats
+
+        connection_created.connect(sqlstats.install, dispatch_uid="core.sqlstats")
+        # короткі процеси (manage.py-команди) не доживають до періодичного flush
+        atexit.register(sqlstats.flush, force=True)
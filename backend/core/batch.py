@@ -0,0 +1,126 @@
+"""
+Batch API: кілька дрібних запитів до існуючих маршрутів за один HTTP-виклик.
+
+Під-запити йдуть через URL resolver у цьому ж процесі: без middleware і без
+повторної автентифікації — користувач з батч-запиту передається як уже
+автентифікований (той самий механізм, що й force_authenticate у DRF). Тому
+спільний і сам request.user: поля, підвантажені одним під-запитом (ClaimsUser),
+бачать наступні.
+
+atomic=true — усе в одній транзакції; перша відповідь >= 400 відкочує
+попередні зміни, решта під-запитів не виконується.
+"""
+
+import json
+import time
+from urllib.parse import urlsplit
+
+from django.db import transaction
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve, reverse
+
+# заголовки під-відповіді, які має сенс віддати клієнту
+RESPONSE_HEADERS = ("ETag", "Location", "Content-Type")
+
+# клієнтські заголовки, які можна передати в під-запит
+REQUEST_HEADERS = ("If-Match", "If-None-Match", "Accept-Language")
+
+FORWARDED_META = ("HTTP_HOST", "SERVER_NAME", "REMOTE_ADDR")
+
+
+class BatchAborted(Exception):
+    pass
+
+
+def resolve_item(path: str):
+    """
+    ResolverMatch для шляху під-запиту; None — шлях поза API або сам batch.
+    """
+    route = urlsplit(path).path
+    if not route.startswith("/api/v1/") or route == reverse("batch"):
+        return None
+    try:
+        return resolve(route)
+    except (Resolver404, Http404):
+        return None
+
+
+def build_subrequest(request, factory: RequestFactory, item: dict):
+    headers = {
+        name: value
+        for name, value in (item.get("headers") or {}).items()
+        if name in REQUEST_HEADERS
+    }
+    body = item.get("body")
+    sub = factory.generic(
+        item["method"],
+        item["path"],
+        data=json.dumps(body) if body is not None else "",
+        content_type="application/json",
+        secure=request.is_secure(),
+        headers=headers,
+        HTTP_ACCEPT="application/json",
+    )
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def response_entry(response, started: float) -> dict:
+    if response.streaming:
+        # файли (jobs/{id}/result/) у батч не вкладаємо
+        body = None
+        stream = getattr(response, "file_to_stream", None)
+        if stream is not None:
+            stream.close()
+    elif hasattr(response, "data"):
+        body = response.data
+    elif response.get("Content-Type", "").startswith("application/json") and response.content:
+        body = json.loads(response.content)
+    else:
+        body = None
+
+    return {
+        "status": response.status_code,
+        "headers": {name: response[name] for name in RESPONSE_HEADERS if response.has_header(name)},
+        "body": body,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def run_item(request, factory, item) -> dict:
+    started = time.perf_counter()
+    match = resolve_item(item["path"])
+    if match is None:
+        return {
+            "status": 404,
+            "headers": {},
+            "body": {"detail": "Not found."},
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    sub = build_subrequest(request, factory, item)
+    response = match.func(sub, *match.args, **match.kwargs)
+    return response_entry(response, started)
+
+
+def run_batch(request, items: list[dict], atomic: bool = False) -> dict:
+    meta = {name: request.META[name] for name in FORWARDED_META if name in request.META}
+    factory = RequestFactory(**meta)
+
+    results = []
+    if not atomic:
+        for item in items:
+            results.append(run_item(request, factory, item))
+        return {"atomic": False, "rolled_back": False, "responses": results}
+
+    try:
+        with transaction.atomic():
+            for item in items:
+                results.append(run_item(request, factory, item))
+                if results[-1]["status"] >= 400:
+                    raise BatchAborted()
+    except BatchAborted:
+        return {"atomic": True, "rolled_back": True, "responses": results}
+    return {"atomic": True, "rolled_back": False, "responses": results}
@@ -0,0 +1,70 @@
+"""
+Спільні хелпери для bench_* management-команд.
+"""
+
+import statistics
+import time
+
+from candidates.models import Candidate, CandidateSkill, Skill
+from django.contrib.auth import get_user_model
+from pipeline.models import Application, Stage
+from projects.models import Project
+
+
+def seed_board(count: int, label: str = "bench"):
+    """
+    Синтетична дошка на count карток (4 навички на кандидата).
+    Викликати всередині transaction.atomic() з подальшим rollback.
+    """
+    User = get_user_model()
+    user = User.objects.create_user(email=f"{label}@example.com", password=None, role="ADMIN")
+    project = Project.objects.create(title="Benchmark", owner=user)
+    stages = list(Stage.objects.filter(project=project))
+    skills = Skill.objects.bulk_create([Skill(name=f"{label}-skill-{idx}") for idx in range(40)])
+
+    candidates = Candidate.objects.bulk_create(
+        [
+            Candidate(
+                first_name=f"Bench{idx}",
+                last_name="Candidate",
+                email=f"{label}{idx}@example.com",
+                phone="+380500000000",
+                city="Київ",
+                experience_years=idx % 15,
+                rating=idx % 6,
+            )
+            for idx in range(count)
+        ]
+    )
+    CandidateSkill.objects.bulk_create(
+        [
+            CandidateSkill(candidate=c, skill=skills[(idx + k) % len(skills)])
+            for idx, c in enumerate(candidates)
+            for k in range(4)
+        ]
+    )
+    Application.objects.bulk_create(
+        [
+            Application(
+                project=project,
+                candidate=c,
+                current_stage=stages[idx % len(stages)],
+                position_in_stage=idx,
+            )
+            for idx, c in enumerate(candidates)
+        ]
+    )
+    return project, user
+
+
+def measure(repeat: int, fn):
+    """
+    Медіана часу виконання fn() у мс + результат останнього виклику.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
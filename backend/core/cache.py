@@ -0,0 +1,115 @@
+"""
+Versioned кеш серіалізованих payload-ів (kanban, summary, project detail).
+
+Ключ payload-а = секція + id обʼєкта + поточне покоління (generation) + scope прав.
+Кожен запис, що змінює дані обʼєкта, інкрементує generation — старі ключі
+перестають читатися і з часом витісняються LRU-політикою бекенда
+(LocMemCache з MAX_ENTRIES).
+
+Payload-и лежать у кеші процесу, а generation — у БД (CacheGeneration):
+інвалідація з будь-якого воркера чи run_worker одразу видна всім процесам
+ціною одного запиту по унікальному індексу.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import CacheGeneration
+from .timing import timing_phase
+
+_stats_lock = threading.Lock()
+_stats: Counter = Counter()
+
+
+def payload_cache():
+    return caches[settings.PAYLOAD_CACHE_ALIAS]
+
+
+def get_generation(scope: str, obj_id) -> int:
+    value = (
+        CacheGeneration.objects.filter(scope=scope, obj_id=obj_id)
+        .values_list("value", flat=True)
+        .first()
+    )
+    return value or 0
+
+
+def bump_generation(scope: str, obj_id) -> None:
+    generations = CacheGeneration.objects.filter(scope=scope, obj_id=obj_id)
+    if generations.update(value=F("value") + 1):
+        return
+    try:
+        with transaction.atomic():
+            # новий лічильник стартує з унікального значення, щоб не збігтися
+            # з ключами payload-ів, які ще лежать у кеші процесів
+            CacheGeneration.objects.create(scope=scope, obj_id=obj_id, value=time.time_ns())
+    except IntegrityError:
+        generations.update(value=F("value") + 1)
+
+
+def invalidate(scope: str, *obj_ids) -> None:
+    """
+    Інкрементує generation одразу і ще раз після commit-у:
+    запит, що встиг перебудувати payload зі старих даних до commit-у,
+    не залишить його «свіжим».
+    """
+    ids = {obj_id for obj_id in obj_ids if obj_id is not None}
+    for obj_id in ids:
+        bump_generation(scope, obj_id)
+
+    if ids:
+        transaction.on_commit(lambda: [bump_generation(scope, obj_id) for obj_id in ids])
+
+
+def cached_payload(scope: str, obj_id, section: str, variant: str, build):
+    """
+    Повертає payload з кешу або будує його через build() і кладе в кеш.
+    variant — частина ключа, що залежить від прав користувача.
+    """
+    if not settings.PAYLOAD_CACHE_ENABLED:
+        with timing_phase("build"):
+            return build()
+
+    cache = payload_cache()
+    generation = get_generation(scope, obj_id)
+    key = f"{scope}:{obj_id}:{generation}:{section}:{variant}"
+
+    with timing_phase("cache"):
+        data = cache.get(key)
+    if data is not None:
+        _record(section, "hits")
+        return data
+
+    _record(section, "misses")
+    with timing_phase("build"):
+        data = build()
+    cache.set(key, data)
+    return data
+
+
+def _record(section: str, outcome: str) -> None:
+    with _stats_lock:
+        _stats[(section, outcome)] += 1
+
+
+def cache_stats() -> dict:
+    """
+    Лічильники hit/miss по секціях (in-process).
+    """
+    with _stats_lock:
+        snapshot = dict(_stats)
+
+    result = {}
+    for (section, outcome), value in snapshot.items():
+        result.setdefault(section, {"hits": 0, "misses": 0})[outcome] = value
+
+    for counters in result.values():
+        total = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = round(counters["hits"] / total, 4) if total else 0.0
+    return result
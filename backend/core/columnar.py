@@ -0,0 +1,114 @@
+"""
+Колонковий (columnar) формат відповіді для kanban і списків.
+
+Замість масиву обʼєктів з повторюваними ключами повертаємо таблицю
+{"length": N, "columns": {"id": [...], "candidate.full_name": [...], ...}},
+а навички — індексами у спільному словнику "skills": ["Go", "React", ...].
+
+Вмикається через ?format=columnar або Accept: application/vnd.nexo.columnar+json
+лише для дій із columnar_actions.
+"""
+
+from rest_framework.response import Response
+
+from .renderers import FastJSONRenderer
+from .timing import timing_phase
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    media_type = "application/vnd.nexo.columnar+json"
+    format = "columnar"
+
+
+class SkillDictionary:
+    """
+    Дедуплікований словник назв навичок: назва -> індекс у self.names.
+    """
+
+    def __init__(self):
+        self.names: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def refs(self, names) -> list[int]:
+        result = []
+        for name in names:
+            idx = self._index.get(name)
+            if idx is None:
+                idx = self._index[name] = len(self.names)
+                self.names.append(name)
+            result.append(idx)
+        return result
+
+
+def _flatten(row: dict, prefix: str = ""):
+    for key, value in row.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
+
+
+def to_columns(rows, skills: SkillDictionary) -> dict:
+    """
+    rows — однорідні dict-и (як з fast path серіалізації); вкладені dict-и
+    розгортаються в "parent.child", списки навичок замінюються індексами.
+    """
+    columns: dict[str, list] = {}
+    length = 0
+    for row in rows:
+        length += 1
+        for key, value in _flatten(row):
+            if key == "skills" or key.endswith(".skills"):
+                value = skills.refs(value)
+            columns.setdefault(key, []).append(value)
+    return {"length": length, "columns": columns}
+
+
+def kanban_to_columnar(data: dict) -> dict:
+    skills = SkillDictionary()
+    stages = [
+        {**stage, "applications": to_columns(stage["applications"], skills)}
+        for stage in data["stages"]
+    ]
+    return {"project_id": data["project_id"], "stages": stages, "skills": skills.names}
+
+
+class ColumnarMixin:
+    """
+    Додає ColumnarJSONRenderer для columnar_actions і хелпер для list-відповідей.
+    """
+
+    columnar_actions = ("list",)
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if getattr(self, "action", None) in self.columnar_actions:
+            renderers.append(ColumnarJSONRenderer())
+        return renderers
+
+    def wants_columnar(self) -> bool:
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return isinstance(renderer, ColumnarJSONRenderer)
+
+    def rows_response(self, queryset, build_rows):
+        """
+        Пагінує queryset, будує рядки через build_rows(page) і віддає
+        їх або як звичайний список, або як колонкову таблицю.
+        """
+        with timing_phase("queryset"):
+            page = self.paginate_queryset(queryset)
+        with timing_phase("serialize"):
+            rows = build_rows(page if page is not None else queryset)
+
+        if not self.wants_columnar():
+            if page is not None:
+                return self.get_paginated_response(rows)
+            return Response(rows)
+
+        skills = SkillDictionary()
+        table = to_columns(rows, skills)
+        if page is not None:
+            response = self.get_paginated_response(table)
+            response.data["skills"] = skills.names
+            return response
+        return Response({"results": table, "skills": skills.names})
@@ -0,0 +1,99 @@
+"""
+Conditional GET (ETag / If-None-Match) для DRF view-ів.
+
+View з ConditionalGetMixin реалізує get_validator(request): дешевий відбиток
+даних (max(updated_at) + count, generation counter тощо), який рахується
+ДО важкого queryset-а і серіалізації. Якщо ETag збігається з If-None-Match
+клієнта — відповідаємо 304 без тіла.
+"""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from .timing import timing_phase
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = "Not modified."
+    default_code = "not_modified"
+
+
+def queryset_fingerprint(qs, field: str = "updated_at") -> tuple:
+    """
+    (max(field), count) для queryset-а — один агрегатний запит без сортування.
+    """
+    agg = qs.order_by().aggregate(last=Max(field), total=Count("pk"))
+    last = agg["last"]
+    return (last.isoformat() if hasattr(last, "isoformat") else last, agg["total"])
+
+
+def make_etag(request, validator) -> str:
+    # ETag залежить від користувача (scope видимості), URL з query-параметрами
+    # і формату відповіді — інакше 304 міг би «підтвердити» чужий payload
+    user = request.user
+    raw = repr(
+        (
+            user.pk,
+            getattr(user, "role", None),
+            user.is_superuser,
+            request.get_full_path(),
+            getattr(request, "accepted_media_type", None),
+            validator,
+        )
+    )
+    return quote_etag(hashlib.sha1(raw.encode("utf-8")).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Додає ETag до GET-відповідей і відповідає 304, якщо дані не змінились.
+    get_validator() повертає None, якщо для поточної дії ETag не потрібен.
+    """
+
+    vary_headers = ("Authorization", "Accept")
+
+    def get_validator(self, request):
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.etag = None
+        if request.method not in SAFE_METHODS:
+            return
+
+        with timing_phase("etag"):
+            validator = self.get_validator(request)
+        if validator is None:
+            return
+
+        self.etag = make_etag(request, validator)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and self.etag in parse_etags(if_none_match):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        etag = getattr(self, "etag", None)
+        if etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            # браузер має ревалідувати, а спільні кеші — не зберігати
+            response.setdefault("Cache-Control", "private, no-cache")
+
+        patch_vary_headers(response, self.vary_headers)
+        return response
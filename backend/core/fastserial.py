@@ -0,0 +1,40 @@
+"""
+Швидка серіалізація рядків з values()/values_list() без DRF field-машинерії.
+
+compile_row() один раз «компілює» опис полів у функцію row -> dict.
+Вихід має збігатися байт-у-байт з відповідним DRF-серіалізатором
+(порядок ключів, формат datetime, None для порожніх значень) —
+див. parity-тести у pipeline/tests.py і candidates/tests.py.
+"""
+
+from operator import itemgetter
+
+from rest_framework import serializers
+
+# той самий to_representation, що й у ModelSerializer для DateTimeField
+# (переводить у поточну таймзону, ISO 8601, "+00:00" -> "Z")
+DATETIME = serializers.DateTimeField().to_representation
+
+
+def compile_row(fields):
+    """
+    fields: [(output_key, source, to_repr)]
+      source   — ключ у values()-рядку або callable(row) (аналог SerializerMethodField);
+      to_repr  — конвертер значення або None, якщо значення з БД вже готове для JSON.
+    Як і DRF, None не проганяємо через конвертер.
+    """
+    compiled = []
+    for key, source, to_repr in fields:
+        getter = source if callable(source) else itemgetter(source)
+        compiled.append((key, getter, to_repr))
+
+    def build(row) -> dict:
+        out = {}
+        for key, getter, to_repr in compiled:
+            value = getter(row)
+            if to_repr is not None and value is not None:
+                value = to_repr(value)
+            out[key] = value
+        return out
+
+    return build
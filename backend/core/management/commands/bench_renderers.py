@@ -0,0 +1,64 @@
+import json
+
+import msgpack
+from core.benchmarks import measure, seed_board
+from core.columnar import kanban_to_columnar
+from core.renderers import FastJSONRenderer, MessagePackRenderer
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from projects.models import Project
+from projects.views import ProjectViewSet
+from rest_framework.renderers import JSONRenderer
+
+
+class Command(BaseCommand):
+    help = "Benchmark JSON / fast JSON / MessagePack renderers on kanban payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project", type=int, help="Existing project id (default: synthetic board)"
+        )
+        parser.add_argument("--cards", type=int, default=3000)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["project"]:
+                project = Project.objects.filter(id=options["project"]).first()
+                if not project:
+                    raise CommandError("Project not found")
+            else:
+                project, _ = seed_board(options["cards"], "bench-renderers")
+
+            payload = ProjectViewSet.build_kanban(project)
+            self._run("kanban", payload, options["repeat"])
+            self._run("kanban columnar", kanban_to_columnar(payload), options["repeat"])
+
+            transaction.set_rollback(True)
+
+    def _run(self, label: str, payload, repeat: int):
+        renderers = [
+            ("json (drf)", JSONRenderer()),
+            ("json (orjson)", FastJSONRenderer()),
+            ("msgpack", MessagePackRenderer()),
+        ]
+
+        baseline_ms = baseline_body = None
+        for name, renderer in renderers:
+            ms, body = measure(repeat, lambda r=renderer: r.render(payload))
+            baseline_ms = baseline_ms or ms
+            baseline_body = baseline_body or body
+            if isinstance(renderer, JSONRenderer) and body != baseline_body:
+                self.stderr.write(self.style.ERROR(f"{label} {name}: output differs from DRF"))
+            self.stdout.write(
+                f"{label:<16} {name:<14} {ms:8.2f} ms  x{baseline_ms / ms:4.1f}  {len(body)} bytes"
+            )
+
+        # декодування на стороні клієнта теж має значення
+        json_body = FastJSONRenderer().render(payload)
+        msgpack_body = MessagePackRenderer().render(payload)
+        decode_json_ms, _ = measure(repeat, lambda: json.loads(json_body))
+        decode_msgpack_ms, _ = measure(repeat, lambda: msgpack.unpackb(msgpack_body))
+        self.stdout.write(
+            f"{label:<16} decode: json {decode_json_ms:.2f} ms, msgpack {decode_msgpack_ms:.2f} ms"
+        )
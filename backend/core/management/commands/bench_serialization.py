@@ -0,0 +1,87 @@
+from candidates.serializers import (
+    CANDIDATE_LIST_VALUES,
+    CandidateListSerializer,
+    candidate_list_rows,
+)
+from candidates.views import CandidateViewSet
+from core.benchmarks import measure, seed_board
+from core.columnar import SkillDictionary, to_columns
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from pipeline.models import Application
+from pipeline.serializers import (
+    APPLICATION_CARD_VALUES,
+    ApplicationCardSerializer,
+    application_cards,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+
+class Command(BaseCommand):
+    help = "Benchmark DRF serializers vs values() fast path and columnar format"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cards", type=int, default=3000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        # синтетичні дані створюються в транзакції і відкочуються в кінці
+        with transaction.atomic():
+            project, user = seed_board(options["cards"], "bench-serialization")
+
+            apps = Application.objects.filter(project=project).order_by("id")
+            self._compare(
+                "kanban cards",
+                options["repeat"],
+                lambda: ApplicationCardSerializer(
+                    apps.select_related("candidate").prefetch_related("candidate__skills"),
+                    many=True,
+                ).data,
+                lambda: application_cards(apps.values(*APPLICATION_CARD_VALUES)),
+            )
+
+            self._compare_columnar(
+                "kanban cards",
+                options["repeat"],
+                application_cards(apps.values(*APPLICATION_CARD_VALUES)),
+            )
+
+            request = Request(APIRequestFactory().get("/api/v1/candidates/"))
+            request.user = user
+            candidates = CandidateViewSet(request=request, action="list", kwargs={})
+            qs = candidates.get_queryset().order_by("id")
+            self._compare(
+                "candidate list rows",
+                options["repeat"],
+                lambda: CandidateListSerializer(qs, many=True).data,
+                lambda: candidate_list_rows(
+                    qs.prefetch_related(None).values(*CANDIDATE_LIST_VALUES)
+                ),
+            )
+
+            transaction.set_rollback(True)
+
+    def _compare(self, label: str, repeat: int, slow, fast):
+        renderer = JSONRenderer()
+        slow_ms, slow_body = measure(repeat, lambda: renderer.render(slow()))
+        fast_ms, fast_body = measure(repeat, lambda: renderer.render(fast()))
+
+        if slow_body != fast_body:
+            self.stderr.write(self.style.ERROR(f"{label}: JSON output differs!"))
+
+        self.stdout.write(
+            f"{label}: serializer {slow_ms:.1f} ms, fast path {fast_ms:.1f} ms "
+            f"(x{slow_ms / fast_ms:.1f}, {len(fast_body)} bytes)"
+        )
+
+    def _compare_columnar(self, label: str, repeat: int, rows):
+        renderer = JSONRenderer()
+        rows_ms, rows_body = measure(repeat, lambda: renderer.render(rows))
+        convert_ms, table = measure(repeat, lambda: to_columns(rows, SkillDictionary()))
+        columnar_ms, columnar_body = measure(repeat, lambda: renderer.render(table))
+        self.stdout.write(
+            f"{label} columnar: {len(rows_body)} -> {len(columnar_body)} bytes, "
+            f"encode {rows_ms:.1f} -> {columnar_ms:.1f} ms (+{convert_ms:.1f} ms to build columns)"
+        )
@@ -0,0 +1,44 @@
+from core.profiling import folded, list_profiles, load_profile
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "List saved request profiles or print folded stacks "
+        "(flamegraph.pl / speedscope) for one profile or all of them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("profile_id", nargs="?", help="Profile id (default: list profiles)")
+        parser.add_argument(
+            "--all", action="store_true", help="Merge folded stacks of all saved profiles"
+        )
+        parser.add_argument("--route", help="With --all: only profiles of this route")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            merged = {}
+            for summary in list_profiles():
+                if options["route"] and summary["route"] != options["route"]:
+                    continue
+                data = load_profile(summary["id"]) or {"stacks": {}}
+                for stack, count in data["stacks"].items():
+                    merged[stack] = merged.get(stack, 0) + count
+            self.stdout.write(folded(merged), ending="")
+            return
+
+        if options["profile_id"]:
+            data = load_profile(options["profile_id"])
+            if data is None:
+                raise CommandError("Profile not found")
+            self.stdout.write(folded(data["stacks"]), ending="")
+            return
+
+        summaries = list_profiles()
+        for summary in summaries:
+            self.stdout.write(
+                f"{summary['id']}  {summary['reason']:<7} {summary['duration_ms']:>9.1f} ms  "
+                f"{summary['samples']:>5} samples  {summary['query_count']:>4} queries  "
+                f"{summary['method']} {summary['path']} ({summary['route']})"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(summaries)} profile(s)"))
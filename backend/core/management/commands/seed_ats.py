@@ -2,6 +2,7 @@ from candidates.models import Candidate, CandidateExperience, Skill
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 from pipeline.models import Application, Stage
+from pipeline.positions import allocate_positions
 from projects.models import Project
 
 
@@ -218,14 +219,18 @@ class Command(BaseCommand):
                 )
 
             # application into main project
-            app, _ = Application.objects.get_or_create(
-                project=main_project,
-                candidate=candidate,
-                defaults={"current_stage": c["stage"], "position_in_stage": 0},
-            )
+            app = Application.objects.filter(project=main_project, candidate=candidate).first()
+            if app is None:
+                app = Application.objects.create(
+                    project=main_project,
+                    candidate=candidate,
+                    current_stage=c["stage"],
+                    position_in_stage=allocate_positions(c["stage"].id),
+                )
             # якщо вже є — оновити stage
-            if app.current_stage_id != c["stage"].id:
+            elif app.current_stage_id != c["stage"].id:
                 app.current_stage = c["stage"]
+                app.position_in_stage = allocate_positions(c["stage"].id)
                 app.save()
 
         self.stdout.write(
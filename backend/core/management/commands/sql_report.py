@@ -0,0 +1,29 @@
+from core.sqlstats import report
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Rank normalized SQL fingerprints by total time across all worker processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Rows to print (default: 20)")
+        parser.add_argument(
+            "--by-route", action="store_true", help="One row per (route, fingerprint) pair"
+        )
+        parser.add_argument("--route", help="Only queries issued by this route (project-kanban)")
+
+    def handle(self, *args, **options):
+        rows = report(by_route=options["by_route"], route=options["route"])
+        total_ms = sum(row["total_ms"] for row in rows) or 1
+
+        for rank, row in enumerate(rows[: options["limit"]], start=1):
+            routes = ", ".join(row["routes"][:3])
+            if len(row["routes"]) > 3:
+                routes += f" +{len(row['routes']) - 3}"
+            self.stdout.write(
+                f"{rank:>3}. {row['total_ms']:>10.1f} ms {row['total_ms'] / total_ms:>6.1%}  "
+                f"{row['count']:>7}x  avg {row['avg_ms']:.2f}  p95 {row['p95_ms']:.2f}  "
+                f"max {row['max_ms']:.2f} ms  [{routes}]"
+            )
+            self.stdout.write(f"     {row['fingerprint']}")
+        self.stdout.write(self.style.SUCCESS(f"{len(rows)} fingerprint(s)"))
@@ -0,0 +1,285 @@
+"""
+Метрики у форматі Prometheus без зовнішніх залежностей.
+
+Колектори — лічильники й гістограми в памʼяті процесу під одним lock-ом.
+Якщо задано METRICS_DIR, кожен процес не частіше ніж раз на METRICS_FLUSH_SECONDS
+скидає свій знімок у <dir>/<host>-<pid>.json (атомарно, через os.replace), а
+ендпоінт метрик підсумовує файли всіх процесів: кілька воркерів gunicorn
+віддають одну картину. Без METRICS_DIR видно лише поточний процес.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import OperationalError, connections
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# name -> (type, help, buckets)
+METRICS = {
+    "nexo_http_requests_total": ("counter", "HTTP requests by route, method and status.", None),
+    "nexo_http_request_duration_seconds": ("histogram", "Request latency.", LATENCY_BUCKETS),
+    "nexo_http_response_size_bytes": ("histogram", "Response body size.", SIZE_BUCKETS),
+    "nexo_http_db_queries": ("histogram", "DB queries per request.", QUERY_BUCKETS),
+    "nexo_http_db_duration_seconds": ("histogram", "DB time per request.", LATENCY_BUCKETS),
+    "nexo_db_lock_errors_total": ("counter", "SQLite 'database is locked/busy' errors.", None),
+    "nexo_payload_cache_requests_total": ("counter", "Payload cache lookups by outcome.", None),
+}
+
+_lock = threading.Lock()
+_counters: dict[tuple, float] = {}
+# (name, labels) -> [лічильники по бакетах..., +Inf, sum]
+_histograms: dict[tuple, list] = {}
+_flushed_at = 0.0
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def inc(name: str, labels: dict, value: float = 1.0) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def observe(name: str, labels: dict, value: float) -> None:
+    buckets = METRICS[name][2]
+    key = _key(name, labels)
+    with _lock:
+        row = _histograms.get(key)
+        if row is None:
+            row = _histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+        row[bisect_left(buckets, value)] += 1
+        row[-1] += value
+
+
+def reset_metrics() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def snapshot() -> dict:
+    """
+    Знімок поточного процесу у вигляді, придатному для JSON.
+    """
+    # cache -> timing -> metrics: імпорт тут, щоб metrics можна було імпортувати першим
+    from . import cache
+
+    with _lock:
+        counters = [[name, list(labels), value] for (name, labels), value in _counters.items()]
+        histograms = [
+            [name, list(labels), list(row)] for (name, labels), row in _histograms.items()
+        ]
+
+    for section, stats in cache.cache_stats().items():
+        for outcome in ("hits", "misses"):
+            counters.append(
+                [
+                    "nexo_payload_cache_requests_total",
+                    [["outcome", outcome], ["section", section]],
+                    stats[outcome],
+                ]
+            )
+    return {"counters": counters, "histograms": histograms}
+
+
+def write_process_snapshot(directory, data: dict) -> None:
+    """
+    Знімок процесу в <directory>/<host>-<pid>.json; os.replace — читач не побачить півфайла.
+    """
+    path = Path(directory) / f"{socket.gethostname()}-{os.getpid()}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def is_stale_snapshot(path: Path, now: float) -> bool:
+    """
+    Знімок завершеного процесу: на цьому хості — за pid, з інших хостів — якщо
+    файл не оновлювався довше за PROCESS_SNAPSHOT_MAX_AGE_SECONDS.
+    """
+    host, _, pid = path.stem.rpartition("-")
+    if host == socket.gethostname() and pid.isdigit():
+        return not _pid_alive(int(pid))
+    return now - path.stat().st_mtime > settings.PROCESS_SNAPSHOT_MAX_AGE_SECONDS
+
+
+def read_process_snapshots(directory) -> list[dict]:
+    """
+    Знімки процесів з <directory>; файли завершених процесів видаляються, інакше
+    кожен перезапуск воркера лишав би ще один файл назавжди.
+    """
+    snapshots = []
+    now = time.time()
+    for path in Path(directory).glob("*.json"):
+        try:
+            if is_stale_snapshot(path, now):
+                path.unlink(missing_ok=True)
+                continue
+            snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            # файл процесу, що саме завершується, — пропускаємо
+            continue
+    return snapshots
+
+
+def flush(force: bool = False) -> None:
+    global _flushed_at
+    if not settings.METRICS_DIR:
+        return
+    now = time.monotonic()
+    if not force and now - _flushed_at < settings.METRICS_FLUSH_SECONDS:
+        return
+    _flushed_at = now
+    write_process_snapshot(settings.METRICS_DIR, snapshot())
+
+
+def collect() -> tuple[dict, dict]:
+    """
+    Сума знімків усіх процесів (або лише поточного без METRICS_DIR).
+    """
+    if settings.METRICS_DIR:
+        flush(force=True)
+        snapshots = read_process_snapshots(settings.METRICS_DIR)
+    else:
+        snapshots = [snapshot()]
+
+    counters, histograms = {}, {}
+    for data in snapshots:
+        for name, labels, value in data["counters"]:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, row in data["histograms"]:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            total = histograms.setdefault(key, [0] * len(row))
+            for idx, value in enumerate(row):
+                total[idx] += value
+    return counters, histograms
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(counters: dict, histograms: dict) -> str:
+    """
+    Text exposition format 0.0.4.
+    """
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            continue
+
+        for (metric, labels), row in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, "+Inf"), row[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(bound)
+                lines.append(f"{name}_bucket{_labels((*labels, ('le', le)))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(row[-1])}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def is_lock_error(exc: Exception) -> bool:
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+class QueryStats:
+    """
+    execute_wrapper для всіх БД: кількість і сумарний час запитів,
+    помилки блокування SQLite — у nexo_db_lock_errors_total.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as exc:
+            if is_lock_error(exc):
+                inc("nexo_db_lock_errors_total", {"alias": context["connection"].alias})
+            raise
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+    @contextmanager
+    def track(self):
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+
+def route_label(request, response) -> str:
+    """
+    Для DRF viewset-ів — "<basename>-<action>" (project-kanban), інакше імʼя URL.
+    """
+    context = getattr(response, "renderer_context", None) or {}
+    view = context.get("view")
+    basename, action = getattr(view, "basename", None), getattr(view, "action", None)
+    if basename and action:
+        return f"{basename}-{action}"
+
+    match = getattr(request, "resolver_match", None)
+    if match is not None:
+        return match.view_name or "unnamed"
+    return "unmatched"
+
+
+def record_request(request, response, elapsed: float, queries: QueryStats) -> None:
+    route = route_label(request, response)
+    inc(
+        "nexo_http_requests_total",
+        {"route": route, "method": request.method, "status": str(response.status_code)},
+    )
+    observe("nexo_http_request_duration_seconds", {"route": route}, elapsed)
+    if not response.streaming:
+        observe("nexo_http_response_size_bytes", {"route": route}, len(response.content))
+    observe("nexo_http_db_queries", {"route": route}, queries.count)
+    observe("nexo_http_db_duration_seconds", {"route": route}, queries.duration)
+    flush()
@@ -0,0 +1,91 @@
+import random
+import time
+
+from django.conf import settings
+
+from .metrics import QueryStats, record_request, route_label
+from .profiling import QueryLog, build_profile, sampler, save_profile
+from .sqlstats import begin_request, end_request
+
+
+class MetricsMiddleware:
+    """
+    Латентність, розмір відповіді і запити до БД кожного запиту (core/metrics.py).
+    Стоїть першою, щоб міряти і решту middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        queries = QueryStats()
+        started = time.perf_counter()
+        with queries.track():
+            response = self.get_response(request)
+        record_request(request, response, time.perf_counter() - started, queries)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Семплює стеки і SQL запиту; зберігає профіль для вибірки і повільних запитів
+    (core/profiling.py). Вимкнений — лише перевірка налаштування.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.PROFILING_ENABLED or not settings.PROFILE_DIR:
+            return self.get_response(request)
+
+        sampled = random.random() < settings.PROFILE_SAMPLE_RATE
+        if not sampled and not settings.PROFILE_SLOW_MS:
+            return self.get_response(request)
+
+        queries = QueryLog(settings.PROFILE_MAX_QUERIES)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            with queries.track():
+                response = self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+        elapsed = time.perf_counter() - started
+
+        if sampled:
+            reason = "sampled"
+        elif settings.PROFILE_SLOW_MS and elapsed * 1000 >= settings.PROFILE_SLOW_MS:
+            reason = "slow"
+        else:
+            return response
+
+        route = route_label(request, response)
+        save_profile(
+            build_profile(request, route, response.status_code, elapsed, reason, stacks, queries)
+        )
+        return response
+
+
+class SqlStatsMiddleware:
+    """
+    Збирає час SQL запиту і в кінці записує його під маршрутом view (core/sqlstats.py).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SQL_STATS_ENABLED:
+            return self.get_response(request)
+
+        token = begin_request(request)
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token, route_label(request, response))
+        return response
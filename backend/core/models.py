@@ -8,3 +8,23 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class CacheGeneration(models.Model):
+    """
+    Лічильник покоління кешу (core/cache.py) для scope + id обʼєкта.
+    Живе в БД, щоб інвалідація з одного процесу (воркера gunicorn, run_worker)
+    була видна всім іншим.
+    """
+
+    scope = models.CharField(max_length=32)
+    obj_id = models.BigIntegerField()
+    value = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "obj_id"], name="uniq_cache_generation"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.scope}:{self.obj_id}={self.value}"
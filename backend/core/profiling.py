@@ -0,0 +1,230 @@
+"""
+Профілювання запитів на вимогу (PROFILING_ENABLED).
+
+Стеки знімає один фоновий потік-семплер на процес: кожні PROFILE_INTERVAL_MS
+він читає sys._current_frames() для потоків, що зараз обробляють запит, і
+рахує «згорнуті» стеки (folded: "a;b;c" -> кількість семплів). На відміну від
+cProfile, код запиту не інструментується, тож семплюються всі запити, а
+зберігаються лише вибрані (PROFILE_SAMPLE_RATE) і повільні (довші за
+PROFILE_SLOW_MS).
+
+Накладні витрати не нульові: поки семплер згортає стеки, він тримає GIL, тож
+потоки запитів стоять — кожні PROFILE_INTERVAL_MS приблизно на (глибина стеку ×
+кількість активних запитів) кроків Python. Свій lock семплер бере лише щоб
+скопіювати список потоків і дописати готові семпли, тож start()/stop() не чекають
+на згортання.
+
+Профіль — JSON у PROFILE_DIR (кільцевий буфер на PROFILE_MAX_FILES файлів;
+без PROFILE_DIR профілювання вимкнене):
+стеки, SQL з тривалістю (без параметрів) і EXPLAIN QUERY PLAN для
+PROFILE_EXPLAIN_TOP найповільніших SELECT-ів.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.utils import timezone
+
+PROFILE_ID_RE = re.compile(r"^[0-9]{13}-[0-9a-f]{8}$")
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        filename = filename[len(base) + 1 :]
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages", 1)[1].lstrip(os.sep)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+def fold(frame) -> str:
+    """
+    Стек від кореня до листа у форматі flamegraph.pl / speedscope.
+    """
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame).replace(";", ","))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._targets: dict[int, Counter] = {}
+        self._thread = None
+
+    def start(self) -> None:
+        with self._lock:
+            self._targets[threading.get_ident()] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="profile-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self) -> Counter:
+        with self._lock:
+            return self._targets.pop(threading.get_ident(), Counter())
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(settings.PROFILE_INTERVAL_MS / 1000)
+            with self._lock:
+                thread_ids = list(self._targets)
+            if not thread_ids:
+                continue
+            # згортаємо поза lock-ом; семпл запиту, що тим часом завершився, губиться
+            frames = sys._current_frames()
+            samples = [
+                (thread_id, fold(frames[thread_id]))
+                for thread_id in thread_ids
+                if thread_id in frames
+            ]
+            del frames
+            with self._lock:
+                for thread_id, sample in samples:
+                    stacks = self._targets.get(thread_id)
+                    if stacks is not None:
+                        stacks[sample] += 1
+
+
+sampler = StackSampler()
+
+
+class QueryLog:
+    """
+    execute_wrapper: SQL запиту з тривалістю (параметри — лише для EXPLAIN, не зберігаються).
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.entries = []
+        self.dropped = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            if len(self.entries) < self.limit:
+                alias = context["connection"].alias
+                self.entries.append((sql, None if many else params, duration, alias))
+            else:
+                self.dropped += 1
+
+    @contextmanager
+    def track(self):
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+
+def explain(sql: str, params, alias: str) -> list[str] | None:
+    connection = connections[alias]
+    if connection.vendor != "sqlite" or not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+    except DatabaseError:
+        return None
+
+
+def build_profile(request, route, status_code, elapsed, reason, stacks, queries) -> dict:
+    slowest = sorted(
+        range(len(queries.entries)), key=lambda idx: queries.entries[idx][2], reverse=True
+    )[: settings.PROFILE_EXPLAIN_TOP]
+    plans = {}
+    for idx in slowest:
+        sql, params, _, alias = queries.entries[idx]
+        plan = explain(sql, params, alias)
+        if plan is not None:
+            plans[idx] = plan
+
+    return {
+        "created_at": timezone.now().isoformat(),
+        "method": request.method,
+        "path": request.path,
+        "route": route,
+        "status": status_code,
+        "reason": reason,
+        "duration_ms": round(elapsed * 1000, 3),
+        "interval_ms": settings.PROFILE_INTERVAL_MS,
+        "samples": sum(stacks.values()),
+        "stacks": dict(stacks.most_common()),
+        "queries": [
+            {
+                "sql": sql,
+                "alias": alias,
+                "duration_ms": round(duration * 1000, 3),
+                **({"plan": plans[idx]} if idx in plans else {}),
+            }
+            for idx, (sql, _, duration, alias) in enumerate(queries.entries)
+        ],
+        "queries_dropped": queries.dropped,
+    }
+
+
+def _profile_dir() -> Path:
+    return Path(settings.PROFILE_DIR)
+
+
+def save_profile(data: dict) -> str:
+    directory = _profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = f"{int(time.time() * 1000):013d}-{uuid.uuid4().hex[:8]}"
+    data = {"id": profile_id, **data}
+
+    tmp = directory / f"{profile_id}.tmp"
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, directory / f"{profile_id}.json")
+
+    # кільцевий буфер: найстаріші файли (імʼя починається з часу) — геть
+    files = sorted(directory.glob("*.json"))
+    for path in files[: max(len(files) - settings.PROFILE_MAX_FILES, 0)]:
+        path.unlink(missing_ok=True)
+    return profile_id
+
+
+def list_profiles() -> list[dict]:
+    if not settings.PROFILE_DIR:
+        return []
+    result = []
+    for path in sorted(_profile_dir().glob("*.json"), reverse=True):
+        data = load_profile(path.stem)
+        if data is None:
+            continue
+        summary = {key: value for key, value in data.items() if key not in ("stacks", "queries")}
+        summary["query_count"] = len(data["queries"])
+        result.append(summary)
+    return result
+
+
+def load_profile(profile_id: str) -> dict | None:
+    if not settings.PROFILE_DIR or not PROFILE_ID_RE.match(profile_id):
+        return None
+    try:
+        return json.loads((_profile_dir() / f"{profile_id}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        # файл міг щойно витіснитись з буфера
+        return None
+
+
+def folded(stacks: dict) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.items())
@@ -0,0 +1,60 @@
+"""
+Renderers з content negotiation (Accept / ?format=):
+  - FastJSONRenderer — orjson замість stdlib json, той самий формат, що й у DRF;
+  - MessagePackRenderer — бінарний формат для великих payload-ів (kanban, списки).
+
+Відмінності FastJSONRenderer від JSONRenderer, які лишаються свідомо:
+  - NaN/Infinity orjson пише як null, DRF (STRICT_JSON) кидає ValueError;
+  - дрібні float-и (< 1e-4) інакше записані: 0.000025 / 1e-6 замість
+    2.5e-05 / 1e-06 (значення після парсингу ті самі, решта збігається побайтно).
+У payload-ах API таких float-ів немає: рейтинги цілі, частки округлені.
+"""
+
+from decimal import Decimal
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# datetime/date/time віддаємо енкодеру DRF: він обрізає мікросекунди до мілісекунд
+# і пише "Z" замість "+00:00"; серіалізатори й так повертають їх рядками
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Decimal -> float, як у rest_framework.utils.encoders.JSONEncoder
+    if isinstance(obj, Decimal):
+        return float(obj)
+    # решта (lazy-рядки, QuerySet, datetime для msgpack тощо) — логіка DRF
+    return _drf_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            # orjson вміє лише indent=2 — форматований вивід віддаємо DRF
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        # як і DRF: U+2028/U+2029 екрануємо для безпечного вбудовування в JS
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # datetime/Decimal кодуємо так само, як у JSON (ISO-рядок / float)
+        return msgpack.packb(data, default=_default, use_bin_type=True)
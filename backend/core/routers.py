@@ -0,0 +1,34 @@
+"""
+Роутинг моделей між базами: холодний архів (alias "archive") — окремий
+SQLite-файл, щоб старі події не роздували основну базу і її бекапи.
+"""
+
+ARCHIVE_DB = "archive"
+
+# app_label.model_name моделей, що живуть лише в архівній базі
+ARCHIVE_MODELS = {"pipeline.archivedstagechangeevent"}
+
+
+class ArchiveRouter:
+    def _is_archive(self, model) -> bool:
+        return model._meta.label_lower in ARCHIVE_MODELS
+
+    def db_for_read(self, model, **hints):
+        return ARCHIVE_DB if self._is_archive(model) else None
+
+    def db_for_write(self, model, **hints):
+        return ARCHIVE_DB if self._is_archive(model) else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # між базами FK неможливі — архівні моделі зберігають лише id
+        if self._is_archive(obj1) or self._is_archive(obj2):
+            return False
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        label = f"{app_label}.{model_name}" if model_name else None
+        if db == ARCHIVE_DB:
+            return label in ARCHIVE_MODELS
+        if label in ARCHIVE_MODELS:
+            return False
+        return None
@@ -0,0 +1,221 @@
+"""
+Журнал повільних запитів і агрегати часу SQL по fingerprint-ах.
+
+Fingerprint — SQL без літералів і з IN (...) / VALUES (...) замість списків:
+той самий запит з різними id чи довжиною списку дає один рядок звіту.
+Агрегати (count, total, max, гістограма для p95) ведуться по парах
+(маршрут, fingerprint); маршрут — як у метриках (project-kanban), поза
+запитами — "manage.py <команда>".
+
+Обгортка ставиться на кожне зʼєднання (connection_created, core/apps.py).
+Запити довші за SLOW_QUERY_MS пишуться в лог "core.sqlstats" без параметрів.
+Знімок процесу раз на SQL_STATS_FLUSH_SECONDS лягає в SQL_STATS_DIR;
+manage.py sql_report підсумовує знімки всіх процесів.
+"""
+
+import logging
+import math
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+
+from .metrics import read_process_snapshots, write_process_snapshot
+
+logger = logging.getLogger(__name__)
+
+# межі бакетів гістограми, мс: 0.05 * 1.25^i (точність p95 — до 25%)
+BUCKET_BASE_MS = 0.05
+BUCKET_GROWTH = 1.25
+OTHER = "<other>"
+
+_lock = threading.Lock()
+# (route, fingerprint) -> [count, total_ms, max_ms, {bucket: count}]
+_stats: dict[tuple, list] = {}
+_flushed_at = time.monotonic()
+
+# під час запиту — (шлях, [(fingerprint, ms), ...]), агрегується з маршрутом у кінці
+_pending: ContextVar[tuple | None] = ContextVar("sqlstats_pending", default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    sql = _SPACES.sub(" ", sql).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    return _ROWS.sub(r"\1", sql)
+
+
+def _bucket(duration_ms: float) -> int:
+    if duration_ms <= BUCKET_BASE_MS:
+        return 0
+    return math.ceil(math.log(duration_ms / BUCKET_BASE_MS, BUCKET_GROWTH))
+
+
+def bucket_upper_ms(index: int) -> float:
+    return BUCKET_BASE_MS * BUCKET_GROWTH**index
+
+
+def background_route() -> str:
+    if len(sys.argv) > 1 and sys.argv[0].endswith("manage.py"):
+        return f"manage.py {sys.argv[1]}"
+    return "-"
+
+
+def aggregate(route: str, entries) -> None:
+    with _lock:
+        for fp, duration_ms in entries:
+            key = (route, fp)
+            row = _stats.get(key)
+            if row is None:
+                if len(_stats) >= settings.SQL_STATS_MAX_KEYS:
+                    key = (route, OTHER)
+                    row = _stats.get(key)
+                if row is None:
+                    row = _stats[key] = [0, 0.0, 0.0, {}]
+            row[0] += 1
+            row[1] += duration_ms
+            row[2] = max(row[2], duration_ms)
+            bucket = _bucket(duration_ms)
+            row[3][bucket] = row[3].get(bucket, 0) + 1
+    flush()
+
+
+def sql_stats_wrapper(execute, sql, params, many, context):
+    if not settings.SQL_STATS_ENABLED:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        pending = _pending.get()
+        if duration_ms >= settings.SLOW_QUERY_MS:
+            # параметри можуть містити персональні дані — лише їх кількість
+            count = len(params) if isinstance(params, (list, tuple)) else 0
+            logger.warning(
+                "Slow query %.1f ms (%s, db=%s): %s [%d params redacted]",
+                duration_ms,
+                pending[0] if pending is not None else background_route(),
+                context["connection"].alias,
+                sql,
+                count,
+            )
+        if pending is not None:
+            pending[1].append((fingerprint(sql), duration_ms))
+        else:
+            aggregate(background_route(), [(fingerprint(sql), duration_ms)])
+
+
+def install(connection, **kwargs) -> None:
+    """
+    Receiver connection_created: одна обгортка на зʼєднання (і після reconnect).
+    """
+    if sql_stats_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_stats_wrapper)
+
+
+def begin_request(request):
+    return _pending.set((f"{request.method} {request.path}", []))
+
+
+def end_request(token, route: str) -> None:
+    _, entries = _pending.get()
+    _pending.reset(token)
+    if entries:
+        aggregate(route, entries)
+
+
+def snapshot() -> dict:
+    with _lock:
+        rows = [
+            [route, fp, count, total, peak, {str(k): v for k, v in buckets.items()}]
+            for (route, fp), (count, total, peak, buckets) in _stats.items()
+        ]
+    return {"rows": rows}
+
+
+def reset_sql_stats() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def flush(force: bool = False) -> None:
+    global _flushed_at
+    if not settings.SQL_STATS_DIR:
+        return
+    now = time.monotonic()
+    if not force and now - _flushed_at < settings.SQL_STATS_FLUSH_SECONDS:
+        return
+    _flushed_at = now
+    write_process_snapshot(settings.SQL_STATS_DIR, snapshot())
+
+
+def percentile_ms(buckets: dict, count: int, peak: float, q: float = 0.95) -> float:
+    target = q * count
+    seen = 0
+    for index in sorted(buckets):
+        seen += buckets[index]
+        if seen >= target:
+            return min(bucket_upper_ms(index), peak)
+    return peak
+
+
+def report(by_route: bool = False, route: str | None = None) -> list[dict]:
+    """
+    Рядки звіту, відсортовані за сумарним часом (усі процеси з SQL_STATS_DIR).
+    """
+    if settings.SQL_STATS_DIR:
+        flush(force=True)
+        snapshots = read_process_snapshots(settings.SQL_STATS_DIR)
+    else:
+        snapshots = [snapshot()]
+
+    merged = {}
+    for data in snapshots:
+        for row_route, fp, count, total, peak, buckets in data["rows"]:
+            if route and row_route != route:
+                continue
+            key = (row_route, fp) if by_route else fp
+            entry = merged.setdefault(
+                key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "buckets": {}, "routes": {}}
+            )
+            entry["count"] += count
+            entry["total_ms"] += total
+            entry["max_ms"] = max(entry["max_ms"], peak)
+            entry["routes"][row_route] = entry["routes"].get(row_route, 0.0) + total
+            for index, value in buckets.items():
+                entry["buckets"][int(index)] = entry["buckets"].get(int(index), 0) + value
+
+    rows = []
+    for key, entry in merged.items():
+        routes = sorted(entry["routes"], key=entry["routes"].get, reverse=True)
+        rows.append(
+            {
+                "fingerprint": key[1] if by_route else key,
+                "routes": routes,
+                "count": entry["count"],
+                "total_ms": round(entry["total_ms"], 3),
+                "avg_ms": round(entry["total_ms"] / entry["count"], 3),
+                "p95_ms": round(
+                    percentile_ms(entry["buckets"], entry["count"], entry["max_ms"]), 3
+                ),
+                "max_ms": round(entry["max_ms"], 3),
+            }
+        )
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
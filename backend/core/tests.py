@@ -1 +1,380 @@
-# Create your tests here.
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time as time_module
+import uuid
+from datetime import UTC, date, datetime, time
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from candidates.models import Candidate
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from pipeline.models import Application, Stage
+from projects.models import Project
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from users.models import User
+
+from .metrics import flush, reset_metrics
+from .profiling import fold
+from .renderers import FastJSONRenderer
+from .sqlstats import fingerprint, report, reset_sql_stats
+
+
+class BatchApiTests(TestCase):
+    """
+    /batch/ виконує під-запити через resolver з однією автентифікацією.
+    """
+
+    def setUp(self):
+        User.objects.create_user(email="rec@example.com", password="secret-pass")
+        self.candidate = Candidate.objects.create(
+            first_name="Ivan", last_name="Petrenko", email="ivan@example.com", rating=1
+        )
+        self.client = APIClient()
+        access = self.client.post(
+            "/api/v1/auth/login/",
+            {"email": "rec@example.com", "password": "secret-pass"},
+            format="json",
+        ).json()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def batch(self, requests, **extra):
+        return self.client.post("/api/v1/batch/", {"requests": requests, **extra}, format="json")
+
+    def test_subrequests_share_one_auth_pass(self):
+        url = f"/api/v1/candidates/{self.candidate.id}/"
+        self.client.get("/api/v1/auth/me/")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.batch(
+                [
+                    {"method": "PATCH", "path": url, "body": {"rating": 5}},
+                    {"method": "GET", "path": url},
+                    {"method": "GET", "path": "/api/v1/auth/me/"},
+                    {"method": "GET", "path": "/api/v1/nope/"},
+                    {"method": "POST", "path": "/api/v1/batch/", "body": {"requests": []}},
+                ]
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        results = response.json()["responses"]
+        self.assertEqual([r["status"] for r in results], [200, 200, 200, 404, 404])
+        self.assertEqual(results[1]["body"]["rating"], 5)
+        self.assertEqual(results[2]["body"]["email"], "rec@example.com")
+        self.assertIn("ETag", results[1]["headers"])
+        self.assertTrue(all(r["duration_ms"] >= 0 for r in results))
+        self.assertFalse(any('FROM "users_user"' in q["sql"] for q in ctx.captured_queries))
+
+    def test_atomic_batch_rolls_back(self):
+        response = self.batch(
+            [
+                {
+                    "method": "POST",
+                    "path": "/api/v1/candidates/",
+                    "body": {"first_name": "Olha", "last_name": "K", "email": "olha@example.com"},
+                },
+                {"method": "POST", "path": "/api/v1/candidates/", "body": {"email": "bad"}},
+                {"method": "GET", "path": "/api/v1/candidates/"},
+            ],
+            atomic=True,
+        )
+        data = response.json()
+        self.assertTrue(data["rolled_back"])
+        self.assertEqual([r["status"] for r in data["responses"]], [201, 400])
+        self.assertFalse(Candidate.objects.filter(email="olha@example.com").exists())
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_batch_size_limit(self):
+        response = self.batch([{"method": "GET", "path": "/api/v1/auth/me/"}] * 3)
+        self.assertEqual(response.status_code, 400)
+
+
+class FastJSONRendererTests(TestCase):
+    """
+    FastJSONRenderer (orjson) дає побайтно той самий JSON, що й DRF JSONRenderer.
+    """
+
+    def assert_same(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_kanban_payload(self):
+        user = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        project = Project.objects.create(title="Бекенд", owner=user)
+        stage = Stage.objects.get(project=project, system_key="new")
+        for idx in range(3):
+            candidate = Candidate.objects.create(
+                first_name="Олена\u2028", last_name=str(idx), email=f"c{idx}@x.com", rating=idx
+            )
+            Application.objects.create(project=project, candidate=candidate, current_stage=stage)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.get(f"/api/v1/projects/{project.id}/kanban/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        self.assert_same(response.data)
+
+    def test_python_types(self):
+        self.assert_same(
+            {
+                "datetime": datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=UTC),
+                "naive": datetime(2026, 1, 2, 3, 4, 5, 678901),
+                "date": date(2026, 1, 2),
+                "time": time(3, 4, 5, 678901),
+                "decimal": Decimal("1.50"),
+                "uuid": uuid.UUID(int=1),
+                "floats": [0.1, 1e16, 1e-4, 3.14],
+                1: "int key",
+                "nested": [{"a": None, "b": True}, ("tuple",)],
+            }
+        )
+
+
+@override_settings(METRICS_TOKEN="scrape", METRICS_DIR="")
+class MetricsTests(TestCase):
+    """
+    Middleware пише лічильники і гістограми по маршрутах, /metrics/ віддає їх
+    у форматі Prometheus, підсумовуючи знімки процесів з METRICS_DIR.
+    """
+
+    def setUp(self):
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+        user = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        self.project = Project.objects.create(title="Backend", owner=user)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def scrape(self) -> str:
+        response = self.client.get("/api/v1/metrics/", HTTP_AUTHORIZATION="Bearer scrape")
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode("utf-8")
+
+    def test_route_histograms(self):
+        for _ in range(2):
+            self.client.get(f"/api/v1/projects/{self.project.id}/kanban/")
+        self.client.get("/api/v1/health/")
+
+        text = self.scrape()
+        self.assertIn(
+            'nexo_http_requests_total{method="GET",route="project-kanban",status="200"} 2', text
+        )
+        self.assertIn('nexo_http_requests_total{method="GET",route="health",status="200"} 1', text)
+        self.assertIn('nexo_http_request_duration_seconds_count{route="project-kanban"} 2', text)
+        self.assertIn('nexo_http_db_queries_bucket{route="health",le="0"} 1', text)
+        self.assertIn('nexo_http_response_size_bytes_bucket{route="health",le="+Inf"} 1', text)
+        self.assertIn('nexo_payload_cache_requests_total{outcome="hits",section="kanban"}', text)
+
+        self.assertEqual(self.client.get("/api/v1/metrics/").status_code, 403)
+
+    def test_process_snapshots_are_merged(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(METRICS_DIR=tmp):
+            # «інший воркер» уже скинув свій знімок
+            other = {
+                "counters": [
+                    [
+                        "nexo_http_requests_total",
+                        [["method", "GET"], ["route", "health"], ["status", "200"]],
+                        3,
+                    ]
+                ],
+                "histograms": [],
+            }
+            Path(tmp, "other-1.json").write_text(json.dumps(other))
+
+            self.client.get("/api/v1/health/")
+            flush(force=True)
+            text = self.scrape()
+            self.assertEqual(len(list(Path(tmp).glob("*.json"))), 2)
+
+        self.assertIn('nexo_http_requests_total{method="GET",route="health",status="200"} 4', text)
+
+    def test_stale_process_snapshots_are_pruned(self):
+        finished = subprocess.Popen([sys.executable, "-c", ""])
+        finished.wait()
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            override_settings(METRICS_DIR=tmp, PROCESS_SNAPSHOT_MAX_AGE_SECONDS=60),
+        ):
+            empty = json.dumps({"counters": [], "histograms": []})
+            dead = Path(tmp, f"{socket.gethostname()}-{finished.pid}.json")
+            idle = Path(tmp, "other-1.json")
+            gone = Path(tmp, "other-2.json")
+            for path in (dead, idle, gone):
+                path.write_text(empty)
+            # воркер з іншого хоста давно не скидав знімок
+            os.utime(gone, (time_module.time() - 120,) * 2)
+
+            flush(force=True)
+            self.scrape()
+            names = sorted(path.name for path in Path(tmp).glob("*.json"))
+
+        self.assertEqual(names, sorted([f"{socket.gethostname()}-{os.getpid()}.json", idle.name]))
+
+
+class ServerTimingTests(TestCase):
+    """
+    Server-Timing з фазами DRF-view для вибірки запитів.
+    """
+
+    def setUp(self):
+        user = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        self.project = Project.objects.create(title="Backend", owner=user)
+        Candidate.objects.create(first_name="Ivan", last_name="P", email="ivan@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def phases(self, response) -> dict:
+        entries = [part.strip().split(";") for part in response["Server-Timing"].split(",")]
+        return {entry[0]: entry[1:] for entry in entries}
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_phases_in_header(self):
+        phases = self.phases(self.client.get("/api/v1/candidates/"))
+        for name in ("auth", "perm", "etag", "queryset", "serialize", "prefetch", "view"):
+            self.assertIn(name, phases)
+        self.assertIn("render", phases)
+        self.assertTrue(phases["db"][1].startswith('desc="'))
+
+        phases = self.phases(self.client.get(f"/api/v1/projects/{self.project.id}/kanban/"))
+        self.assertIn("build", phases)
+        self.assertIn("cache", phases)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_disabled_and_debug_trailer(self):
+        response = self.client.get("/api/v1/candidates/")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+        with override_settings(DEBUG=True):
+            response = self.client.get(f"/api/v1/projects/{self.project.id}/", {"_timing": "1"})
+        self.assertTrue(response.has_header("Server-Timing"))
+        self.assertIn("perm", response.json()["_timing"])
+
+
+class ProfilingTests(TestCase):
+    """
+    Профілі повільних і вибраних запитів: стеки, SQL з планами, кільцевий буфер.
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        patcher = override_settings(
+            PROFILING_ENABLED=True,
+            PROFILE_DIR=self.dir,
+            PROFILE_SAMPLE_RATE=0,
+            PROFILE_SLOW_MS=0.001,
+            PROFILE_INTERVAL_MS=1,
+            PROFILE_MAX_FILES=2,
+        )
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+        self.admin = User.objects.create_user(email="admin@example.com", role=User.Role.ADMIN)
+        self.project = Project.objects.create(title="Backend", owner=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_slow_requests_are_captured(self):
+        for _ in range(3):
+            self.client.get("/api/v1/candidates/")
+        self.client.get(f"/api/v1/projects/{self.project.id}/kanban/")
+
+        with override_settings(PROFILING_ENABLED=False):
+            profiles = self.client.get("/api/v1/profiles/").json()
+            # буфер тримає лише 2 останні профілі
+            self.assertEqual(len(profiles), 2)
+            self.assertEqual(profiles[0]["route"], "project-kanban")
+            self.assertEqual(profiles[0]["reason"], "slow")
+
+            detail = self.client.get(f"/api/v1/profiles/{profiles[0]['id']}/").json()
+            self.assertTrue(detail["queries"])
+            self.assertTrue(any("plan" in q for q in detail["queries"]))
+
+            response = self.client.get(f"/api/v1/profiles/{profiles[0]['id']}/folded/")
+            self.assertEqual(response["Content-Type"], "text/plain; charset=utf-8")
+            self.assertEqual(self.client.get("/api/v1/profiles/bad/").status_code, 404)
+
+            self.client.force_authenticate(
+                User.objects.create_user(email="rec@example.com", role=User.Role.RECRUITER)
+            )
+            self.assertEqual(self.client.get("/api/v1/profiles/").status_code, 403)
+
+        out = StringIO()
+        call_command("profiles", stdout=out)
+        self.assertIn("2 profile(s)", out.getvalue())
+
+    def test_folded_stack_format(self):
+        stack = fold(sys._getframe())
+        self.assertTrue(
+            stack.endswith(
+                f"test_folded_stack_format (core/tests.py:{sys._getframe().f_code.co_firstlineno})"
+            )
+        )
+        self.assertIn(";", stack)
+
+
+class SqlStatsTests(TestCase):
+    """
+    Час SQL агрегується по fingerprint-ах і маршрутах; повільні запити — в лог.
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = override_settings(SQL_STATS_DIR=Path(tmp.name), SLOW_QUERY_MS=10_000)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+        reset_sql_stats()
+        self.addCleanup(reset_sql_stats)
+
+        user = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        Candidate.objects.create(first_name="Ivan", last_name="P", email="ivan@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_fingerprint_normalization(self):
+        self.assertEqual(
+            fingerprint("SELECT  *\n FROM \"t1\" WHERE id IN (%s, %s, %s) AND name = 'O''Neil'"),
+            'SELECT * FROM "t1" WHERE id IN (...) AND name = ?',
+        )
+        self.assertEqual(
+            fingerprint("INSERT INTO t (a, b) VALUES (%s, 1), (%s, 2.5)"),
+            fingerprint("INSERT INTO t (a, b) VALUES (%s, %s)"),
+        )
+        self.assertEqual(fingerprint("SELECT 1 LIMIT 21"), "SELECT ? LIMIT ?")
+
+    def test_route_aggregates_and_report(self):
+        for _ in range(3):
+            self.client.get("/api/v1/candidates/")
+
+        rows = report(by_route=True, route="candidate-list")
+        self.assertTrue(rows)
+        top = rows[0]
+        self.assertEqual(top["routes"], ["candidate-list"])
+        self.assertEqual(top["count"] % 3, 0)
+        self.assertLessEqual(top["p95_ms"], top["max_ms"])
+        self.assertTrue(any('FROM "candidates_candidate"' in row["fingerprint"] for row in rows))
+        self.assertEqual(rows, sorted(rows, key=lambda row: row["total_ms"], reverse=True))
+
+        out = StringIO()
+        call_command("sql_report", "--route", "candidate-list", "--limit", "1", stdout=out)
+        self.assertIn("candidate-list", out.getvalue())
+        self.assertIn(f"{len(rows)} fingerprint(s)", out.getvalue())
+
+    def test_slow_queries_are_logged_without_params(self):
+        with (
+            override_settings(SLOW_QUERY_MS=0),
+            self.assertLogs("core.sqlstats", "WARNING") as logs,
+        ):
+            list(Candidate.objects.filter(email="secret@example.com"))
+        self.assertIn("params redacted", logs.output[0])
+        self.assertNotIn("secret@example.com", "".join(logs.output))
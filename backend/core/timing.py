@@ -0,0 +1,130 @@
+"""
+Server-Timing: розбивка часу запиту на фази (auth, perm, etag, cache, queryset,
+prefetch, build, serialize, view, render) плюс сумарний час SQL.
+
+ServerTimingMiddleware вмикає вимірювання для частки запитів
+SERVER_TIMING_SAMPLE_RATE (у DEBUG — ще й для ?_timing=1, тоді ж у JSON-відповідь
+додається "_timing"). Поточний таймер лежить у contextvar: timing_phase() поза
+вибіркою — це один ContextVar.get(), тож виклики можна лишати в гарячих місцях.
+"""
+
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from .metrics import QueryStats
+
+_current: ContextVar["RequestTimer | None"] = ContextVar("server_timing", default=None)
+
+
+class RequestTimer:
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self.started = time.perf_counter()
+        self.queries = QueryStats()
+        # name -> [секунди, кількість входів]
+        self.phases: dict[str, list] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def as_dict(self) -> dict:
+        data = {name: round(seconds * 1000, 3) for name, (seconds, _) in self.phases.items()}
+        data["db"] = round(self.queries.duration * 1000, 3)
+        data["db_queries"] = self.queries.count
+        data["total"] = round((time.perf_counter() - self.started) * 1000, 3)
+        return data
+
+    def header(self) -> str:
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, (seconds, _) in self.phases.items()]
+        entries.append(
+            f'db;dur={self.queries.duration * 1000:.2f};desc="{self.queries.count} queries"'
+        )
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.2f}")
+        return ", ".join(entries)
+
+
+def current_timer() -> RequestTimer | None:
+    return _current.get()
+
+
+def timing_phase(name: str):
+    timer = _current.get()
+    if timer is None:
+        return nullcontext()
+    return timer.phase(name)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        debug = settings.DEBUG and request.GET.get("_timing") == "1"
+        rate = settings.SERVER_TIMING_SAMPLE_RATE
+        if not debug and (rate <= 0 or random.random() >= rate):
+            return self.get_response(request)
+
+        timer = RequestTimer(debug=debug)
+        token = _current.set(timer)
+        try:
+            with timer.queries.track():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        response["Server-Timing"] = timer.header()
+        return response
+
+
+class ServerTimingMixin:
+    """
+    Фази DRF-view для Server-Timing: auth, perm, view (handler), render.
+    Має стояти першим серед базових класів; etag/queryset/serialize/build
+    додають ConditionalGetMixin, ColumnarMixin і cached_payload через timing_phase().
+    """
+
+    def perform_authentication(self, request):
+        with timing_phase("auth"):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with timing_phase("perm"):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with timing_phase("perm"):
+            super().check_object_permissions(request, obj)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._handler_started = time.perf_counter()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        timer = _current.get()
+        started = getattr(self, "_handler_started", None)
+        if timer is not None and started is not None:
+            timer.add("view", time.perf_counter() - started)
+
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if timer is None or not hasattr(response, "accepted_renderer"):
+            return response
+
+        if timer.debug and isinstance(response.data, dict):
+            response.data = {**response.data, "_timing": timer.as_dict()}
+        # рендеримо тут, а не в handler-і Django, щоб виміряти окремо
+        with timer.phase("render"):
+            response.render()
+        return response
@@ -1,6 +1,17 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from users.permissions import IsAdminRole
+
+from .batch import run_batch
+from .metrics import collect, render
+from .profiling import folded, list_profiles, load_profile
+from .serializers import BatchSerializer
 
 
 @api_view(["GET"])
@@ -9,4 +20,60 @@ def health(request):
     return Response({"status": "ok"})
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    {"requests": [{"method", "path", "body"?, "headers"?}], "atomic"?} ->
+    {"responses": [{"status", "headers", "body", "duration_ms"}], ...}
+    """
+    serializer = BatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    return Response(run_batch(request, data["requests"], atomic=data["atomic"]))
+
+
+def metrics(request):
+    """
+    Prometheus exposition. З METRICS_TOKEN — лише з "Authorization: Bearer <token>",
+    без нього — тільки в DEBUG.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        provided = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(provided, token):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        raise Http404()
+
+    return HttpResponse(render(*collect()), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def profiles(request):
+    return Response(list_profiles())
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def profile_detail(request, profile_id):
+    data = load_profile(profile_id)
+    if data is None:
+        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def profile_folded(request, profile_id):
+    """
+    Згорнуті стеки для flamegraph.pl / speedscope.
+    """
+    data = load_profile(profile_id)
+    if data is None:
+        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    return HttpResponse(folded(data["stacks"]), content_type="text/plain; charset=utf-8")
+
+
 # Create your views here.
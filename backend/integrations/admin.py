@@ -0,0 +1,26 @@
+from django.contrib import admin
+
+from .models import OutboxEvent, WebhookSubscription
+
+
+@admin.register(WebhookSubscription)
+class WebhookSubscriptionAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "name",
+        "url",
+        "is_active",
+        "last_event_id",
+        "failures",
+        "next_attempt_at",
+        "last_delivered_at",
+    )
+    list_filter = ("is_active",)
+    search_fields = ("name", "url")
+    readonly_fields = ("failures", "next_attempt_at", "last_delivered_at", "last_error")
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "topic", "project_id", "created_at")
+    list_filter = ("topic",)
@@ -0,0 +1,208 @@
+"""
+Доставка OutboxEvent підписникам (WebhookSubscription).
+
+Кожен підписник має власний offset і отримує події пачками в порядку id.
+HTTP-запити різних підписників ідуть паралельно (пул потоків з обмеженням),
+пачки одного підписника — строго послідовно: offset зсувається лише після 2xx,
+помилка відкладає підписника з експоненційним backoff-ом.
+Усі звернення до БД — у головному потоці, потоки пулу лише роблять HTTP.
+
+Події, молодші за WEBHOOK_DELIVERY_LAG_SECONDS, ще не видаємо: транзакція з
+меншим id може закомітитись пізніше за сусідню, і offset би її «перестрибнув».
+"""
+
+import hashlib
+import hmac
+import json
+import random
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from .models import OutboxEvent, WebhookSubscription
+
+
+def due_subscriptions(now) -> list[WebhookSubscription]:
+    return list(
+        WebhookSubscription.objects.filter(is_active=True)
+        .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+        .order_by("id")
+    )
+
+
+def pending_events(subscription, cutoff, batch_size: int) -> list[OutboxEvent]:
+    qs = OutboxEvent.objects.filter(id__gt=subscription.last_event_id)
+    if subscription.topics:
+        qs = qs.filter(topic__in=subscription.topics)
+    if subscription.project_ids:
+        qs = qs.filter(project_id__in=subscription.project_ids)
+
+    events = list(qs.order_by("id")[:batch_size])
+    # зупиняємось на першій «свіжій» події, щоб не пропустити ще не закомічені
+    for idx, event in enumerate(events):
+        if event.created_at >= cutoff:
+            return events[:idx]
+    return events
+
+
+def batch_body(subscription, events) -> bytes:
+    data = {
+        "subscription": subscription.name,
+        "events": [
+            {
+                "id": event.id,
+                "topic": event.topic,
+                "created_at": event.created_at.isoformat(),
+                "payload": event.payload,
+            }
+            for event in events
+        ],
+    }
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def batch_headers(subscription, body: bytes, events) -> dict:
+    headers = {
+        "Content-Type": "application/json",
+        # ідемпотентність на боці підписника: повтор пачки має той самий id
+        "X-Nexo-Delivery": f"{subscription.id}:{events[0].id}-{events[-1].id}",
+    }
+    if subscription.secret:
+        digest = hmac.new(subscription.secret.encode("utf-8"), body, hashlib.sha256)
+        headers["X-Nexo-Signature"] = f"sha256={digest.hexdigest()}"
+    return headers
+
+
+def post_batch(url: str, body: bytes, headers: dict, timeout: float) -> str | None:
+    """
+    POST пачки; None — успіх, інакше текст помилки.
+    """
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            if 200 <= response.status < 300:
+                return None
+            return f"HTTP {response.status}"
+    except urllib.error.HTTPError as exc:
+        return f"HTTP {exc.code}"
+    except (urllib.error.URLError, OSError) as exc:
+        return str(getattr(exc, "reason", exc))
+
+
+def retry_delay(failures: int) -> float:
+    # експоненційний backoff з jitter, щоб підписники після збою не били синхронно
+    delay = min(
+        settings.WEBHOOK_RETRY_BASE_SECONDS * 2 ** (failures - 1),
+        settings.WEBHOOK_RETRY_MAX_SECONDS,
+    )
+    return delay * random.uniform(1.0, 1.2)
+
+
+def deliver_round(
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+    timeout: float | None = None,
+    lag_seconds: int | None = None,
+) -> dict:
+    """
+    Одна пачка для кожного підписника, що чекає доставки. Повертає статистику.
+    """
+    batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+    concurrency = concurrency or settings.WEBHOOK_CONCURRENCY
+    timeout = timeout or settings.WEBHOOK_TIMEOUT_SECONDS
+    if lag_seconds is None:
+        lag_seconds = settings.WEBHOOK_DELIVERY_LAG_SECONDS
+
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=lag_seconds)
+
+    batches, idle = [], []
+    for subscription in due_subscriptions(now):
+        events = pending_events(subscription, cutoff, batch_size)
+        if events:
+            batches.append((subscription, events))
+        else:
+            idle.append(subscription.id)
+
+    if idle:
+        # підписник з фільтром тем/проєктів інакше стояв би на старому offset-і
+        # і блокував prune_outbox; пропущені події йому не адресовані
+        seen = OutboxEvent.objects.filter(created_at__lt=cutoff).aggregate(last=Max("id"))["last"]
+        if seen:
+            WebhookSubscription.objects.filter(id__in=idle, last_event_id__lt=seen).update(
+                last_event_id=seen
+            )
+
+    stats = {"batches": len(batches), "delivered": 0, "failed": 0}
+    if not batches:
+        return stats
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(batches))) as pool:
+        futures = {}
+        for subscription, events in batches:
+            body = batch_body(subscription, events)
+            headers = batch_headers(subscription, body, events)
+            future = pool.submit(post_batch, subscription.url, body, headers, timeout)
+            futures[future] = (subscription, events)
+
+        for future in as_completed(futures):
+            subscription, events = futures[future]
+            error = future.result()
+            # update() замість save(): не перезаписуємо зміни з адмінки (is_active, url)
+            subscriptions = WebhookSubscription.objects.filter(id=subscription.id)
+            if error is None:
+                subscriptions.update(
+                    last_event_id=events[-1].id,
+                    failures=0,
+                    next_attempt_at=None,
+                    last_delivered_at=timezone.now(),
+                    last_error="",
+                )
+                stats["delivered"] += len(events)
+            else:
+                failures = subscription.failures + 1
+                subscriptions.update(
+                    failures=failures,
+                    next_attempt_at=timezone.now() + timedelta(seconds=retry_delay(failures)),
+                    last_error=error[:1000],
+                )
+                stats["failed"] += 1
+
+    return stats
+
+
+def deliver_pending(**options) -> dict:
+    """
+    Раунди доставки, доки є що відправляти (невдалі підписники чекають backoff).
+    """
+    total = {"batches": 0, "delivered": 0, "failed": 0}
+    while True:
+        stats = deliver_round(**options)
+        for key, value in stats.items():
+            total[key] += value
+        if not stats["batches"]:
+            return total
+
+
+def prune_outbox(retention_days: int | None = None) -> int:
+    """
+    Видаляє події, старші за retention, які вже отримали всі активні підписники.
+    """
+    if retention_days is None:
+        retention_days = settings.OUTBOX_RETENTION_DAYS
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    qs = OutboxEvent.objects.filter(created_at__lt=cutoff)
+    delivered_up_to = WebhookSubscription.objects.filter(is_active=True).aggregate(
+        last=Min("last_event_id")
+    )["last"]
+    if delivered_up_to is not None:
+        qs = qs.filter(id__lte=delivered_up_to)
+
+    deleted, _ = qs.delete()
+    return deleted
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from integrations.delivery import deliver_pending, prune_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver outbox events to webhook subscribers (run from cron or with --loop)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Events per request (default: settings)")
+        parser.add_argument(
+            "--concurrency", type=int, help="Parallel subscribers (default: settings)"
+        )
+        parser.add_argument("--timeout", type=float, help="HTTP timeout, seconds")
+        parser.add_argument(
+            "--lag", type=int, help="Skip events newer than N seconds (default: settings)"
+        )
+        parser.add_argument(
+            "--loop", type=float, help="Keep running, sleeping N seconds between passes"
+        )
+        parser.add_argument(
+            "--prune", action="store_true", help="Delete old events delivered to everyone"
+        )
+
+    def handle(self, *args, **options):
+        delivery_options = {
+            "batch_size": options["batch_size"],
+            "concurrency": options["concurrency"],
+            "timeout": options["timeout"],
+            "lag_seconds": options["lag"],
+        }
+
+        while True:
+            stats = deliver_pending(**delivery_options)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Delivered {stats['delivered']} events in {stats['batches']} batches "
+                    f"({stats['failed']} failed)"
+                )
+            )
+            if options["prune"]:
+                deleted = prune_outbox()
+                self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} outbox events"))
+
+            if not options["loop"]:
+                return
+            time.sleep(options["loop"])
@@ -0,0 +1,60 @@
+from core.models import TimeStampedModel
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    Подія для зовнішніх інтеграцій (transactional outbox).
+
+    Пишеться в тій самій транзакції, що й зміна пайплайна: після rollback-у
+    події немає, після commit-у вона гарантовано буде доставлена
+    (integrations/delivery.py). project_id без FK — подія переживає проєкт.
+    """
+
+    topic = models.CharField(max_length=50)
+    project_id = models.BigIntegerField(null=True, blank=True)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"{self.id}:{self.topic}"
+
+
+class WebhookSubscription(TimeStampedModel):
+    """
+    Підписник на outbox-події. last_event_id — offset: останній доставлений
+    OutboxEvent.id; зсувається лише після успішної (2xx) доставки пачки.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    url = models.URLField(max_length=500)
+    # ключ HMAC-SHA256 підпису тіла (заголовок X-Nexo-Signature)
+    secret = models.CharField(max_length=200, blank=True, default="")
+
+    # порожній список — без фільтра
+    topics = models.JSONField(default=list, blank=True)
+    project_ids = models.JSONField(default=list, blank=True)
+
+    is_active = models.BooleanField(default=True)
+
+    last_event_id = models.BigIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_delivered_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:
+        return self.name
+
+    def save(self, *args, **kwargs):
+        # новий підписник отримує події з моменту підписки, а не весь outbox
+        if self._state.adding and not self.last_event_id:
+            last = OutboxEvent.objects.order_by("-id").values_list("id", flat=True).first()
+            self.last_event_id = last or 0
+        super().save(*args, **kwargs)
@@ -0,0 +1,42 @@
+"""
+Запис подій пайплайна в outbox. Кожен write path додає рівно один INSERT:
+publish() пише всі події запиту одним bulk_create усередині транзакції зміни.
+"""
+
+from .models import OutboxEvent
+
+APPLICATION_CREATED = "application.created"
+APPLICATION_MOVED = "application.moved"
+APPLICATION_ARCHIVED = "application.archived"
+
+TOPICS = (APPLICATION_CREATED, APPLICATION_MOVED, APPLICATION_ARCHIVED)
+
+
+def application_event(
+    topic: str,
+    *,
+    application_id,
+    project_id,
+    candidate_id,
+    to_stage_id,
+    from_stage_id=None,
+    user=None,
+) -> OutboxEvent:
+    return OutboxEvent(
+        topic=topic,
+        project_id=project_id,
+        payload={
+            "application_id": application_id,
+            "project_id": project_id,
+            "candidate_id": candidate_id,
+            "from_stage_id": from_stage_id,
+            "to_stage_id": to_stage_id,
+            "changed_by_id": getattr(user, "id", None),
+        },
+    )
+
+
+def publish(events) -> None:
+    events = list(events)
+    if events:
+        OutboxEvent.objects.bulk_create(events)
@@ -0,0 +1,155 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from candidates.models import Candidate
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from pipeline.models import Application, Stage
+from projects.models import Project
+from rest_framework.test import APIClient
+from users.models import User
+
+from .delivery import deliver_pending
+from .models import OutboxEvent, WebhookSubscription
+
+
+class StubReceiver:
+    """
+    Локальний HTTP-підписник: запамʼятовує отримані пачки, відповідає self.status.
+    """
+
+    def __init__(self):
+        self.status = 200
+        self.requests = []
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append((dict(self.headers), json.loads(body)))
+                self.send_response(receiver.status)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class WebhookOutboxTests(TestCase):
+    """
+    Outbox пишеться разом зі зміною пайплайна і доставляється пачками з offset-ами.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        self.project = Project.objects.create(title="Backend", owner=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def outbox_inserts(self, ctx) -> int:
+        return sum(
+            q["sql"].startswith('INSERT INTO "integrations_outboxevent"')
+            for q in ctx.captured_queries
+        )
+
+    def test_write_paths_add_one_insert(self):
+        candidates = [
+            Candidate.objects.create(first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com")
+            for idx in range(3)
+        ]
+        screening = Stage.objects.get(project=self.project, system_key="screening")
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(
+                "/api/v1/applications/bulk-create/",
+                {"project_id": self.project.id, "candidate_ids": [c.id for c in candidates]},
+                format="json",
+            )
+        self.assertEqual(self.outbox_inserts(ctx), 1)
+
+        ids = list(Application.objects.values_list("id", flat=True))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(
+                "/api/v1/applications/bulk-move/",
+                {"application_ids": ids, "to_stage_id": screening.id},
+                format="json",
+            )
+        self.assertEqual(self.outbox_inserts(ctx), 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.delete(f"/api/v1/applications/{ids[0]}/")
+        self.assertEqual(self.outbox_inserts(ctx), 1)
+
+        topics = list(OutboxEvent.objects.values_list("topic", flat=True))
+        self.assertEqual(
+            topics,
+            ["application.created"] * 3 + ["application.moved"] * 3 + ["application.archived"],
+        )
+        moved = OutboxEvent.objects.filter(topic="application.moved").first().payload
+        self.assertEqual(moved["to_stage_id"], screening.id)
+        self.assertEqual(moved["changed_by_id"], self.admin.id)
+
+    def test_batched_delivery_with_retries(self):
+        with StubReceiver() as stub:
+            subscription = WebhookSubscription.objects.create(
+                name="hris", url=stub.url, secret="s3cret", topics=["application.created"]
+            )
+            quiet = WebhookSubscription.objects.create(
+                name="bi", url=stub.url, project_ids=[self.project.id + 1]
+            )
+            for idx in range(5):
+                candidate = Candidate.objects.create(
+                    first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com"
+                )
+                self.client.post(
+                    "/api/v1/applications/",
+                    {"project_id": self.project.id, "candidate_id": candidate.id},
+                    format="json",
+                )
+            last_id = OutboxEvent.objects.order_by("-id").values_list("id", flat=True)[0]
+
+            # підписник недоступний: offset стоїть, наступна спроба відкладена
+            stub.status = 503
+            stats = deliver_pending(batch_size=2, lag_seconds=0)
+            self.assertEqual(stats["failed"], 1)
+            subscription.refresh_from_db()
+            self.assertEqual(subscription.failures, 1)
+            self.assertGreater(subscription.next_attempt_at, timezone.now())
+            self.assertEqual(subscription.last_error, "HTTP 503")
+
+            stub.status = 200
+            WebhookSubscription.objects.filter(id=subscription.id).update(next_attempt_at=None)
+            stats = deliver_pending(batch_size=2, lag_seconds=0)
+            self.assertEqual((stats["delivered"], stats["batches"]), (5, 3))
+
+        subscription.refresh_from_db()
+        self.assertEqual((subscription.last_event_id, subscription.failures), (last_id, 0))
+
+        headers, body = stub.requests[-1]
+        self.assertEqual(body["subscription"], "hris")
+        self.assertEqual([e["topic"] for e in body["events"]], ["application.created"])
+        self.assertTrue(headers["X-Nexo-Signature"].startswith("sha256="))
+        # повтор першої пачки мав той самий delivery id
+        self.assertEqual(
+            stub.requests[0][0]["X-Nexo-Delivery"], stub.requests[1][0]["X-Nexo-Delivery"]
+        )
+
+        # підписник без адресованих йому подій усе одно рухає offset
+        quiet.refresh_from_db()
+        self.assertEqual(quiet.last_event_id, last_id)
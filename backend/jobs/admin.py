@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "kind",
+        "status",
+        "attempts",
+        "progress_done",
+        "progress_total",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "kind")
+    search_fields = ("kind", "error")
+    list_select_related = ("created_by",)
+    readonly_fields = ("locked_by", "lease_expires_at", "started_at", "finished_at")
@@ -0,0 +1,53 @@
+import multiprocessing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from jobs.worker import run_threads
+
+
+class Command(BaseCommand):
+    help = "Run background job workers (jobs table in the main database)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads", type=int, help="Worker threads per process (default: settings)"
+        )
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes")
+        parser.add_argument("--kinds", help="Comma-separated job kinds to take (default: all)")
+        parser.add_argument("--poll", type=float, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--burst", action="store_true", help="Exit when the queue is empty")
+
+    def handle(self, *args, **options):
+        threads = options["threads"] or settings.JOB_WORKER_THREADS
+        processes = options["processes"]
+        if threads < 1 or processes < 1:
+            raise CommandError("--threads and --processes must be positive")
+
+        worker_options = {
+            "kinds": [k.strip() for k in (options["kinds"] or "").split(",") if k.strip()],
+            "poll_seconds": options["poll"],
+            "burst": options["burst"],
+        }
+
+        if processes == 1:
+            processed = run_threads(threads, **worker_options)
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs"))
+            return
+
+        # fork: дочірні процеси успадковують налаштований Django, але не зʼєднання з БД
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=run_threads, args=(threads,), kwargs=worker_options)
+            for _ in range(processes)
+        ]
+        for process in workers:
+            process.start()
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.join()
+        self.stdout.write(self.style.SUCCESS(f"{processes} worker processes stopped"))
@@ -0,0 +1,87 @@
+from core.models import TimeStampedModel
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def job_files() -> FileSystemStorage:
+    """
+    Файли задач (вхідний CSV, результат експорту) — поза MEDIA_ROOT,
+    віддаються лише через /jobs/{id}/result/ з перевіркою доступу.
+    Callable, щоб шлях з settings не потрапляв у міграції.
+    """
+    return FileSystemStorage(location=settings.JOB_FILES_ROOT)
+
+
+class Job(TimeStampedModel):
+    """
+    Фонова задача в основній базі (jobs/queue.py, manage.py run_worker).
+
+    Воркер забирає задачу атомарним UPDATE (compare-and-set по статусу) і тримає
+    lease: якщо процес помер, після lease_expires_at задачу забере інший воркер.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Queued"
+        RUNNING = "RUNNING", "Running"
+        SUCCEEDED = "SUCCEEDED", "Succeeded"
+        FAILED = "FAILED", "Failed"
+        CANCELLED = "CANCELLED", "Cancelled"
+
+    kind = models.CharField(max_length=100)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    priority = models.SmallIntegerField(default=0)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    locked_by = models.CharField(max_length=200, blank=True, default="")
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(null=True, blank=True)
+    progress_message = models.CharField(max_length=255, blank=True, default="")
+
+    input_file = models.FileField(storage=job_files, upload_to="input/%Y/%m/", blank=True)
+    result = models.JSONField(null=True, blank=True)
+    result_file = models.FileField(storage=job_files, upload_to="result/%Y/%m/", blank=True)
+    error = models.TextField(blank=True, default="")
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # claim: черга за пріоритетом і часом
+            models.Index(
+                fields=["-priority", "run_after", "id"],
+                condition=Q(status="QUEUED"),
+                name="job_queue_idx",
+            ),
+            # повернення задач з протермінованим lease
+            models.Index(
+                fields=["lease_expires_at"],
+                condition=Q(status="RUNNING"),
+                name="job_lease_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.id}:{self.kind}:{self.status}"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED, self.Status.CANCELLED)
@@ -0,0 +1,208 @@
+"""
+Черга фонових задач у БД: постановка, атомарний claim з lease, виконання з
+прогресом, повтори з backoff-ом і скасування.
+
+Claim — SELECT кандидатів + UPDATE ... WHERE status/lease ще ті самі
+(compare-and-set), тож двоє воркерів не заберуть одну задачу і без
+SELECT ... FOR UPDATE SKIP LOCKED (SQLite). Усі подальші записи воркера
+фільтруються по locked_by: після втрати lease застарілий воркер нічого не перезапише.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class LeaseLost(Exception):
+    """
+    Lease протермінувався і задачу забрав інший воркер.
+    """
+
+
+def enqueue(kind: str, params=None, user=None, input_file=None, priority: int = 0) -> Job:
+    handler = get_handler(kind)
+    if handler is None:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    job = Job(
+        kind=kind,
+        params=params or {},
+        created_by=user,
+        priority=priority,
+        max_attempts=handler.max_attempts,
+    )
+    if input_file is not None:
+        job.input_file.save(input_file.name, input_file, save=False)
+    job.save()
+    return job
+
+
+def _claimable(now) -> Q:
+    return Q(status=Job.Status.QUEUED, run_after__lte=now) | Q(
+        status=Job.Status.RUNNING, lease_expires_at__lt=now
+    )
+
+
+def claim_job(worker_id: str, kinds=None, lease_seconds: int | None = None) -> Job | None:
+    lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+    now = timezone.now()
+
+    candidates = Job.objects.filter(_claimable(now))
+    if kinds:
+        candidates = candidates.filter(kind__in=kinds)
+    candidate_ids = candidates.order_by("-priority", "run_after", "id").values_list(
+        "id", flat=True
+    )[:10]
+
+    for job_id in candidate_ids:
+        claimed = Job.objects.filter(_claimable(now), id=job_id).update(
+            status=Job.Status.RUNNING,
+            locked_by=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=F("attempts") + 1,
+            started_at=now,
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+class JobContext:
+    """
+    Те, що бачить обробник: params, вхідний файл, прогрес і файл результату.
+    progress() заодно продовжує lease і перевіряє скасування.
+    """
+
+    PROGRESS_INTERVAL = 0.5
+
+    def __init__(self, job: Job, worker_id: str, lease_seconds: int):
+        self.job = job
+        self.params = job.params
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.result_file = None
+        self._reported_at = 0.0
+
+    def owned(self):
+        return Job.objects.filter(
+            id=self.job.id, status=Job.Status.RUNNING, locked_by=self.worker_id
+        )
+
+    def progress(self, done: int, total: int | None = None, message: str = "", force=False):
+        now = time.monotonic()
+        if not force and now - self._reported_at < self.PROGRESS_INTERVAL:
+            return
+        self._reported_at = now
+
+        fields = {
+            "progress_done": done,
+            "progress_message": message[:255],
+            "lease_expires_at": timezone.now() + timedelta(seconds=self.lease_seconds),
+        }
+        if total is not None:
+            fields["progress_total"] = total
+        if not self.owned().update(**fields):
+            self._raise_lost()
+
+    def save_result_file(self, name: str, content) -> None:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.result_file = (name, ContentFile(content))
+
+    def _raise_lost(self):
+        current = Job.objects.filter(id=self.job.id).values_list("status", flat=True).first()
+        if current == Job.Status.CANCELLED:
+            raise JobCancelled()
+        raise LeaseLost()
+
+
+def retry_delay(attempts: int) -> int:
+    return settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+
+
+def run_job(job: Job, worker_id: str, lease_seconds: int | None = None) -> str:
+    """
+    Виконує заявлену воркером задачу. Повертає підсумковий статус.
+    """
+    lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+    ctx = JobContext(job, worker_id, lease_seconds)
+    handler = get_handler(job.kind)
+
+    if handler is None:
+        error = f"Unknown job kind: {job.kind}"
+    elif job.attempts > job.max_attempts:
+        # воркер(и) помирали посеред задачі більше разів, ніж дозволено
+        error = "Lease expired too many times"
+    else:
+        try:
+            result = handler.func(ctx)
+        except JobCancelled:
+            return Job.Status.CANCELLED
+        except LeaseLost:
+            logger.warning("Job %s: lease lost by %s", job.id, worker_id)
+            return Job.Status.RUNNING
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            return _finish(ctx, result)
+
+    now = timezone.now()
+    if handler is not None and job.attempts < job.max_attempts:
+        status, fields = Job.Status.QUEUED, {
+            "run_after": now + timedelta(seconds=retry_delay(job.attempts))
+        }
+    else:
+        status, fields = Job.Status.FAILED, {"finished_at": now}
+    ctx.owned().update(
+        status=status, error=error[:5000], locked_by="", lease_expires_at=None, **fields
+    )
+    return status
+
+
+def _finish(ctx: JobContext, result) -> str:
+    job = ctx.job
+    if ctx.result_file is not None:
+        name, content = ctx.result_file
+        # файл пишемо до зміни статусу; якщо lease втрачено — він просто осиротіє
+        job.result_file.save(name, content, save=False)
+
+    done = ctx.owned().update(
+        status=Job.Status.SUCCEEDED,
+        result=result,
+        result_file=job.result_file.name or "",
+        error="",
+        locked_by="",
+        lease_expires_at=None,
+        finished_at=timezone.now(),
+    )
+    if not done:
+        # скасовано або lease забрав інший воркер — їхній стан не чіпаємо
+        return Job.objects.filter(id=job.id).values_list("status", flat=True).first()
+    return Job.Status.SUCCEEDED
+
+
+def cancel_job(job: Job) -> bool:
+    """
+    QUEUED скасовується одразу, RUNNING — коли обробник наступного разу
+    звітує прогрес. Завершені задачі не змінюються.
+    """
+    return bool(
+        Job.objects.filter(id=job.id, status__in=(Job.Status.QUEUED, Job.Status.RUNNING)).update(
+            status=Job.Status.CANCELLED, finished_at=timezone.now()
+        )
+    )
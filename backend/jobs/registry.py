@@ -0,0 +1,39 @@
+"""
+Реєстр обробників фонових задач.
+
+    @job_handler("projects.export")
+    def export_projects(ctx: JobContext) -> dict: ...
+
+Обробники живуть у <app>/tasks.py (підхоплюються в JobsConfig.ready).
+api=True — задачу можна поставити через POST /jobs/ (ADMIN/HR).
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    kind: str
+    func: Callable
+    max_attempts: int
+    api: bool
+
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str, max_attempts: int = 3, api: bool = False):
+    def register(func):
+        _handlers[kind] = JobHandler(kind, func, max_attempts, api)
+        return func
+
+    return register
+
+
+def get_handler(kind: str) -> JobHandler | None:
+    return _handlers.get(kind)
+
+
+def api_kinds() -> list[str]:
+    return sorted(kind for kind, handler in _handlers.items() if handler.api)
@@ -0,0 +1,43 @@
+from rest_framework import serializers
+
+from .models import Job
+from .registry import api_kinds
+
+
+class JobSerializer(serializers.ModelSerializer):
+    has_result_file = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "params",
+            "attempts",
+            "max_attempts",
+            "progress_done",
+            "progress_total",
+            "progress_message",
+            "result",
+            "has_result_file",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_has_result_file(self, obj) -> bool:
+        return bool(obj.result_file)
+
+
+class JobCreateSerializer(serializers.Serializer):
+    kind = serializers.CharField()
+    params = serializers.DictField(required=False, default=dict)
+    priority = serializers.IntegerField(required=False, default=0, min_value=-100, max_value=100)
+
+    def validate_kind(self, value):
+        if value not in api_kinds():
+            raise serializers.ValidationError(f"Unknown job kind. Available: {api_kinds()}")
+        return value
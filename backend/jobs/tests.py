@@ -0,0 +1,143 @@
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils import timezone
+from projects.models import Project
+from rest_framework.test import APIClient
+from users.models import User
+
+from .models import Job
+from .queue import JobCancelled, JobContext, LeaseLost, claim_job, enqueue, run_job
+from .registry import job_handler
+
+calls = []
+
+
+@job_handler("tests.flaky", max_attempts=2)
+def flaky_job(ctx):
+    calls.append(ctx.job.attempts)
+    raise RuntimeError("boom")
+
+
+class JobQueueTests(TestCase):
+    """
+    Задачі ставляться в запиті (202), виконуються воркером з lease, повторами і прогресом.
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        storage = FileSystemStorage(location=tmp.name)
+        for name in ("input_file", "result_file"):
+            patcher = mock.patch.object(Job._meta.get_field(name), "storage", storage)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(
+            email="rec@example.com", password="x", role=User.Role.RECRUITER
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def run_next(self, worker="w1"):
+        job = claim_job(worker)
+        self.assertIsNotNone(job)
+        return run_job(job, worker)
+
+    def test_import_and_export_run_off_request(self):
+        csv_file = SimpleUploadedFile(
+            "projects.csv",
+            b"title,status,deadline\nBackend,PENDING,2030-01-01\n,PENDING,\nFrontend,CLOSED,bad\n"
+            b"QA,,\n",
+            content_type="text/csv",
+        )
+        response = self.client.post("/api/v1/projects/import/", {"file": csv_file})
+        self.assertEqual(response.status_code, 202, response.content)
+        self.assertEqual(response.json()["status"], "QUEUED")
+        self.assertEqual(Project.objects.count(), 0)
+
+        self.assertEqual(self.run_next(), Job.Status.SUCCEEDED)
+        job = self.client.get(f"/api/v1/jobs/{response.json()['id']}/").json()
+        self.assertEqual(job["result"]["created"], 2)
+        self.assertEqual([e["row"] for e in job["result"]["errors"]], [3, 4])
+        self.assertEqual((job["progress_done"], job["progress_total"]), (4, 4))
+        self.assertEqual(
+            set(Project.objects.filter(owner=self.user).values_list("title", flat=True)),
+            {"Backend", "QA"},
+        )
+
+        response = self.client.get("/api/v1/projects/export/", {"status": "PENDING"})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["id"]
+        self.assertEqual(self.client.get(f"/api/v1/jobs/{job_id}/result/").status_code, 409)
+
+        self.assertEqual(self.run_next(), Job.Status.SUCCEEDED)
+        response = self.client.get(f"/api/v1/jobs/{job_id}/result/")
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[1].split(",")[1], "Backend")
+
+        # чужі задачі не видно
+        other = User.objects.create_user(email="o@example.com", password="x")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(f"/api/v1/jobs/{job_id}/").status_code, 404)
+
+    def test_lease_retries_and_cancel(self):
+        job = enqueue("tests.flaky", user=self.user)
+
+        claimed = claim_job("w1")
+        self.assertEqual((claimed.id, claimed.attempts), (job.id, 1))
+        self.assertIsNone(claim_job("w2"))
+
+        # w1 «помер»: після lease задачу забирає w2, а w1 її вже не оновить
+        Job.objects.filter(id=job.id).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        reclaimed = claim_job("w2")
+        self.assertEqual((reclaimed.locked_by, reclaimed.attempts), ("w2", 2))
+        with self.assertRaises(LeaseLost):
+            JobContext(claimed, "w1", 60).progress(1, force=True)
+
+        # остання спроба падає — FAILED з текстом помилки
+        calls.clear()
+        with self.assertLogs("jobs.queue", "ERROR"):
+            self.assertEqual(run_job(reclaimed, "w2"), Job.Status.FAILED)
+        job.refresh_from_db()
+        self.assertEqual((calls, job.error), ([2], "RuntimeError: boom"))
+
+        # невдала спроба з запасом — назад у чергу з backoff-ом
+        retry = enqueue("tests.flaky", user=self.user)
+        with self.assertLogs("jobs.queue", "ERROR"):
+            self.assertEqual(self.run_next(), Job.Status.QUEUED)
+        retry.refresh_from_db()
+        self.assertGreater(retry.run_after, timezone.now())
+        self.assertIsNone(claim_job("w1"))
+
+        # скасування: з черги — одразу, під час виконання — на наступному progress()
+        queued = enqueue("tests.flaky", user=self.user)
+        response = self.client.post(f"/api/v1/jobs/{queued.id}/cancel/")
+        self.assertEqual(response.json()["status"], "CANCELLED")
+        self.assertIsNone(claim_job("w1"))
+
+        enqueue("tests.flaky", user=self.user)
+        running = claim_job("w1")
+        self.client.post(f"/api/v1/jobs/{running.id}/cancel/")
+        with self.assertRaises(JobCancelled):
+            JobContext(running, "w1", 60).progress(1, force=True)
+
+    def test_only_admin_enqueues_maintenance_jobs(self):
+        payload = {"kind": "pipeline.renumber_positions", "params": {}}
+        self.assertEqual(self.client.post("/api/v1/jobs/", payload, format="json").status_code, 403)
+
+        admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.post("/api/v1/jobs/", payload, format="json")
+        self.assertEqual(response.status_code, 202, response.content)
+        response = self.client.post("/api/v1/jobs/", {"kind": "tests.flaky"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.run_next(), Job.Status.SUCCEEDED)
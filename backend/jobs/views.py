@@ -0,0 +1,81 @@
+from django.http import FileResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from users.permissions import IsAdminOrHRRole
+
+from .models import Job
+from .queue import cancel_job, enqueue
+from .serializers import JobCreateSerializer, JobSerializer
+
+
+def job_accepted(job: Job) -> Response:
+    """
+    202 для ендпоінтів, що ставлять роботу в чергу замість виконання в запиті.
+    """
+    return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Статус і результат фонових задач. Користувач бачить свої задачі, ADMIN/HR — усі.
+    POST /jobs/ — службові задачі (перерахунки), лише ADMIN/HR.
+    """
+
+    serializer_class = JobSerializer
+    filterset_fields = ["kind", "status"]
+    ordering_fields = ["created_at", "finished_at"]
+    ordering = ["-created_at"]
+    search_fields = ["kind"]
+
+    def get_queryset(self):
+        user = self.request.user
+        qs = Job.objects.all()
+        if user.is_superuser or getattr(user, "role", None) in ("ADMIN", "HR_MANAGER"):
+            return qs
+        return qs.filter(created_by=user)
+
+    def get_permissions(self):
+        if self.action == "create":
+            return [IsAdminOrHRRole()]
+        return [IsAuthenticated()]
+
+    def create(self, request):
+        serializer = JobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = enqueue(
+            serializer.validated_data["kind"],
+            params=serializer.validated_data["params"],
+            user=request.user,
+            priority=serializer.validated_data["priority"],
+        )
+        return job_accepted(job)
+
+    @action(detail=True, methods=["get"], url_path="result")
+    def result(self, request, pk=None):
+        job = self.get_object()
+        if job.status != Job.Status.SUCCEEDED:
+            return Response(
+                {"detail": "Job is not finished", "status": job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if not job.result_file:
+            return Response(job.result)
+
+        return FileResponse(
+            job.result_file.open("rb"),
+            as_attachment=True,
+            filename=job.result_file.name.rsplit("/", 1)[-1],
+        )
+
+    @action(detail=True, methods=["post"], url_path="cancel")
+    def cancel(self, request, pk=None):
+        job = self.get_object()
+        if not cancel_job(job):
+            return Response(
+                {"detail": "Job is already finished", "status": job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        job.refresh_from_db()
+        return Response(JobSerializer(job).data)
@@ -0,0 +1,70 @@
+"""
+Цикл воркера: claim → run → наступна задача; без задач — чекаємо poll-інтервал.
+manage.py run_worker запускає кілька таких циклів у потоках і/або процесах.
+"""
+
+import os
+import socket
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .queue import claim_job, run_job
+
+
+def worker_name(index: int = 0) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def work(
+    name: str,
+    stop: threading.Event,
+    kinds=None,
+    poll_seconds: float | None = None,
+    burst: bool = False,
+) -> int:
+    """
+    Обробляє задачі до stop (або до порожньої черги з burst). Повертає кількість задач.
+    """
+    poll_seconds = settings.JOB_POLL_SECONDS if poll_seconds is None else poll_seconds
+    processed = 0
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            job = claim_job(name, kinds)
+            if job is None:
+                if burst:
+                    break
+                stop.wait(poll_seconds)
+                continue
+            run_job(job, name)
+            processed += 1
+    finally:
+        # кожен потік має власне зʼєднання з БД
+        connection.close()
+    return processed
+
+
+def run_threads(threads: int, stop: threading.Event | None = None, **options) -> int:
+    """
+    threads циклів work() у поточному процесі; повертає загальну кількість задач.
+    """
+    stop = stop or threading.Event()
+    counts = [0] * threads
+
+    def target(index):
+        counts[index] = work(worker_name(index), stop, **options)
+
+    pool = [threading.Thread(target=target, args=(idx,), daemon=True) for idx in range(threads)]
+    for thread in pool:
+        thread.start()
+    try:
+        for thread in pool:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in pool:
+            thread.join()
+    return sum(counts)
@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from .models import Application, Stage, StageChangeEvent
+from .models import (
+    Application,
+    BoardSnapshot,
+    PipelineTemplate,
+    PipelineTemplateStage,
+    Stage,
+    StageChangeEvent,
+)
 
 
 @admin.register(Stage)
@@ -30,7 +37,29 @@ class ApplicationAdmin(admin.ModelAdmin):
 @admin.register(StageChangeEvent)
 class StageChangeEventAdmin(admin.ModelAdmin):
     list_display = ("id", "application", "from_stage", "to_stage", "changed_by", "changed_at")
+    list_select_related = ("application", "from_stage", "to_stage", "changed_by")
     autocomplete_fields = ("application", "from_stage", "to_stage", "changed_by")
 
 
+@admin.register(BoardSnapshot)
+class BoardSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("id", "project", "taken_at", "events_count", "created_at")
+    list_select_related = ("project",)
+    exclude = ("state",)
+
+
+class PipelineTemplateStageInline(admin.TabularInline):
+    model = PipelineTemplateStage
+    extra = 0
+    ordering = ("order", "id")
+
+
+@admin.register(PipelineTemplate)
+class PipelineTemplateAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "is_default", "created_by", "updated_at")
+    list_filter = ("is_default",)
+    search_fields = ("name",)
+    inlines = (PipelineTemplateStageInline,)
+
+
 # Register your models here.
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PipelineConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "pipeline"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,109 @@
+"""
+Retention для StageChangeEvent: події, старші за EVENT_RETENTION_MONTHS,
+переносяться в холодну архівну базу (ArchivedStageChangeEvent, alias "archive").
+
+Переносимо лише події, вже враховані в analytics rollup-ах (id <= high-water mark),
+тож агрегати не змінюються. Спершу запис в архів (source_id унікальний,
+ignore_conflicts), потім видалення з гарячої таблиці — повтор після збою безпечний.
+"""
+
+from calendar import monthrange
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import ArchivedStageChangeEvent, StageChangeEvent
+
+ARCHIVE_VALUES = (
+    "id",
+    "application_id",
+    "application__project_id",
+    "application__candidate_id",
+    "from_stage_id",
+    "from_stage__name",
+    "to_stage_id",
+    "to_stage__name",
+    "changed_by_id",
+    "changed_by__first_name",
+    "changed_by__last_name",
+    "changed_by__email",
+    "changed_at",
+)
+
+
+def display_name(first_name, last_name, email) -> str:
+    # те саме, що User.display_name, але з values()-рядка
+    return f"{first_name or ''} {last_name or ''}".strip() or (email or "")
+
+
+def months_before(moment, months: int):
+    year, month = divmod(moment.year * 12 + moment.month - 1 - months, 12)
+    day = min(moment.day, monthrange(year, month + 1)[1])
+    return moment.replace(year=year, month=month + 1, day=day)
+
+
+def archive_events(months: int | None = None, batch_size: int = 500, now=None) -> int:
+    """
+    Переносить старі події в архів пачками. Повертає кількість перенесених.
+    """
+    from analytics.rollups import rolled_up_event_id
+
+    if months is None:
+        months = settings.EVENT_RETENTION_MONTHS
+    cutoff = months_before(now or timezone.now(), months)
+
+    eligible = StageChangeEvent.objects.filter(
+        changed_at__lt=cutoff, id__lte=rolled_up_event_id()
+    ).order_by("id")
+
+    total = 0
+    while True:
+        batch = list(eligible.values(*ARCHIVE_VALUES)[:batch_size])
+        if not batch:
+            return total
+
+        ArchivedStageChangeEvent.objects.bulk_create(
+            [
+                ArchivedStageChangeEvent(
+                    source_id=row["id"],
+                    application_id=row["application_id"],
+                    project_id=row["application__project_id"],
+                    candidate_id=row["application__candidate_id"],
+                    from_stage_id=row["from_stage_id"],
+                    from_stage_name=row["from_stage__name"] or "",
+                    to_stage_id=row["to_stage_id"],
+                    to_stage_name=row["to_stage__name"] or "",
+                    changed_by_id=row["changed_by_id"],
+                    changed_by_name=display_name(
+                        row["changed_by__first_name"],
+                        row["changed_by__last_name"],
+                        row["changed_by__email"],
+                    ),
+                    changed_at=row["changed_at"],
+                )
+                for row in batch
+            ],
+            ignore_conflicts=True,
+        )
+
+        # діапазон id з тими ж умовами = рівно ця пачка (без тисяч параметрів у IN)
+        eligible.filter(id__gte=batch[0]["id"], id__lte=batch[-1]["id"]).delete()
+
+        total += len(batch)
+        if len(batch) < batch_size:
+            return total
+
+
+def last_archived_change(application_ids) -> dict:
+    """
+    application_id -> changed_at останньої архівної події.
+    """
+    if not application_ids:
+        return {}
+    return dict(
+        ArchivedStageChangeEvent.objects.filter(application_id__in=application_ids)
+        .values("application_id")
+        .annotate(last=Max("changed_at"))
+        .values_list("application_id", "last")
+    )
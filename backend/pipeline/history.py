@@ -0,0 +1,361 @@
+"""
+Історичний стан kanban-дошки з логу StageChangeEvent.
+
+Стадія заявки на момент T = to_stage останньої події з changed_at <= T.
+Архівація і повернення з архіву (ApplicationArchiveEvent) програються разом
+зі змінами стадій: архівні на момент T картки на дошці T не показуються.
+Щоб не переглядати всю історію проєкту, періодично зберігаємо BoardSnapshot
+(кожні BOARD_SNAPSHOT_EVERY_EVENTS подій) і програємо лише події після
+найближчого попереднього snapshot-а.
+
+Заявки без жодної події (напр. створені seed-скриптом напряму) в історії не видно.
+Події, перенесені в архів (pipeline/archive.py), читаються з архівної бази.
+"""
+
+import base64
+import heapq
+import json
+from datetime import UTC, datetime, timedelta
+
+from core.fastserial import DATETIME
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from projects.models import Project
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .archive import display_name
+from .models import (
+    Application,
+    ApplicationArchiveEvent,
+    ArchivedStageChangeEvent,
+    BoardSnapshot,
+    StageChangeEvent,
+)
+from .serializers import APPLICATION_CARD_VALUES, TimelineQuerySerializer, application_cards
+from .stages import project_stages
+
+
+def project_events(project, after=None, until=None):
+    """
+    Події проєкту в інтервалі (after, until] у порядку changed_at:
+    (application_id, to_stage_id, changed_at) змін стадій, гарячих і архівних, і
+    (application_id, None, changed_at, is_archived) архівацій заявок.
+    """
+    hot = StageChangeEvent.objects.filter(application__project=project)
+    archived = ArchivedStageChangeEvent.objects.filter(project_id=project.id)
+    archivals = ApplicationArchiveEvent.objects.filter(application__project=project)
+    if after is not None:
+        hot = hot.filter(changed_at__gt=after)
+        archived = archived.filter(changed_at__gt=after)
+        archivals = archivals.filter(changed_at__gt=after)
+    if until is not None:
+        hot = hot.filter(changed_at__lte=until)
+        archived = archived.filter(changed_at__lte=until)
+        archivals = archivals.filter(changed_at__lte=until)
+
+    fields = ("application_id", "to_stage_id", "changed_at")
+    # архівні події старші за гарячі з тим самим changed_at — merge стабільний;
+    # архівація з тим самим changed_at — після зміни стадії
+    return heapq.merge(
+        archived.order_by("changed_at", "source_id").values_list(*fields).iterator(),
+        hot.order_by("changed_at", "id").values_list(*fields).iterator(),
+        (
+            (application_id, None, changed_at, is_archived)
+            for application_id, changed_at, is_archived in archivals.order_by("changed_at", "id")
+            .values_list("application_id", "changed_at", "is_archived")
+            .iterator()
+        ),
+        key=lambda event: event[2],
+    )
+
+
+def apply_event(state: dict, application_id, stage_id, changed_at, is_archived=None) -> None:
+    key = str(application_id)
+    entry = state.get(key)
+    if stage_id is None:
+        # архівація: стадія і час входу в неї лишаються
+        if entry is not None:
+            state[key] = [entry[0], entry[1], True] if is_archived else entry[:2]
+        return
+
+    state[key] = [stage_id, changed_at.timestamp()]
+    if entry is not None and len(entry) > 2 and entry[2]:
+        state[key].append(True)
+
+
+def build_snapshots(project, every_events: int | None = None, lag_seconds: int | None = None):
+    """
+    Дописує snapshot-и від останнього наявного до now - lag. Повертає кількість нових.
+    Snapshot ставиться лише на межі між різними changed_at, щоб фільтр
+    changed_at > taken_at при replay не загубив події з тим самим часом.
+    """
+    every_events = every_events or settings.BOARD_SNAPSHOT_EVERY_EVENTS
+    if lag_seconds is None:
+        lag_seconds = settings.BOARD_SNAPSHOT_LAG_SECONDS
+    cutoff = timezone.now() - timedelta(seconds=lag_seconds)
+
+    last = BoardSnapshot.objects.filter(project=project).order_by("-taken_at").first()
+    state = dict(last.state) if last else {}
+
+    created = 0
+    pending = 0
+    previous_at = None
+    with transaction.atomic():
+        events = project_events(project, after=last.taken_at if last else None, until=cutoff)
+        for event in events:
+            changed_at = event[2]
+            if pending >= every_events and changed_at > previous_at:
+                BoardSnapshot.objects.create(
+                    project=project, taken_at=previous_at, events_count=pending, state=state
+                )
+                created += 1
+                pending = 0
+
+            apply_event(state, *event)
+            pending += 1
+            previous_at = changed_at
+
+    return created
+
+
+def board_state_at(project, at) -> tuple[dict, BoardSnapshot | None, int]:
+    """
+    (state, використаний snapshot, кількість програних подій) на момент at.
+    """
+    snapshot = (
+        BoardSnapshot.objects.filter(project=project, taken_at__lte=at)
+        .order_by("-taken_at")
+        .first()
+    )
+    state = dict(snapshot.state) if snapshot else {}
+
+    replayed = 0
+    for event in project_events(project, after=snapshot.taken_at if snapshot else None, until=at):
+        apply_event(state, *event)
+        replayed += 1
+
+    return state, snapshot, replayed
+
+
+def build_board_at(project, at) -> dict:
+    """
+    Payload у форматі kanban: current_stage_id у картках — стадія на момент at,
+    stage_entered_at — коли картка туди потрапила. Дані кандидата — поточні.
+    """
+    state, snapshot, replayed = board_state_at(project, at)
+
+    # архівні на момент at картки на дошці не показуємо
+    state = {key: entry for key, entry in state.items() if len(entry) < 3 or not entry[2]}
+
+    # одна вибірка по проєкту замість id__in з тисячами параметрів
+    rows = [
+        row
+        for row in Application.objects.filter(project=project)
+        .order_by()
+        .values(*APPLICATION_CARD_VALUES)
+        if str(row["id"]) in state
+    ]
+
+    columns: dict[int, list] = {}
+    for card in application_cards(rows):
+        stage_id, entered_at = state[str(card["id"])][:2]
+        card["current_stage_id"] = stage_id
+        card["stage_entered_at"] = DATETIME(datetime.fromtimestamp(entered_at, tz=UTC))
+        columns.setdefault(stage_id, []).append((entered_at, card["id"], card))
+
+    result_stages = []
+    for stage in project_stages(project.id):
+        items = [card for *_, card in sorted(columns.get(stage.id, []))]
+        if stage.created_at > at and not items:
+            continue
+        result_stages.append(
+            {
+                "id": stage.id,
+                "name": stage.name,
+                "system_key": stage.system_key,
+                "order": stage.order,
+                "is_final": stage.is_final,
+                "candidates_count": len(items),
+                "applications": items,
+            }
+        )
+
+    return {
+        "project_id": project.id,
+        "at": at,
+        "snapshot_at": snapshot.taken_at if snapshot else None,
+        "replayed_events": replayed,
+        "stages": result_stages,
+    }
+
+
+# --- timeline: історія переходів заявки / кандидата ---
+
+TIMELINE_VALUES = (
+    "id",
+    "application_id",
+    "application__project_id",
+    "application__project__title",
+    "from_stage_id",
+    "from_stage__name",
+    "to_stage_id",
+    "to_stage__name",
+    "changed_by_id",
+    "changed_by__first_name",
+    "changed_by__last_name",
+    "changed_by__email",
+    "changed_at",
+)
+
+
+def encode_cursor(changed_at, event_id) -> str:
+    raw = json.dumps([changed_at.isoformat(), event_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        changed_at, event_id = json.loads(raw)
+        return datetime.fromisoformat(changed_at), int(event_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValidationError({"cursor": "Invalid cursor"}) from None
+
+
+def _stage_ref(stage_id, name):
+    return {"id": stage_id, "name": name} if stage_id else None
+
+
+def _user_ref(user_id, name):
+    return {"id": user_id, "display_name": name} if user_id else None
+
+
+def _event_row(event_id, application_id, project, from_stage, to_stage, user, changed_at, archived):
+    return {
+        "id": event_id,
+        "application_id": application_id,
+        "project": project,
+        "from_stage": from_stage,
+        "to_stage": to_stage,
+        "changed_by": user,
+        "changed_at": changed_at,
+        "archived": archived,
+    }
+
+
+def _after(qs, id_field: str, position, descending: bool):
+    # keyset: (changed_at, id) строго після курсора в напрямку сортування
+    if position is None:
+        return qs
+    changed_at, event_id = position
+    op = "lt" if descending else "gt"
+    return qs.filter(
+        Q(**{f"changed_at__{op}": changed_at})
+        | Q(changed_at=changed_at, **{f"{id_field}__{op}": event_id})
+    )
+
+
+def timeline_page(hot, archived, cursor=None, page_size=50, descending=False):
+    """
+    Одна сторінка timeline з гарячих (StageChangeEvent) і архівних подій.
+    Keyset-пагінація по (changed_at, id): source_id архівної події — її старий id,
+    тож порядок спільний. Повертає (rows, next_cursor).
+    """
+    position = decode_cursor(cursor) if cursor else None
+    prefix = "-" if descending else ""
+
+    hot_rows = list(
+        _after(hot, "id", position, descending)
+        .order_by(f"{prefix}changed_at", f"{prefix}id")
+        .values(*TIMELINE_VALUES)[: page_size + 1]
+    )
+    archived_rows = list(
+        _after(archived, "source_id", position, descending).order_by(
+            f"{prefix}changed_at", f"{prefix}source_id"
+        )[: page_size + 1]
+    )
+
+    rows = [
+        (
+            row["changed_at"],
+            row["id"],
+            _event_row(
+                row["id"],
+                row["application_id"],
+                {"id": row["application__project_id"], "title": row["application__project__title"]},
+                _stage_ref(row["from_stage_id"], row["from_stage__name"]),
+                _stage_ref(row["to_stage_id"], row["to_stage__name"]),
+                _user_ref(
+                    row["changed_by_id"],
+                    display_name(
+                        row["changed_by__first_name"],
+                        row["changed_by__last_name"],
+                        row["changed_by__email"],
+                    ),
+                ),
+                DATETIME(row["changed_at"]),
+                False,
+            ),
+        )
+        for row in hot_rows
+    ]
+
+    # назви проєктів для архівних подій — одним запитом у основній базі
+    titles = dict(
+        Project.objects.filter(id__in={e.project_id for e in archived_rows}).values_list(
+            "id", "title"
+        )
+    )
+    rows += [
+        (
+            event.changed_at,
+            event.source_id,
+            _event_row(
+                event.source_id,
+                event.application_id,
+                {"id": event.project_id, "title": titles.get(event.project_id, "")},
+                _stage_ref(event.from_stage_id, event.from_stage_name),
+                _stage_ref(event.to_stage_id, event.to_stage_name),
+                _user_ref(event.changed_by_id, event.changed_by_name),
+                DATETIME(event.changed_at),
+                True,
+            ),
+        )
+        for event in archived_rows
+    ]
+
+    rows.sort(key=lambda item: (item[0], item[1]), reverse=descending)
+    page = rows[:page_size]
+
+    next_cursor = None
+    if len(rows) > page_size:
+        changed_at, event_id, _ = page[-1]
+        next_cursor = encode_cursor(changed_at, event_id)
+
+    return [row for *_, row in page], next_cursor
+
+
+def timeline_response(request, hot, archived, page_size: int = 50) -> Response:
+    """
+    {"next": <url або null>, "results": [...]} — як у DRF cursor-пагінації.
+    """
+    params = TimelineQuerySerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    query = params.validated_data
+
+    rows, next_cursor = timeline_page(
+        hot,
+        archived,
+        cursor=query.get("cursor") or None,
+        page_size=query.get("page_size") or page_size,
+        descending=query["ordering"] == "-changed_at",
+    )
+
+    next_url = None
+    if next_cursor:
+        next_url = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+    return Response({"next": next_url, "results": rows})
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from pipeline.archive import archive_events
+
+
+class Command(BaseCommand):
+    help = "Move old stage change events into the archive database (run from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months", type=int, help="Retention in months (default: EVENT_RETENTION_MONTHS)"
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        moved = archive_events(months=options["months"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} events"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from pipeline.models import Stage
+from pipeline.positions import renumber_stage
+
+
+class Command(BaseCommand):
+    help = "Renumber kanban columns to 1..n (fix gaps/duplicates) and reset position counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, help="Only stages of this project id")
+
+    def handle(self, *args, **options):
+        stages = Stage.objects.order_by("project_id", "order", "id")
+        if options["project"]:
+            stages = stages.filter(project_id=options["project"])
+            if not stages.exists():
+                raise CommandError("Project not found or has no stages")
+
+        changed = 0
+        for stage in stages.iterator():
+            changed += renumber_stage(stage)
+        self.stdout.write(self.style.SUCCESS(f"Renumbered {changed} cards"))
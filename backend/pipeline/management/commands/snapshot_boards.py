@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from pipeline.history import build_snapshots
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Write compact board snapshots for time-travel kanban (run from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, help="Only this project id")
+        parser.add_argument(
+            "--every", type=int, help="Events between snapshots (default: settings)"
+        )
+        parser.add_argument("--lag", type=int, help="Skip events newer than N seconds")
+
+    def handle(self, *args, **options):
+        projects = Project.objects.order_by("id")
+        if options["project"]:
+            projects = projects.filter(id=options["project"])
+            if not projects.exists():
+                raise CommandError("Project not found")
+
+        total = 0
+        for project in projects.iterator():
+            total += build_snapshots(
+                project, every_events=options["every"], lag_seconds=options["lag"]
+            )
+        self.stdout.write(self.style.SUCCESS(f"Created {total} snapshots"))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pipeline", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["project", "current_stage", "position_in_stage", "-updated_at"],
+                name="app_active_board_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(
+                condition=models.Q(("is_archived", False)),
+                fields=["candidate", "-updated_at"],
+                name="app_active_candidate_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="stagechangeevent",
+            index=models.Index(fields=["application", "changed_at"], name="sce_app_changed_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pipeline", "0002_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="application",
+            index=models.Index(fields=["updated_at"], name="app_updated_idx"),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pipeline", "0003_application_updated_index"),
+        ("projects", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BoardSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("taken_at", models.DateTimeField()),
+                ("events_count", models.PositiveIntegerField(default=0)),
+                ("state", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="board_snapshots",
+                        to="projects.project",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-taken_at"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "taken_at"), name="uniq_board_snapshot_per_time"
+                    )
+                ],
+            },
+        ),
+    ]
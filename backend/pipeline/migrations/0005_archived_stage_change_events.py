@@ -0,0 +1,50 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pipeline", "0004_board_snapshots"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedStageChangeEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("source_id", models.BigIntegerField(unique=True)),
+                ("application_id", models.BigIntegerField()),
+                ("project_id", models.BigIntegerField()),
+                ("candidate_id", models.BigIntegerField()),
+                ("from_stage_id", models.BigIntegerField(blank=True, null=True)),
+                ("from_stage_name", models.CharField(blank=True, default="", max_length=100)),
+                ("to_stage_id", models.BigIntegerField()),
+                ("to_stage_name", models.CharField(blank=True, default="", max_length=100)),
+                ("changed_by_id", models.BigIntegerField(blank=True, null=True)),
+                ("changed_by_name", models.CharField(blank=True, default="", max_length=300)),
+                ("changed_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-changed_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["application_id", "changed_at"], name="arch_app_changed_idx"
+                    ),
+                    models.Index(
+                        fields=["project_id", "changed_at"], name="arch_project_changed_idx"
+                    ),
+                    models.Index(
+                        fields=["candidate_id", "changed_at"], name="arch_cand_changed_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
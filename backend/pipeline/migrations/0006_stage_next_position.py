@@ -0,0 +1,35 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:23
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def init_next_position(apps, schema_editor):
+    # лічильник стартує з поточного максимуму колонки (включно з архівними картками)
+    Stage = apps.get_model("pipeline", "Stage")
+    Application = apps.get_model("pipeline", "Application")
+    top = (
+        Application.objects.filter(current_stage=OuterRef("pk"))
+        .order_by()
+        .values("current_stage")
+        .annotate(top=Max("position_in_stage"))
+        .values("top")
+    )
+    Stage.objects.update(next_position=Coalesce(Subquery(top), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pipeline", "0005_archived_stage_change_events"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stage",
+            name="next_position",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(init_next_position, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pipeline", "0006_stage_next_position"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stage",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
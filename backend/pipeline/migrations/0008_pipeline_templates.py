@@ -0,0 +1,98 @@
+# Generated by Django 5.2.10 on 2026-10-19 11:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from pipeline.defaults import DEFAULT_STAGES
+
+
+def create_default_template(apps, schema_editor):
+    # вбудований набір стадій стає редагованим default-шаблоном
+    PipelineTemplate = apps.get_model("pipeline", "PipelineTemplate")
+    PipelineTemplateStage = apps.get_model("pipeline", "PipelineTemplateStage")
+    template = PipelineTemplate.objects.create(name="Стандартний", is_default=True)
+    PipelineTemplateStage.objects.bulk_create(
+        PipelineTemplateStage(template=template, order=idx, **stage_def)
+        for idx, stage_def in enumerate(DEFAULT_STAGES, start=1)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pipeline", "0007_stage_version"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PipelineTemplate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("description", models.TextField(blank=True, default="")),
+                ("is_default", models.BooleanField(default=False)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="pipeline_templates",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="PipelineTemplateStage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                ("system_key", models.CharField(max_length=50)),
+                ("order", models.PositiveSmallIntegerField(default=0)),
+                ("is_final", models.BooleanField(default=False)),
+                (
+                    "template",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stages",
+                        to="pipeline.pipelinetemplate",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["order", "id"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="pipelinetemplate",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_default", True)),
+                fields=("is_default",),
+                name="uniq_default_pipeline_template",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="pipelinetemplatestage",
+            constraint=models.UniqueConstraint(
+                fields=("template", "system_key"), name="uniq_template_stage_system_key"
+            ),
+        ),
+        migrations.RunPython(create_default_template, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.10 on 2026-10-19 12:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_archived(apps, schema_editor):
+    # уже архівні заявки: момент архівації невідомий — беремо updated_at
+    Application = apps.get_model("pipeline", "Application")
+    ApplicationArchiveEvent = apps.get_model("pipeline", "ApplicationArchiveEvent")
+    BoardSnapshot = apps.get_model("pipeline", "BoardSnapshot")
+
+    ApplicationArchiveEvent.objects.bulk_create(
+        ApplicationArchiveEvent(application_id=app_id, is_archived=True)
+        for app_id in Application.objects.filter(is_archived=True).values_list("id", flat=True)
+    )
+    ApplicationArchiveEvent.objects.update(
+        changed_at=Subquery(
+            Application.objects.filter(id=OuterRef("application_id")).values("updated_at")
+        )
+    )
+    # snapshot-и — похідні дані без архівних позначок; snapshot_boards збудує їх наново
+    BoardSnapshot.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("pipeline", "0008_pipeline_templates"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApplicationArchiveEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("is_archived", models.BooleanField()),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "application",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archive_changes",
+                        to="pipeline.application",
+                    ),
+                ),
+                (
+                    "changed_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-changed_at"],
+                "indexes": [
+                    models.Index(fields=["application", "changed_at"], name="aae_app_changed_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_archived, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from core.models import TimeStampedModel
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
 
 
 class Stage(TimeStampedModel):
@@ -12,6 +13,11 @@ class Stage(TimeStampedModel):
 
     is_final = models.BooleanField(default=False)
 
+    # остання видана position_in_stage (pipeline/positions.py)
+    next_position = models.PositiveIntegerField(default=0)
+    # версія складу/порядку колонки для optimistic concurrency (If-Match на reorder/move)
+    version = models.PositiveIntegerField(default=0)
+
     class Meta:
         ordering = ["order", "id"]
         constraints = [
@@ -24,6 +30,61 @@ class Stage(TimeStampedModel):
         return f"{self.project_id}:{self.order}:{self.name}"
 
 
+class PipelineTemplate(TimeStampedModel):
+    """
+    Шаблон пайплайна: набір стадій, який копіюється в проєкти
+    (default-шаблон — при створенні проєкту, інші — через apply).
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    description = models.TextField(blank=True, default="")
+    is_default = models.BooleanField(default=False)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="pipeline_templates",
+    )
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["is_default"],
+                condition=Q(is_default=True),
+                name="uniq_default_pipeline_template",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class PipelineTemplateStage(models.Model):
+    template = models.ForeignKey(
+        "pipeline.PipelineTemplate", on_delete=models.CASCADE, related_name="stages"
+    )
+
+    name = models.CharField(max_length=100)
+    system_key = models.CharField(max_length=50)
+    order = models.PositiveSmallIntegerField(default=0)
+
+    is_final = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["order", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["template", "system_key"], name="uniq_template_stage_system_key"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.template_id}:{self.order}:{self.name}"
+
+
 class Application(TimeStampedModel):
     project = models.ForeignKey(
         "projects.Project", on_delete=models.CASCADE, related_name="applications"
@@ -48,6 +109,22 @@ class Application(TimeStampedModel):
                 fields=["project", "candidate"], name="uniq_candidate_per_project"
             ),
         ]
+        indexes = [
+            # kanban: filter(project[, current_stage]) + order_by(position_in_stage, -updated_at)
+            models.Index(
+                fields=["project", "current_stage", "position_in_stage", "-updated_at"],
+                condition=Q(is_archived=False),
+                name="app_active_board_idx",
+            ),
+            # статус кандидата: остання активна заявка (subquery у CandidateViewSet)
+            models.Index(
+                fields=["candidate", "-updated_at"],
+                condition=Q(is_archived=False),
+                name="app_active_candidate_idx",
+            ),
+            # ETag-валідатори списків: max(updated_at) + count по індексу
+            models.Index(fields=["updated_at"], name="app_updated_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Application(project={self.project_id}, candidate={self.candidate_id})"
@@ -70,9 +147,104 @@ class StageChangeEvent(models.Model):
 
     class Meta:
         ordering = ["-changed_at"]
+        indexes = [
+            models.Index(fields=["application", "changed_at"], name="sce_app_changed_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.application_id}:{self.from_stage_id}->{self.to_stage_id}"
 
 
+class ApplicationArchiveEvent(models.Model):
+    """
+    Архівація заявки або повернення з архіву. Разом зі StageChangeEvent
+    відтворює історичні дошки (pipeline/history.py): архівні на момент T
+    картки на дошці T не показуються.
+    """
+
+    application = models.ForeignKey(
+        "pipeline.Application", on_delete=models.CASCADE, related_name="archive_changes"
+    )
+    is_archived = models.BooleanField()
+
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-changed_at"]
+        indexes = [
+            models.Index(fields=["application", "changed_at"], name="aae_app_changed_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.application_id}:archived={self.is_archived}"
+
+
+class ArchivedStageChangeEvent(models.Model):
+    """
+    StageChangeEvent, перенесений у холодну архівну базу (core.routers.ArchiveRouter).
+    FK неможливі між базами, тому id денормалізовані, а назви стадій і автора
+    збережені на момент архівації.
+    """
+
+    source_id = models.BigIntegerField(unique=True)
+
+    application_id = models.BigIntegerField()
+    project_id = models.BigIntegerField()
+    candidate_id = models.BigIntegerField()
+
+    from_stage_id = models.BigIntegerField(null=True, blank=True)
+    from_stage_name = models.CharField(max_length=100, blank=True, default="")
+    to_stage_id = models.BigIntegerField()
+    to_stage_name = models.CharField(max_length=100, blank=True, default="")
+
+    changed_by_id = models.BigIntegerField(null=True, blank=True)
+    changed_by_name = models.CharField(max_length=300, blank=True, default="")
+    changed_at = models.DateTimeField()
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-changed_at"]
+        indexes = [
+            models.Index(fields=["application_id", "changed_at"], name="arch_app_changed_idx"),
+            models.Index(fields=["project_id", "changed_at"], name="arch_project_changed_idx"),
+            models.Index(fields=["candidate_id", "changed_at"], name="arch_cand_changed_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"archived:{self.application_id}:{self.from_stage_id}->{self.to_stage_id}"
+
+
+class BoardSnapshot(models.Model):
+    """
+    Компактний стан дошки проєкту на момент taken_at:
+    {"<application_id>": [stage_id, entered_at_timestamp]}; у архівних на той
+    момент заявок третій елемент true.
+    Дошка на довільний момент = найближчий попередній snapshot + replay подій після нього.
+    """
+
+    project = models.ForeignKey(
+        "projects.Project", on_delete=models.CASCADE, related_name="board_snapshots"
+    )
+    taken_at = models.DateTimeField()
+    # скільки подій враховано від попереднього snapshot-а
+    events_count = models.PositiveIntegerField(default=0)
+    state = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-taken_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "taken_at"], name="uniq_board_snapshot_per_time"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"BoardSnapshot(project={self.project_id}, taken_at={self.taken_at})"
+
+
 # Create your models here.
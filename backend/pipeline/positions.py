@@ -0,0 +1,172 @@
+"""
+Позиції карток у колонці без Max(position_in_stage) на write path
+і версії колонок для optimistic concurrency.
+
+Stage.next_position — лічильник останньої виданої позиції. Резервування —
+атомарний UPDATE ... SET next_position = next_position + n у транзакції
+запису, тож паралельні запити не отримують однакових позицій
+(SQLite серіалізує записувачів, PostgreSQL блокує рядок стадії до commit).
+
+Stage.version зростає з кожною зміною складу чи порядку колонки. Клієнт
+передає версії, які бачив, у If-Match ("stage-<id>-v<version>"); перевірка —
+compare-and-set UPDATE ... WHERE version = <очікувана>, без довгих блокувань.
+"""
+
+import re
+
+from core.cache import invalidate
+from django.db import transaction
+from django.db.models import F, Max
+from django.db.models.functions import Greatest
+
+from .models import Application, Stage
+
+STAGE_TAG_RE = re.compile(r'"stage-(\d+)-v(\d+)"')
+
+
+class StageConflict(Exception):
+    """
+    Колонки змінилися після того, як клієнт їх прочитав (версія не збіглась).
+    """
+
+    def __init__(self, stage_ids):
+        super().__init__(f"Stage versions changed: {sorted(stage_ids)}")
+        self.stage_ids = list(stage_ids)
+
+
+class StageGone(Exception):
+    """
+    Стадію видалили після того, як її резолвнули (кеш стадій відстав від БД).
+    """
+
+    def __init__(self, stage_id):
+        super().__init__(f"Stage {stage_id} no longer exists")
+        self.stage_id = stage_id
+
+
+def stage_tag(stage_id, version) -> str:
+    return f'"stage-{stage_id}-v{version}"'
+
+
+def expected_versions(request) -> dict[int, int]:
+    """
+    {stage_id: version} з If-Match; без заголовка — порожньо (last writer wins).
+    """
+    header = request.headers.get("If-Match") or ""
+    return {int(sid): int(version) for sid, version in STAGE_TAG_RE.findall(header)}
+
+
+def bump_versions(stage_ids, expected: dict | None = None) -> None:
+    """
+    Інкрементує версії колонок. Для стадій з expected — лише якщо версія збігається,
+    інакше StageConflict (викликати в transaction.atomic, щоб відкотити запис).
+    """
+    expected = expected or {}
+    conflicts = []
+    for stage_id in sorted({sid for sid in stage_ids if sid}):
+        qs = Stage.objects.filter(id=stage_id)
+        if stage_id in expected:
+            qs = qs.filter(version=expected[stage_id])
+        if not qs.update(version=F("version") + 1) and stage_id in expected:
+            conflicts.append(stage_id)
+    if conflicts:
+        raise StageConflict(conflicts)
+
+
+def current_versions(stage_ids) -> dict[int, int]:
+    return dict(Stage.objects.filter(id__in=stage_ids).values_list("id", "version"))
+
+
+def conflict_payload(stage_ids, **extra) -> dict:
+    """
+    Тіло 409: актуальні версії колонок + те, що потрібно клієнту для rebase.
+    """
+    versions = current_versions(stage_ids)
+    return {
+        "detail": "Stage was modified by another request",
+        "stages": [
+            {"id": sid, "version": version, "etag": stage_tag(sid, version)}
+            for sid, version in sorted(versions.items())
+        ],
+        **extra,
+    }
+
+
+def apply_moves(order: list[int], moves) -> tuple[list[int], list[int]]:
+    """
+    Застосовує delta-переміщення [{"application_id", "after_id"|None}] до порядку колонки.
+    after_id=None — на початок. Повертає (новий порядок, id некоректних переміщень).
+    """
+    order = list(order)
+    present = set(order)
+    invalid = []
+    for move in moves:
+        app_id, after_id = move["application_id"], move.get("after_id")
+        if app_id not in present or (
+            after_id is not None and (after_id not in present or after_id == app_id)
+        ):
+            invalid.append(app_id)
+            continue
+        order.remove(app_id)
+        order.insert(order.index(after_id) + 1 if after_id is not None else 0, app_id)
+    return order, invalid
+
+
+def allocate_positions(stage_id, count: int = 1) -> int:
+    """
+    Резервує count позицій у кінці колонки. Повертає першу з них.
+    UPDATE заодно перевіряє, що стадія ще існує, і блокує її до commit-у
+    транзакції запису — інакше StageGone.
+    """
+    with transaction.atomic():
+        if not Stage.objects.filter(id=stage_id).update(next_position=F("next_position") + count):
+            raise StageGone(stage_id)
+        last = Stage.objects.filter(id=stage_id).values_list("next_position", flat=True).get()
+    return last - count + 1
+
+
+def ensure_positions_reserved(stage_id, position: int) -> None:
+    """
+    Після ручної перенумерації (kanban reorder) лічильник має бути не менший за position.
+    """
+    Stage.objects.filter(id=stage_id, next_position__lt=position).update(
+        next_position=Greatest(F("next_position"), position)
+    )
+
+
+def renumber_stage(stage) -> int:
+    """
+    Перенумеровує активні картки колонки в 1..n у поточному порядку kanban
+    і виставляє лічильник. Повертає кількість змінених карток.
+    """
+    with transaction.atomic():
+        # блокуємо лічильник, щоб паралельні create/move чекали на перенумерацію
+        Stage.objects.filter(id=stage.id).update(next_position=F("next_position"))
+
+        apps = list(
+            Application.objects.filter(
+                project_id=stage.project_id, current_stage=stage, is_archived=False
+            )
+            .order_by("position_in_stage", "-updated_at", "id")
+            .only("id", "position_in_stage")
+        )
+        changed = []
+        for idx, app in enumerate(apps, start=1):
+            if app.position_in_stage != idx:
+                app.position_in_stage = idx
+                changed.append(app)
+        if changed:
+            Application.objects.bulk_update(changed, ["position_in_stage"], batch_size=500)
+            # bulk_update без сигналів — kanban/page проєкту інвалідовуємо явно
+            invalidate("project", stage.project_id)
+
+        # архівні картки теж можуть повернутися в колонку — лічильник не нижче їхніх позицій
+        archived_max = (
+            Application.objects.filter(current_stage=stage, is_archived=True).aggregate(
+                top=Max("position_in_stage")
+            )["top"]
+            or 0
+        )
+        Stage.objects.filter(id=stage.id).update(next_position=max(len(apps), archived_max))
+
+    return len(changed)
@@ -1,8 +1,13 @@
 from candidates.models import Candidate
+from candidates.serializers import skills_by_candidate
+from core.fastserial import DATETIME, compile_row
+from core.timing import timing_phase
+from django.db import transaction
 from projects.models import Project
 from rest_framework import serializers
 
-from .models import Application, Stage
+from .models import Application, PipelineTemplate, PipelineTemplateStage
+from .stages import resolve_stage
 
 
 class CandidateCardSerializer(serializers.ModelSerializer):
@@ -43,6 +48,88 @@ class ApplicationCardSerializer(serializers.ModelSerializer):
         ]
 
 
+# --- fast path: values()-рядки замість ApplicationCardSerializer ---
+
+APPLICATION_CARD_VALUES = (
+    "id",
+    "project_id",
+    "candidate_id",
+    "current_stage_id",
+    "position_in_stage",
+    "created_at",
+    "updated_at",
+    "is_archived",
+    "candidate__first_name",
+    "candidate__last_name",
+    "candidate__email",
+    "candidate__phone",
+    "candidate__city",
+    "candidate__experience_years",
+    "candidate__rating",
+)
+
+_candidate_card = compile_row(
+    [
+        ("id", "candidate_id", None),
+        (
+            "full_name",
+            lambda r: f"{r['candidate__first_name']} {r['candidate__last_name']}".strip(),
+            None,
+        ),
+        ("email", "candidate__email", None),
+        ("phone", "candidate__phone", None),
+        ("city", "candidate__city", None),
+        ("experience_years", "candidate__experience_years", None),
+        ("rating", "candidate__rating", None),
+        ("skills", "skills", None),
+    ]
+)
+
+_application_card = compile_row(
+    [
+        ("id", "id", None),
+        ("project_id", "project_id", None),
+        ("candidate", _candidate_card, None),
+        ("current_stage_id", "current_stage_id", None),
+        ("position_in_stage", "position_in_stage", None),
+        ("created_at", "created_at", DATETIME),
+        ("updated_at", "updated_at", DATETIME),
+        ("is_archived", "is_archived", None),
+    ]
+)
+
+
+def application_cards(rows) -> list[dict]:
+    """
+    rows — результат queryset.values(*APPLICATION_CARD_VALUES).
+    Вихід ідентичний ApplicationCardSerializer(many=True).data.
+    """
+    with timing_phase("queryset"):
+        rows = list(rows)
+    skills = skills_by_candidate({r["candidate_id"] for r in rows})
+    result = []
+    for row in rows:
+        row["skills"] = skills.get(row["candidate_id"], [])
+        result.append(_application_card(row))
+    return result
+
+
+def validated_stage(project_id, stage_id=None, stage_system_key=""):
+    """
+    Стадія для нової заявки: за stage_id / stage_system_key, інакше "new" або перша.
+    Стадії — з in-process кешу (pipeline/stages.py), без запиту; що стадія ще
+    існує, перевіряє allocate_positions у транзакції запису (StageGone).
+    """
+    stage = resolve_stage(project_id, stage_id, stage_system_key)
+    if not stage and stage_id:
+        raise serializers.ValidationError({"stage_id": "Stage not found in this project"})
+    if not stage and stage_system_key:
+        raise serializers.ValidationError({"stage_system_key": "Stage not found in this project"})
+    if not stage:
+        raise serializers.ValidationError({"stage": "Project has no stages configured"})
+    return stage
+
+
 class ApplicationCreateSerializer(serializers.Serializer):
     project_id = serializers.IntegerField()
     candidate_id = serializers.IntegerField()
@@ -63,29 +150,49 @@ class ApplicationCreateSerializer(serializers.Serializer):
         if not candidate:
             raise serializers.ValidationError({"candidate_id": "Candidate not found"})
 
-        stage = None
-        if stage_id:
-            stage = Stage.objects.filter(id=stage_id, project=project).first()
-            if not stage:
-                raise serializers.ValidationError({"stage_id": "Stage not found in this project"})
-        elif stage_system_key:
-            stage = Stage.objects.filter(project=project, system_key=stage_system_key).first()
-            if not stage:
-                raise serializers.ValidationError(
-                    {"stage_system_key": "Stage not found in this project"}
-                )
-        else:
-            # default: "new" або перша за order
-            stage = (
-                Stage.objects.filter(project=project, system_key="new").first()
-                or Stage.objects.filter(project=project).order_by("order", "id").first()
+        stage = validated_stage(project.id, stage_id, stage_system_key)
+
+        attrs["project"] = project
+        attrs["candidate"] = candidate
+        attrs["stage"] = stage
+        return attrs
+
+
+class ApplicationBulkCreateSerializer(serializers.Serializer):
+    """
+    Масове додавання кандидатів у пайплайн: або candidate_ids, або candidate_filter
+    (параметри CandidateFilter, як у GET /candidates/).
+    """
+
+    MAX_CANDIDATES = 1000
+
+    project_id = serializers.IntegerField()
+    candidate_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_CANDIDATES,
+    )
+    candidate_filter = serializers.DictField(required=False)
+    stage_id = serializers.IntegerField(required=False)
+    stage_system_key = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        if ("candidate_ids" in attrs) == ("candidate_filter" in attrs):
+            raise serializers.ValidationError(
+                {"candidate_ids": "Provide either candidate_ids or candidate_filter"}
             )
 
-        if not stage:
-            raise serializers.ValidationError({"stage": "Project has no stages configured"})
+        project = Project.objects.filter(id=attrs["project_id"]).first()
+        if not project:
+            raise serializers.ValidationError({"project_id": "Project not found"})
+
+        stage_id = attrs.get("stage_id")
+        stage_system_key = (attrs.get("stage_system_key") or "").strip()
+
+        stage = validated_stage(project.id, stage_id, stage_system_key)
 
         attrs["project"] = project
-        attrs["candidate"] = candidate
         attrs["stage"] = stage
         return attrs
 
@@ -94,9 +201,131 @@ class ApplicationMoveSerializer(serializers.Serializer):
     to_stage_id = serializers.IntegerField()
 
 
+class ApplicationBulkMoveSerializer(serializers.Serializer):
+    application_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=1000,
+    )
+    to_stage_id = serializers.IntegerField()
+
+
+class BoardAtQuerySerializer(serializers.Serializer):
+    at = serializers.DateTimeField()
+
+
+class TimelineQuerySerializer(serializers.Serializer):
+    MAX_PAGE_SIZE = 200
+
+    cursor = serializers.CharField(required=False, allow_blank=True)
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=MAX_PAGE_SIZE)
+    ordering = serializers.ChoiceField(
+        choices=["changed_at", "-changed_at"], required=False, default="changed_at"
+    )
+
+
+class KanbanMoveSerializer(serializers.Serializer):
+    application_id = serializers.IntegerField()
+    # None — на початок колонки
+    after_id = serializers.IntegerField(allow_null=True, required=False, default=None)
+
+
 class KanbanReorderSerializer(serializers.Serializer):
+    """
+    Або повний порядок колонки (ordered_application_ids), або delta (moves).
+    """
+
     stage_id = serializers.IntegerField()
     ordered_application_ids = serializers.ListField(
         child=serializers.IntegerField(),
         allow_empty=True,
+        required=False,
+    )
+    moves = KanbanMoveSerializer(many=True, required=False)
+
+    def validate(self, attrs):
+        if ("ordered_application_ids" in attrs) == ("moves" in attrs):
+            raise serializers.ValidationError(
+                {"ordered_application_ids": "Provide either ordered_application_ids or moves"}
+            )
+        return attrs
+
+
+class PipelineTemplateStageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PipelineTemplateStage
+        fields = ["id", "name", "system_key", "order", "is_final"]
+        read_only_fields = ["id", "order"]
+
+
+class PipelineTemplateSerializer(serializers.ModelSerializer):
+    """
+    Шаблон разом зі стадіями: порядок стадій = порядок у списку stages,
+    при оновленні список stages замінює попередній повністю.
+    """
+
+    stages = PipelineTemplateStageSerializer(many=True)
+
+    class Meta:
+        model = PipelineTemplate
+        fields = ["id", "name", "description", "is_default", "stages", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_at", "updated_at"]
+        # попередній default знімається в create/update, а не відхиляється
+        extra_kwargs = {"is_default": {"validators": []}}
+
+    def validate_stages(self, value):
+        if not value:
+            raise serializers.ValidationError("Template must have at least one stage.")
+        keys = [stage["system_key"] for stage in value]
+        if len(set(keys)) != len(keys):
+            raise serializers.ValidationError("system_key must be unique within a template.")
+        return value
+
+    @staticmethod
+    def _write_stages(template, stages) -> None:
+        template.stages.all().delete()
+        PipelineTemplateStage.objects.bulk_create(
+            PipelineTemplateStage(template=template, order=idx, **stage)
+            for idx, stage in enumerate(stages, start=1)
+        )
+
+    @transaction.atomic
+    def create(self, validated_data):
+        stages = validated_data.pop("stages")
+        # default-шаблон лише один (uniq_default_pipeline_template)
+        if validated_data.get("is_default"):
+            PipelineTemplate.objects.filter(is_default=True).update(is_default=False)
+
+        template = PipelineTemplate.objects.create(**validated_data)
+        self._write_stages(template, stages)
+        return template
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        stages = validated_data.pop("stages", None)
+        if validated_data.get("is_default"):
+            PipelineTemplate.objects.filter(is_default=True).exclude(id=instance.id).update(
+                is_default=False
+            )
+
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save()
+
+        if stages is not None:
+            self._write_stages(instance, stages)
+        return instance
+
+
+class PipelineTemplateReorderSerializer(serializers.Serializer):
+    ordered_stage_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class PipelineTemplateApplySerializer(serializers.Serializer):
+    MAX_PROJECTS = 500
+
+    project_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=MAX_PROJECTS
     )
+    # видаляти стадії поза шаблоном (лише порожні й без історії переходів)
+    remove_missing = serializers.BooleanField(default=False)
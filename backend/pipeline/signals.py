@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Application, ArchivedStageChangeEvent
+
+
+@receiver(post_delete, sender=Application)
+def purge_archived_events(sender, instance, **kwargs):
+    # архів в іншій базі — каскадне видалення FK сюди не дістає
+    ArchivedStageChangeEvent.objects.filter(application_id=instance.id).delete()
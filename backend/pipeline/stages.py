@@ -0,0 +1,71 @@
+"""
+In-process кеш стадій проєкту (id, назва, system_key, порядок, is_final).
+
+Гарячі шляхи (створення і переміщення заявок, reorder, summary) резолвлять
+стадії без вибірки стадій з БД. Актуальність — через generation "stages" з
+core/cache.py (один запит по індексу, спільний для всіх процесів): сигнали Stage
+і масові зміни (pipeline/templates.py) його інвалідовують.
+
+version і next_position змінюються через queryset.update() без сигналів,
+тому в кеш не потрапляють — їх читаємо з БД (pipeline/positions.py).
+"""
+
+import threading
+
+from core.cache import get_generation
+from django.conf import settings
+
+from .models import Stage
+
+CACHED_FIELDS = tuple(
+    field.attname
+    for field in Stage._meta.concrete_fields
+    if field.attname not in ("next_position", "version")
+)
+
+_lock = threading.Lock()
+# project_id -> (generation, db alias, рядки стадій у порядку order, id)
+_entries: dict[int, tuple] = {}
+
+
+def _load(project_id) -> tuple[str, tuple]:
+    qs = Stage.objects.filter(project_id=project_id).order_by("order", "id")
+    return qs.db, tuple(qs.values_list(*CACHED_FIELDS))
+
+
+def project_stages(project_id) -> list[Stage]:
+    """
+    Стадії проєкту в порядку колонок. Кожен виклик повертає нові інстанси:
+    спільний кеш не змінити випадково, а version/next_position лишаються
+    deferred, тож save() на такому обʼєкті їх не перезапише.
+    """
+    generation = get_generation("stages", project_id)
+    entry = _entries.get(project_id)
+    if entry is None or entry[0] != generation:
+        db, rows = _load(project_id)
+        with _lock:
+            if len(_entries) >= settings.STAGE_CACHE_MAX_PROJECTS:
+                _entries.clear()
+            # generation прочитаний до запиту: інвалідація між ними не загубиться
+            _entries[project_id] = (generation, db, rows)
+    else:
+        _, db, rows = entry
+
+    return [Stage.from_db(db, CACHED_FIELDS, row) for row in rows]
+
+
+def resolve_stage(project_id, stage_id=None, system_key=None) -> Stage | None:
+    """
+    Стадія проєкту за id або system_key; без обох — "new" або перша за order.
+    """
+    stages = project_stages(project_id)
+    if stage_id:
+        return next((s for s in stages if s.id == stage_id), None)
+    if system_key:
+        return next((s for s in stages if s.system_key == system_key), None)
+    return next((s for s in stages if s.system_key == "new"), None) or next(iter(stages), None)
+
+
+def clear_stage_cache() -> None:
+    with _lock:
+        _entries.clear()
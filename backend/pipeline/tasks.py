@@ -0,0 +1,44 @@
+"""
+Фонові задачі пайплайна (jobs/registry.py): перерахунки, що не влазять у запит.
+"""
+
+from jobs.registry import job_handler
+from projects.models import Project
+
+from .history import build_snapshots
+from .models import Stage
+from .positions import renumber_stage
+
+
+@job_handler("pipeline.renumber_positions", api=True)
+def renumber_positions_job(ctx) -> dict:
+    """
+    params: {"project_id"?: <id>}
+    """
+    stages = Stage.objects.order_by("project_id", "order", "id")
+    if ctx.params.get("project_id"):
+        stages = stages.filter(project_id=ctx.params["project_id"])
+
+    total = stages.count()
+    changed = 0
+    for idx, stage in enumerate(stages.iterator(), start=1):
+        changed += renumber_stage(stage)
+        ctx.progress(idx, total)
+    return {"stages": total, "renumbered": changed}
+
+
+@job_handler("pipeline.snapshot_boards", api=True)
+def snapshot_boards_job(ctx) -> dict:
+    """
+    params: {"project_id"?: <id>}
+    """
+    projects = Project.objects.order_by("id")
+    if ctx.params.get("project_id"):
+        projects = projects.filter(id=ctx.params["project_id"])
+
+    total = projects.count()
+    created = 0
+    for idx, project in enumerate(projects.iterator(), start=1):
+        created += build_snapshots(project)
+        ctx.progress(idx, total)
+    return {"projects": total, "snapshots": created}
@@ -0,0 +1,144 @@
+"""
+Шаблони пайплайна (PipelineTemplate): стадії нового проєкту і масове
+застосування шаблону до вже існуючих проєктів.
+
+Стадії зіставляються за system_key, тож застосування ідемпотентне, а заявки
+лишаються у своїх стадіях. Усе пишеться bulk-операціями — кількість запитів
+не залежить від кількості проєктів.
+"""
+
+from core.cache import invalidate
+from django.db import transaction
+
+from .defaults import DEFAULT_STAGES
+from .models import Application, PipelineTemplateStage, Stage, StageChangeEvent
+
+STAGE_DEF_FIELDS = ("name", "system_key", "is_final")
+
+
+def template_stage_defs(template) -> list[dict]:
+    return list(template.stages.order_by("order", "id").values(*STAGE_DEF_FIELDS))
+
+
+def default_stage_defs() -> list[dict]:
+    """
+    Стадії для нового проєкту: default-шаблон, а без нього — вбудовані DEFAULT_STAGES.
+    """
+    stage_defs = list(
+        PipelineTemplateStage.objects.filter(template__is_default=True)
+        .order_by("order", "id")
+        .values(*STAGE_DEF_FIELDS)
+    )
+    return stage_defs or DEFAULT_STAGES
+
+
+def create_project_stages(project_id, stage_defs=None) -> list[Stage]:
+    if stage_defs is None:
+        stage_defs = default_stage_defs()
+
+    stages = Stage.objects.bulk_create(
+        Stage(
+            project_id=project_id,
+            name=stage_def["name"],
+            system_key=stage_def["system_key"],
+            order=idx,
+            is_final=stage_def.get("is_final", False),
+        )
+        for idx, stage_def in enumerate(stage_defs, start=1)
+    )
+    # bulk_create не шле сигналів
+    invalidate("stages", project_id)
+    return stages
+
+
+@transaction.atomic
+def apply_template(template, project_ids, remove_missing: bool = False) -> dict[int, dict]:
+    """
+    Синхронізує стадії проєктів із шаблоном:
+    - відсутні стадії створюються;
+    - наявні (той самий system_key) отримують назву, порядок і is_final шаблону;
+    - стадії поза шаблоном стають у кінець, а з remove_missing видаляються,
+      якщо на них немає ні заявок, ні історії переходів.
+    Повертає звіт по кожному проєкту.
+    """
+    stage_defs = template_stage_defs(template)
+    project_ids = list(dict.fromkeys(project_ids))
+
+    existing: dict[int, list[Stage]] = {project_id: [] for project_id in project_ids}
+    for stage in (
+        Stage.objects.filter(project_id__in=project_ids)
+        .order_by("order", "id")
+        .only("id", "project_id", "name", "system_key", "order", "is_final")
+    ):
+        existing[stage.project_id].append(stage)
+
+    template_keys = {stage_def["system_key"] for stage_def in stage_defs}
+    extra_ids = [
+        stage.id
+        for stages in existing.values()
+        for stage in stages
+        if stage.system_key not in template_keys
+    ]
+
+    busy: set[int] = set()
+    if remove_missing and extra_ids:
+        busy.update(
+            Application.objects.filter(current_stage_id__in=extra_ids)
+            .values_list("current_stage_id", flat=True)
+            .distinct()
+        )
+        busy.update(
+            StageChangeEvent.objects.filter(to_stage_id__in=extra_ids)
+            .values_list("to_stage_id", flat=True)
+            .distinct()
+        )
+
+    to_create, to_update, to_delete = [], [], []
+    report = {}
+    for project_id, stages in existing.items():
+        by_key = {stage.system_key: stage for stage in stages}
+        result = {"created": 0, "updated": 0, "removed": 0, "kept_stage_ids": []}
+
+        order = 0
+        for stage_def in stage_defs:
+            order += 1
+            stage = by_key.get(stage_def["system_key"])
+            if stage is None:
+                to_create.append(Stage(project_id=project_id, order=order, **stage_def))
+                result["created"] += 1
+                continue
+            values = {**stage_def, "order": order}
+            if any(getattr(stage, name) != value for name, value in values.items()):
+                for name, value in values.items():
+                    setattr(stage, name, value)
+                to_update.append(stage)
+                result["updated"] += 1
+
+        for stage in stages:
+            if stage.system_key in template_keys:
+                continue
+            if remove_missing and stage.id not in busy:
+                to_delete.append(stage.id)
+                result["removed"] += 1
+                continue
+            if remove_missing:
+                result["kept_stage_ids"].append(stage.id)
+            order += 1
+            if stage.order != order:
+                stage.order = order
+                to_update.append(stage)
+                result["updated"] += 1
+
+        report[project_id] = result
+
+    if to_delete:
+        Stage.objects.filter(id__in=to_delete).delete()
+    if to_update:
+        Stage.objects.bulk_update(to_update, ["name", "order", "is_final"])
+    if to_create:
+        Stage.objects.bulk_create(to_create)
+
+    # bulk-операції не шлють сигналів — кеш стадій і payload-и дошок скидаємо вручну
+    invalidate("stages", *project_ids)
+    invalidate("project", *project_ids)
+    return report
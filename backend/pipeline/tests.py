@@ -1 +1,960 @@
-# Create your tests here.
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import urlencode
+
+from analytics.models import StageDailyRollup
+from analytics.rollups import refresh_rollups
+from candidates.models import Candidate, Skill
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from integrations.models import OutboxEvent
+from projects.models import Project, ProjectMember
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from users.models import User
+
+from .archive import archive_events
+from .history import board_state_at, build_snapshots
+from .models import (
+    Application,
+    ApplicationArchiveEvent,
+    ArchivedStageChangeEvent,
+    PipelineTemplate,
+    Stage,
+    StageChangeEvent,
+)
+from .positions import allocate_positions, renumber_stage
+from .serializers import APPLICATION_CARD_VALUES, ApplicationCardSerializer, application_cards
+from .stages import project_stages
+
+
+def query_plan(sql: str) -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class HotPathQueryPlanTests(TestCase):
+    """
+    EXPLAIN QUERY PLAN для гарячих запитів пайплайна: жоден не повинен
+    сканувати таблицю повністю або сортувати через тимчасове B-tree.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        cls.project = Project.objects.create(title="Backend", owner=cls.admin)
+        cls.stages = list(Stage.objects.filter(project=cls.project))
+
+        for idx in range(5):
+            candidate = Candidate.objects.create(
+                first_name="Cand", last_name=str(idx), email=f"c{idx}@example.com"
+            )
+            app = Application.objects.create(
+                project=cls.project,
+                candidate=candidate,
+                current_stage=cls.stages[idx % 2],
+                position_in_stage=idx,
+            )
+            StageChangeEvent.objects.create(
+                application=app, to_stage=app.current_stage, changed_by=cls.admin
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def assertIndexedPlan(self, sql: str):
+        plan = query_plan(sql)
+        for line in plan:
+            self.assertNotIn("TEMP B-TREE", line, f"{sql}\n{plan}")
+            if line.startswith("SCAN "):
+                self.assertIn("USING", line, f"{sql}\n{plan}")
+
+    def captured(self, method: str, url: str, table: str, data=None) -> list[str]:
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url, data, format="json")
+        self.assertLess(response.status_code, 400, response.content)
+        return [
+            q["sql"]
+            for q in ctx.captured_queries
+            if f'FROM "{table}"' in q["sql"] and q["sql"].startswith("SELECT")
+        ]
+
+    def test_kanban_board_query(self):
+        queries = self.captured(
+            "get", f"/api/v1/projects/{self.project.id}/kanban/", "pipeline_application"
+        )
+        self.assertTrue(queries)
+        for sql in queries:
+            self.assertIndexedPlan(sql)
+
+    def test_kanban_column_and_position_queries(self):
+        stage = self.stages[0]
+        column = Application.objects.filter(
+            project=self.project, current_stage=stage, is_archived=False
+        ).order_by("position_in_stage", "-updated_at", "id")
+        self.assertIndexedPlan(str(column.query))
+
+        queries = self.captured(
+            "post",
+            "/api/v1/applications/",
+            "pipeline_application",
+            {"project_id": self.project.id, "candidate_id": self._new_candidate().id},
+        )
+        # позицію видає лічильник стадії — агрегату по колонці немає
+        self.assertFalse([sql for sql in queries if "MAX(" in sql])
+        for sql in queries:
+            self.assertIndexedPlan(sql)
+
+    def test_candidate_list_with_status_subqueries(self):
+        queries = self.captured("get", "/api/v1/candidates/", "candidates_candidate")
+        self.assertTrue(queries)
+        for sql in queries:
+            self.assertIndexedPlan(sql)
+
+    def test_stage_history_query(self):
+        app = Application.objects.first()
+        history = StageChangeEvent.objects.filter(application=app).order_by("changed_at")
+        self.assertIndexedPlan(str(history.query))
+
+    def _new_candidate(self) -> Candidate:
+        return Candidate.objects.create(first_name="New", last_name="One", email="new@example.com")
+
+
+class ApplicationCardFastPathTests(TestCase):
+    """
+    values()-серіалізація карток має давати той самий JSON, що й ApplicationCardSerializer.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        cls.project = Project.objects.create(title="Backend", owner=cls.admin)
+        stages = list(Stage.objects.filter(project=cls.project))
+
+        people = [
+            ("Олена", "Коваль", ["TypeScript", "React", "Go"]),
+            ("Cher", "", []),
+            ("Ivan", "Petrenko", ["Python"]),
+        ]
+        for idx, (first, last, skills) in enumerate(people):
+            candidate = Candidate.objects.create(
+                first_name=first,
+                last_name=last,
+                email=f"c{idx}@example.com",
+                phone=f"+380 50 000 00 0{idx}",
+                experience_years=idx,
+                rating=idx,
+            )
+            for name in skills:
+                skill, _ = Skill.objects.get_or_create(name=name)
+                candidate.skills.add(skill)
+            Application.objects.create(
+                project=cls.project,
+                candidate=candidate,
+                current_stage=stages[idx % 2],
+                position_in_stage=idx + 1,
+                is_archived=idx == 2,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_cards_match_serializer(self):
+        qs = Application.objects.filter(project=self.project).order_by("id")
+        expected = ApplicationCardSerializer(
+            qs.select_related("candidate").prefetch_related("candidate__skills"), many=True
+        ).data
+        actual = application_cards(qs.values(*APPLICATION_CARD_VALUES))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_list_endpoint_matches_serializer(self):
+        response = self.client.get("/api/v1/applications/")
+        self.assertEqual(response.status_code, 200)
+
+        qs = (
+            Application.objects.filter(is_archived=False)
+            .select_related("candidate")
+            .prefetch_related("candidate__skills")
+            .order_by("-updated_at")
+        )
+        expected = ApplicationCardSerializer(qs, many=True).data
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]), JSONRenderer().render(expected)
+        )
+
+
+class BoardHistoryTests(TestCase):
+    """
+    Історична дошка зі snapshot-а + replay має збігатися з replay усього логу.
+    """
+
+    databases = {"default", "archive"}
+
+    def test_snapshots_do_not_change_reconstructed_state(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        project = Project.objects.create(title="Backend", owner=admin)
+        stages = list(Stage.objects.filter(project=project))
+        start = timezone.now() - timedelta(days=30)
+
+        apps = [
+            Application.objects.create(
+                project=project,
+                candidate=Candidate.objects.create(
+                    first_name="Cand", last_name=str(idx), email=f"c{idx}@example.com"
+                ),
+                current_stage=stages[0],
+            )
+            for idx in range(5)
+        ]
+        for idx in range(60):
+            event = StageChangeEvent.objects.create(
+                application=apps[idx % 5], to_stage=stages[idx % 7], changed_by=admin
+            )
+            # по дві події на годину: snapshot не може розрізати однаковий changed_at
+            StageChangeEvent.objects.filter(id=event.id).update(
+                changed_at=start + timedelta(hours=idx // 2)
+            )
+
+        moments = [start + timedelta(hours=h, minutes=30) for h in (0, 7, 8, 15, 29, 40)]
+        expected = [board_state_at(project, at)[0] for at in moments]
+
+        self.assertEqual(build_snapshots(project, every_events=9, lag_seconds=0), 5)
+        for at, state in zip(moments, expected):
+            restored, _, replayed = board_state_at(project, at)
+            self.assertEqual(restored, state)
+            self.assertLessEqual(replayed, 10)
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get(
+            f"/api/v1/projects/{project.id}/kanban/history/",
+            {"at": (start + timedelta(hours=10)).isoformat()},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        cards = [card for stage in response.json()["stages"] for card in stage["applications"]]
+        self.assertEqual(len(cards), 5)
+
+    def test_archived_applications_leave_historical_boards(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        project = Project.objects.create(title="Backend", owner=admin)
+        stage = Stage.objects.get(project=project, system_key="new")
+        start = timezone.now() - timedelta(days=3)
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        apps = []
+        for idx in range(2):
+            app = Application.objects.create(
+                project=project,
+                candidate=Candidate.objects.create(
+                    first_name="Cand", last_name=str(idx), email=f"c{idx}@example.com"
+                ),
+                current_stage=stage,
+            )
+            event = StageChangeEvent.objects.create(application=app, to_stage=stage)
+            StageChangeEvent.objects.filter(id=event.id).update(changed_at=start)
+            apps.append(app)
+
+        # архівація через DELETE день тому, повернення через PATCH годину тому
+        self.assertEqual(client.delete(f"/api/v1/applications/{apps[0].id}/").status_code, 204)
+        ApplicationArchiveEvent.objects.update(changed_at=start + timedelta(days=1))
+        response = client.patch(
+            f"/api/v1/applications/{apps[0].id}/?is_archived=true",
+            {"is_archived": False},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        ApplicationArchiveEvent.objects.filter(is_archived=False).update(
+            changed_at=timezone.now() - timedelta(hours=1)
+        )
+
+        def board_ids(at):
+            response = client.get(
+                f"/api/v1/projects/{project.id}/kanban/history/", {"at": at.isoformat()}
+            )
+            return {card["id"] for s in response.json()["stages"] for card in s["applications"]}
+
+        before, during = start + timedelta(hours=1), start + timedelta(days=2)
+        everyone = {app.id for app in apps}
+        self.assertEqual(board_ids(before), everyone)
+        self.assertEqual(board_ids(during), {apps[1].id})
+        self.assertEqual(board_ids(timezone.now()), everyone)
+
+        # snapshot усередині періоду архівації зберігає позначку
+        self.assertEqual(build_snapshots(project, every_events=1, lag_seconds=0), 2)
+        self.assertEqual(board_ids(during), {apps[1].id})
+        self.assertEqual(board_ids(timezone.now()), everyone)
+
+
+class EventArchiveTests(TestCase):
+    """
+    Архівація старих подій не змінює rollup-и, історичні дошки й історію заявки.
+    """
+
+    databases = {"default", "archive"}
+
+    def test_archive_is_transparent(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        project = Project.objects.create(title="Backend", owner=admin)
+        stages = {s.system_key: s for s in Stage.objects.filter(project=project)}
+        app = Application.objects.create(
+            project=project,
+            candidate=Candidate.objects.create(
+                first_name="Cand", last_name="Old", email="old@example.com"
+            ),
+            current_stage=stages["new"],
+        )
+        now = timezone.now()
+        for days_ago, from_key, to_key in ((400, None, "new"), (390, "new", "screening")):
+            event = StageChangeEvent.objects.create(
+                application=app,
+                from_stage=stages.get(from_key),
+                to_stage=stages[to_key],
+                changed_by=admin,
+            )
+            StageChangeEvent.objects.filter(id=event.id).update(
+                changed_at=now - timedelta(days=days_ago)
+            )
+
+        refresh_rollups(lag_seconds=0)
+        rollups = list(StageDailyRollup.objects.order_by("id").values())
+        board = board_state_at(project, now)[0]
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        history = client.get(f"/api/v1/applications/{app.id}/history/").json()["results"]
+
+        self.assertEqual(archive_events(months=12, now=now), 2)
+        self.assertFalse(StageChangeEvent.objects.exists())
+        self.assertEqual(ArchivedStageChangeEvent.objects.count(), 2)
+        self.assertEqual(list(StageDailyRollup.objects.order_by("id").values()), rollups)
+        self.assertEqual(board_state_at(project, now)[0], board)
+
+        archived = client.get(f"/api/v1/applications/{app.id}/history/").json()["results"]
+        self.assertEqual([{**event, "archived": False} for event in archived], history)
+        self.assertTrue(all(event["archived"] for event in archived))
+
+        # dwell рахується і тоді, коли вхід у стадію вже в архіві
+        StageChangeEvent.objects.create(
+            application=app,
+            from_stage=stages["screening"],
+            to_stage=stages["interview"],
+            changed_by=admin,
+        )
+        StageChangeEvent.objects.update(changed_at=now - timedelta(days=380))
+        refresh_rollups(lag_seconds=0)
+        screening = StageDailyRollup.objects.get(stage=stages["screening"], exits=1)
+        self.assertEqual(screening.dwell_seconds, 10 * 24 * 3600)
+
+
+class TimelineTests(TestCase):
+    """
+    Cursor-пагінація timeline: сторінки склеюються в повну історію
+    (гарячі + архівні події), кількість запитів не залежить від довжини історії.
+    """
+
+    databases = {"default", "archive"}
+
+    def test_candidate_timeline_pages(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        recruiter = User.objects.create_user(
+            email="rec@example.com", password="x", role=User.Role.RECRUITER
+        )
+        candidate = Candidate.objects.create(
+            first_name="Cand", last_name="Long", email="long@example.com"
+        )
+        now = timezone.now()
+        apps = []
+        for title in ("Backend", "Frontend"):
+            project = Project.objects.create(title=title, owner=admin)
+            stages = list(Stage.objects.filter(project=project))
+            app = Application.objects.create(
+                project=project, candidate=candidate, current_stage=stages[0]
+            )
+            apps.append(app)
+            for idx in range(12):
+                event = StageChangeEvent.objects.create(
+                    application=app, to_stage=stages[idx % 7], changed_by=admin
+                )
+                # частина подій з однаковим changed_at — курсор тримає tie-break по id
+                StageChangeEvent.objects.filter(id=event.id).update(
+                    changed_at=now - timedelta(days=500 - (idx // 2) * 40)
+                )
+        ProjectMember.objects.create(project=apps[0].project, user=recruiter)
+
+        refresh_rollups(lag_seconds=0)
+        self.assertGreater(archive_events(months=12, now=now), 0)
+        self.assertTrue(StageChangeEvent.objects.exists())
+
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        def pages(url, **params):
+            ids, url, queries = [], f"{url}?{urlencode({'page_size': 5, **params})}", set()
+            while url:
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.get(url)
+                self.assertEqual(response.status_code, 200, response.content)
+                queries.add(len(ctx.captured_queries))
+                ids += [event["id"] for event in response.json()["results"]]
+                url = response.json()["next"]
+            return ids, queries
+
+        expected = list(
+            StageChangeEvent.objects.order_by("changed_at", "id").values_list("id", flat=True)
+        ) + list(ArchivedStageChangeEvent.objects.values_list("source_id", flat=True))
+        expected = sorted(
+            expected,
+            key=lambda event_id: (
+                StageChangeEvent.objects.filter(id=event_id)
+                .values_list("changed_at", flat=True)
+                .first()
+                or ArchivedStageChangeEvent.objects.get(source_id=event_id).changed_at,
+                event_id,
+            ),
+        )
+
+        url = f"/api/v1/candidates/{candidate.id}/timeline/"
+        ids, queries = pages(url)
+        self.assertEqual(ids, expected)
+        self.assertLessEqual(max(queries), 5, queries)
+        self.assertEqual(pages(url, ordering="-changed_at")[0], expected[::-1])
+
+        app_ids, _ = pages(f"/api/v1/applications/{apps[1].id}/history/")
+        self.assertEqual(len(app_ids), 12)
+
+        # рекрутер бачить лише події свого проєкту
+        client.force_authenticate(recruiter)
+        ids, _ = pages(url)
+        self.assertEqual(len(ids), 12)
+        self.assertEqual(client.get(url, {"cursor": "broken"}).status_code, 400)
+
+
+class PositionAllocatorTests(TestCase):
+    """
+    Позиції видає лічильник стадії: без Max() на write path і без дублікатів.
+    """
+
+    def test_writes_allocate_unique_positions(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        project = Project.objects.create(title="Backend", owner=admin)
+        new, screening = Stage.objects.filter(project=project).order_by("order")[:2]
+        candidates = [
+            Candidate.objects.create(first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com")
+            for idx in range(6)
+        ]
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        with CaptureQueriesContext(connection) as ctx:
+            client.post(
+                "/api/v1/applications/",
+                {"project_id": project.id, "candidate_id": candidates[0].id},
+                format="json",
+            )
+            client.post(
+                "/api/v1/applications/bulk-create/",
+                {"project_id": project.id, "candidate_ids": [c.id for c in candidates[1:]]},
+                format="json",
+            )
+        self.assertFalse([q for q in ctx.captured_queries if "MAX(" in q["sql"].upper()])
+
+        apps = list(Application.objects.filter(project=project).order_by("id"))
+        self.assertEqual([a.position_in_stage for a in apps], [1, 2, 3, 4, 5, 6])
+
+        client.post(f"/api/v1/applications/{apps[0].id}/move/", {"to_stage_id": screening.id})
+        response = client.post(
+            "/api/v1/applications/bulk-move/",
+            {"application_ids": [apps[1].id, apps[2].id], "to_stage_id": screening.id},
+            format="json",
+        )
+        self.assertEqual([r["position_in_stage"] for r in response.json()["results"]], [2, 3])
+
+        # поламана колонка: дублікати й дірки → 1..n, лічильник = n
+        Application.objects.filter(id__in=[a.id for a in apps[3:]]).update(position_in_stage=7)
+        self.assertEqual(renumber_stage(new), 3)
+        self.assertEqual(
+            sorted(
+                Application.objects.filter(current_stage=new).values_list(
+                    "position_in_stage", flat=True
+                )
+            ),
+            [1, 2, 3],
+        )
+        new.refresh_from_db()
+        self.assertEqual(new.next_position, 3)
+
+
+class KanbanConcurrencyTests(TestCase):
+    """
+    If-Match з версіями колонок: застарілий reorder/move отримує 409 з даними для rebase.
+    """
+
+    def test_reorder_and_move_preconditions(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        project = Project.objects.create(title="Backend", owner=admin)
+        new, screening = Stage.objects.filter(project=project).order_by("order")[:2]
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        for idx in range(4):
+            candidate = Candidate.objects.create(
+                first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com"
+            )
+            client.post(
+                "/api/v1/applications/",
+                {"project_id": project.id, "candidate_id": candidate.id},
+                format="json",
+            )
+        a, b, c, d = Application.objects.order_by("position_in_stage").values_list("id", flat=True)
+
+        kanban = client.get(f"/api/v1/projects/{project.id}/kanban/").json()
+        version = kanban["stages"][0]["version"]
+        tag = f'"stage-{new.id}-v{version}"'
+        url = f"/api/v1/projects/{project.id}/kanban/reorder/"
+
+        response = client.post(
+            url,
+            {"stage_id": new.id, "moves": [{"application_id": d, "after_id": None}]},
+            format="json",
+            HTTP_IF_MATCH=tag,
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["ordered_application_ids"], [d, a, b, c])
+        self.assertEqual(response.json()["version"], version + 1)
+
+        # другий клієнт досі бачить стару версію і шле повний список
+        response = client.post(
+            url,
+            {"stage_id": new.id, "ordered_application_ids": [b, a, c, d]},
+            format="json",
+            HTTP_IF_MATCH=tag,
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["ordered_application_ids"], [d, a, b, c])
+        self.assertEqual(response.json()["stages"][0]["version"], version + 1)
+
+        # move з застарілою версією вихідної колонки — 409 і поточний стан картки
+        response = client.post(
+            f"/api/v1/applications/{a}/move/",
+            {"to_stage_id": screening.id},
+            format="json",
+            HTTP_IF_MATCH=tag,
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["application"]["current_stage_id"], new.id)
+
+        response = client.post(
+            f"/api/v1/applications/{a}/move/",
+            {"to_stage_id": screening.id},
+            format="json",
+            HTTP_IF_MATCH=response.json()["stages"][0]["etag"],
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["stage_versions"][str(new.id)], version + 2)
+
+        # delta без If-Match застосовується до актуального порядку; пишуться лише зміни
+        response = client.post(
+            url,
+            {"stage_id": new.id, "moves": [{"application_id": b, "after_id": c}]},
+            format="json",
+        )
+        self.assertEqual(response.json()["ordered_application_ids"], [d, c, b])
+        self.assertEqual(response.json()["updated"], 1)
+
+    def test_stale_empty_full_list_conflicts(self):
+        admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        project = Project.objects.create(title="Backend", owner=admin)
+        new = Stage.objects.get(project=project, system_key="new")
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        # клієнт бачив порожню колонку, а відтоді в неї додали картку
+        stale = f'"stage-{new.id}-v{new.version}"'
+        candidate = Candidate.objects.create(first_name="Cand", last_name="0", email="c@x.com")
+        client.post(
+            "/api/v1/applications/",
+            {"project_id": project.id, "candidate_id": candidate.id},
+            format="json",
+        )
+        app_id = Application.objects.get().id
+
+        response = client.post(
+            f"/api/v1/projects/{project.id}/kanban/reorder/",
+            {"stage_id": new.id, "ordered_application_ids": []},
+            format="json",
+            HTTP_IF_MATCH=stale,
+        )
+        self.assertEqual(response.status_code, 409, response.content)
+        self.assertEqual(response.json()["ordered_application_ids"], [app_id])
+        self.assertEqual(response.json()["added"], [app_id])
+        self.assertEqual(response.json()["removed"], [])
+
+
+class PipelineTemplateTests(TestCase):
+    """
+    Шаблони пайплайна: стадії нових проєктів, масове застосування, кеш стадій.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="x", role=User.Role.ADMIN
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_default_template_and_apply(self):
+        self.assertTrue(PipelineTemplate.objects.filter(is_default=True).exists())
+
+        response = self.client.post(
+            "/api/v1/pipeline-templates/",
+            {
+                "name": "Engineering",
+                "is_default": True,
+                "stages": [
+                    {"name": "Нові", "system_key": "new"},
+                    {"name": "Тех. інтервʼю", "system_key": "tech_interview"},
+                    {"name": "Найнято", "system_key": "hired", "is_final": True},
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        template = PipelineTemplate.objects.get(id=response.json()["id"])
+        self.assertEqual(PipelineTemplate.objects.filter(is_default=True).get(), template)
+
+        # новий проєкт отримує стадії default-шаблону
+        project = Project.objects.create(title="Backend", owner=self.admin)
+        self.assertEqual(
+            [s.system_key for s in project_stages(project.id)], ["new", "tech_interview", "hired"]
+        )
+
+        ids = [stage["id"] for stage in response.json()["stages"]]
+        response = self.client.post(
+            f"/api/v1/pipeline-templates/{template.id}/reorder/",
+            {"ordered_stage_ids": [ids[1], ids[0], ids[2]]},
+            format="json",
+        )
+        self.assertEqual(
+            [s["system_key"] for s in response.json()["stages"]], ["tech_interview", "new", "hired"]
+        )
+
+        # старі проєкти зі стандартними стадіями: у одного є заявка у "screening"
+        projects = [
+            Project.objects.create(title=f"Legacy {idx}", owner=self.admin) for idx in range(3)
+        ]
+        PipelineTemplate.objects.filter(id=template.id).update(is_default=False)
+        busy = Project.objects.create(title="Busy", owner=self.admin)
+        candidate = Candidate.objects.create(first_name="A", last_name="B", email="ab@x.com")
+        application = Application.objects.create(
+            project=busy,
+            candidate=candidate,
+            current_stage=Stage.objects.get(project=busy, system_key="screening"),
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f"/api/v1/pipeline-templates/{template.id}/apply/",
+                {"project_ids": [busy.id, 999999], "remove_missing": True},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        few_queries = len(ctx.captured_queries)
+
+        result, missing = response.json()["results"]
+        self.assertEqual(missing["status"], "not_found")
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(result["kept_stage_ids"], [application.current_stage_id])
+        self.assertEqual(
+            [s.system_key for s in project_stages(busy.id)],
+            ["tech_interview", "new", "hired", "screening"],
+        )
+        application.refresh_from_db()
+        self.assertEqual(application.current_stage.system_key, "screening")
+
+        # кількість запитів не залежить від кількості проєктів
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f"/api/v1/pipeline-templates/{template.id}/apply/",
+                {"project_ids": [p.id for p in projects], "remove_missing": True},
+                format="json",
+            )
+        self.assertEqual(response.json()["applied"], 3)
+        self.assertLessEqual(len(ctx.captured_queries), few_queries + 2)
+        for project in projects:
+            self.assertEqual(len(project_stages(project.id)), 3)
+
+    def test_hot_paths_use_stage_cache(self):
+        project = Project.objects.create(title="Backend", owner=self.admin)
+        candidates = [
+            Candidate.objects.create(first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com")
+            for idx in range(2)
+        ]
+        project_stages(project.id)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                "/api/v1/applications/",
+                {
+                    "project_id": project.id,
+                    "candidate_id": candidates[0].id,
+                    "stage_system_key": "screening",
+                },
+                format="json",
+            )
+            self.client.post(
+                f"/api/v1/applications/{response.json()['id']}/move/",
+                {"to_stage_id": project_stages(project.id)[2].id},
+                format="json",
+            )
+        # лічильники позицій і версії читаються з БД, визначення стадій — ні
+        stage_reads = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if 'FROM "pipeline_stage"' in q["sql"] and '"pipeline_stage"."system_key"' in q["sql"]
+        ]
+        self.assertEqual(stage_reads, [])
+
+        # зміна стадії через save() інвалідовує кеш
+        stage = Stage.objects.get(project=project, system_key="interview")
+        stage.name = "Інтервʼю"
+        stage.save()
+        summary = self.client.get(f"/api/v1/projects/{project.id}/summary/").json()
+        self.assertEqual(summary["stages"][2]["name"], "Інтервʼю")
+        self.assertEqual(summary["stages"][2]["candidates_count"], 1)
+        self.assertEqual(summary["total_candidates"], 1)
+
+
+class BulkMoveTests(TestCase):
+    """
+    bulk-move: статус для кожного id, позиції в цільовій колонці, події і outbox.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        self.project = Project.objects.create(title="Backend", owner=self.user)
+        self.new, self.screening = Stage.objects.filter(project=self.project).order_by("order")[:2]
+        other = Project.objects.create(title="Other", owner=self.user)
+        self.apps = []
+        for idx, (project, stage) in enumerate(
+            [(self.project, self.new)] * 3
+            + [(self.project, self.screening), (other, other.stages.order_by("order").first())]
+        ):
+            candidate = Candidate.objects.create(
+                first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com"
+            )
+            self.apps.append(
+                Application.objects.create(
+                    project=project, candidate=candidate, current_stage=stage
+                )
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bulk_move(self, ids, **params):
+        return self.client.post(
+            "/api/v1/applications/bulk-move/?" + urlencode(params),
+            {"application_ids": ids, "to_stage_id": self.screening.id},
+            format="json",
+        )
+
+    def test_results_and_events(self):
+        a, b, archived, unchanged, foreign = self.apps
+        archived.is_archived = True
+        archived.save()
+
+        response = self.bulk_move(
+            [b.id, a.id, a.id, archived.id, unchanged.id, foreign.id, 0], is_archived="true"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        self.assertEqual(data["moved"], 2)
+        self.assertEqual(
+            [(r["id"], r["status"]) for r in data["results"]],
+            [
+                (b.id, "moved"),
+                (a.id, "moved"),
+                (archived.id, "not_found"),
+                (unchanged.id, "unchanged"),
+                (foreign.id, "wrong_project"),
+                (0, "not_found"),
+            ],
+        )
+        # порядок з запиту — порядок у колонці, після вже наявних карток
+        positions = [r["position_in_stage"] for r in data["results"][:2]]
+        self.assertEqual(positions[1], positions[0] + 1)
+        self.assertGreater(positions[0], unchanged.position_in_stage)
+
+        archived.refresh_from_db()
+        self.assertEqual(archived.current_stage_id, self.new.id)
+        self.assertEqual(
+            set(
+                StageChangeEvent.objects.filter(to_stage=self.screening).values_list(
+                    "application_id", "from_stage_id"
+                )
+            ),
+            {(a.id, self.new.id), (b.id, self.new.id)},
+        )
+        moved = OutboxEvent.objects.filter(topic="application.moved")
+        self.assertEqual(sorted(e.payload["application_id"] for e in moved), sorted([a.id, b.id]))
+        self.assertTrue(all(e.payload["to_stage_id"] == self.screening.id for e in moved))
+
+
+class BulkCreateTests(TestCase):
+    """
+    bulk-create: дублікати, наявні, архівні, невидимі й відсутні кандидати
+    і пари, які паралельний запит вставив посеред батчу.
+    """
+
+    def setUp(self):
+        owner = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        self.user = User.objects.create_user(email="rec@example.com", role=User.Role.RECRUITER)
+        self.project = Project.objects.create(title="Backend", owner=owner)
+        ProjectMember.objects.create(
+            project=self.project, user=self.user, role=ProjectMember.Role.RECRUITER
+        )
+        self.stage = Stage.objects.get(project=self.project, system_key="new")
+        hidden_project = Project.objects.create(title="Hidden", owner=owner)
+
+        self.fresh, self.present, self.racing, self.archived, self.hidden = [
+            Candidate.objects.create(first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com")
+            for idx in range(5)
+        ]
+        self.archived.is_archived = True
+        self.archived.save()
+        self.existing = Application.objects.create(
+            project=self.project, candidate=self.present, current_stage=self.stage
+        )
+        Application.objects.create(
+            project=hidden_project,
+            candidate=self.hidden,
+            current_stage=hidden_project.stages.order_by("order").first(),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_results_by_candidate(self):
+        racing = {}
+
+        def allocate_after_race(stage_id, count):
+            # паралельний запит встиг вставити ту саму пару після перевірки existing
+            racing["app"] = Application.objects.create(
+                project=self.project, candidate=self.racing, current_stage=self.stage
+            )
+            return allocate_positions(stage_id, count)
+
+        ids = [self.fresh.id, self.fresh.id, self.present.id, self.racing.id]
+        ids += [self.archived.id, self.hidden.id, 0]
+        with mock.patch("pipeline.views.allocate_positions", allocate_after_race):
+            response = self.client.post(
+                "/api/v1/applications/bulk-create/",
+                {"project_id": self.project.id, "candidate_ids": ids},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201, response.content)
+        data = response.json()
+        self.assertEqual(data["created"], 1)
+
+        created = Application.objects.get(project=self.project, candidate=self.fresh)
+        self.assertEqual(
+            [(r["candidate_id"], r["status"], r.get("application_id")) for r in data["results"]],
+            [
+                (self.fresh.id, "created", created.id),
+                (self.present.id, "exists", self.existing.id),
+                (self.racing.id, "exists", racing["app"].id),
+                (self.archived.id, "not_found", None),
+                (self.hidden.id, "not_found", None),
+                (0, "not_found", None),
+            ],
+        )
+        self.assertEqual(
+            list(
+                StageChangeEvent.objects.filter(to_stage=self.stage).values_list(
+                    "application_id", flat=True
+                )
+            ),
+            [created.id],
+        )
+        self.assertEqual(
+            [
+                e.payload["candidate_id"]
+                for e in OutboxEvent.objects.filter(topic="application.created")
+            ],
+            [self.fresh.id],
+        )
+
+    def test_filter_skips_archived_and_hidden(self):
+        response = self.client.post(
+            "/api/v1/applications/bulk-create/",
+            {"project_id": self.project.id, "candidate_filter": {"search": "Cand"}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        statuses = {r["candidate_id"]: r["status"] for r in response.json()["results"]}
+        self.assertEqual(
+            statuses,
+            {self.fresh.id: "created", self.present.id: "exists", self.racing.id: "created"},
+        )
+
+
+class StaleStageCacheTests(TestCase):
+    """
+    Стадія, видалена після резолву з кешу стадій, дає 400 "Stage not found", а не
+    IntegrityError під виглядом "Candidate already exists".
+    """
+
+    def test_deleted_stage_is_rechecked_on_write(self):
+        admin = User.objects.create_user(email="admin@example.com", role=User.Role.ADMIN)
+        project = Project.objects.create(title="Backend", owner=admin)
+        extra = Stage.objects.create(project=project, name="Extra", system_key="extra", order=99)
+        candidate = Candidate.objects.create(first_name="Cand", last_name="0", email="c@x.com")
+        self.assertIn(extra.id, [stage.id for stage in project_stages(project.id)])
+
+        # інший процес видалив стадію, а інвалідація до кешу ще не дійшла
+        with mock.patch("pipeline.stages.get_generation", return_value=-1):
+            project_stages(project.id)
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM pipeline_stage WHERE id = %s", [extra.id])
+
+            client = APIClient()
+            client.force_authenticate(admin)
+            response = client.post(
+                "/api/v1/applications/",
+                {"project_id": project.id, "candidate_id": candidate.id, "stage_id": extra.id},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(response.json()["detail"], "Stage not found in this project")
+        self.assertFalse(Application.objects.exists())
+
+        # кеш стадій скинуто — наступний запит бачить актуальні стадії
+        self.assertNotIn(extra.id, [stage.id for stage in project_stages(project.id)])
+        response = client.post(
+            "/api/v1/applications/",
+            {"project_id": project.id, "candidate_id": candidate.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
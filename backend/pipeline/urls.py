@@ -1,8 +1,9 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import ApplicationViewSet
+from .views import ApplicationViewSet, PipelineTemplateViewSet
 
 router = DefaultRouter()
 router.register(r"applications", ApplicationViewSet, basename="application")
+router.register(r"pipeline-templates", PipelineTemplateViewSet, basename="pipeline-template")
 
 urlpatterns = router.urls
@@ -1,22 +1,75 @@
 # Create your views here.
+from candidates.filters import CandidateFilter
+from candidates.models import Candidate
+from candidates.views import CandidateViewSet
+from core.cache import invalidate
+from core.columnar import ColumnarMixin
+from core.conditional import ConditionalGetMixin, queryset_fingerprint
+from core.timing import ServerTimingMixin
 from django.db import IntegrityError, transaction
-from django.db.models import Max
+from django.utils import timezone
+from integrations.outbox import (
+    APPLICATION_ARCHIVED,
+    APPLICATION_CREATED,
+    APPLICATION_MOVED,
+    application_event,
+    publish,
+)
+from projects.models import Project
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from users.permissions import IsAdminOrHRRole
 
 from .filters import ApplicationFilter
-from .models import Application, Stage, StageChangeEvent
+from .history import timeline_response
+from .models import (
+    Application,
+    ApplicationArchiveEvent,
+    ArchivedStageChangeEvent,
+    PipelineTemplate,
+    PipelineTemplateStage,
+    Stage,
+    StageChangeEvent,
+)
 from .permissions import CanWriteProjectPipeline, IsProjectMemberOrAdminHR
+from .positions import (
+    StageConflict,
+    StageGone,
+    allocate_positions,
+    bump_versions,
+    conflict_payload,
+    current_versions,
+    expected_versions,
+)
 from .serializers import (
+    APPLICATION_CARD_VALUES,
+    ApplicationBulkCreateSerializer,
+    ApplicationBulkMoveSerializer,
     ApplicationCardSerializer,
     ApplicationCreateSerializer,
     ApplicationMoveSerializer,
+    PipelineTemplateApplySerializer,
+    PipelineTemplateReorderSerializer,
+    PipelineTemplateSerializer,
+    application_cards,
 )
+from .stages import resolve_stage
+from .templates import apply_template
+
 
+def stage_gone_response(project_id) -> Response:
+    # стадію видалили після резолву з кешу: скидаємо кеш стадій проєкту
+    invalidate("stages", project_id)
+    return Response(
+        {"detail": "Stage not found in this project"}, status=status.HTTP_400_BAD_REQUEST
+    )
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+
+class ApplicationViewSet(
+    ServerTimingMixin, ConditionalGetMixin, ColumnarMixin, viewsets.ModelViewSet
+):
     queryset = Application.objects.all()
     filterset_class = ApplicationFilter
     ordering_fields = ["created_at", "updated_at", "position_in_stage"]
@@ -41,6 +94,25 @@ class ApplicationViewSet(viewsets.ModelViewSet):
 
         return qs.filter(project__memberships__user=user).distinct()
 
+    def get_validator(self, request):
+        if self.action == "list":
+            app_ids = self.get_queryset().values("id")
+            return (
+                queryset_fingerprint(Application.objects.filter(id__in=app_ids)),
+                queryset_fingerprint(Candidate.objects.filter(applications__id__in=app_ids)),
+            )
+
+        if self.action == "retrieve":
+            pk = str(self.kwargs.get("pk", ""))
+            if not pk.isdigit():
+                return None
+            return (
+                queryset_fingerprint(Application.objects.filter(pk=pk)),
+                queryset_fingerprint(Candidate.objects.filter(applications__pk=pk)),
+            )
+
+        return None
+
     def get_permissions(self):
         if self.action in ("create", "move", "destroy"):
             return [IsAuthenticated()]
@@ -59,9 +131,31 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
         return Response(ApplicationCardSerializer(app).data)
 
+    @action(detail=True, methods=["get"], url_path="history")
+    def history(self, request, pk=None):
+        """
+        Timeline переходів заявки (включно з архівними подіями), cursor-пагінація.
+        ?cursor=&page_size=50&ordering=changed_at|-changed_at
+        """
+        app = self.get_object()
+        if not IsProjectMemberOrAdminHR().has_object_permission(request, self, app):
+            return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+        return timeline_response(
+            request,
+            StageChangeEvent.objects.filter(application=app),
+            ArchivedStageChangeEvent.objects.filter(application_id=app.id),
+        )
+
     def list(self, request, *args, **kwargs):
         # queryset already filtered by membership
-        return super().list(request, *args, **kwargs)
+        # fast path: values() + один запит на навички замість DRF-серіалізатора
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .values(*APPLICATION_CARD_VALUES)
+        )
+        return self.rows_response(queryset, application_cards)
 
     def create(self, request, *args, **kwargs):
         serializer = ApplicationCreateSerializer(data=request.data)
@@ -75,29 +169,36 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if not CanWriteProjectPipeline().has_object_permission(request, self, project):
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
-        # позиція: додаємо в кінець колонки
-        max_pos = (
-            Application.objects.filter(project=project, current_stage=stage, is_archived=False)
-            .aggregate(Max("position_in_stage"))
-            .get("position_in_stage__max")
-            or 0
-        )
-        position = max_pos + 1
-
         try:
             with transaction.atomic():
                 app = Application.objects.create(
                     project=project,
                     candidate=candidate,
                     current_stage=stage,
-                    position_in_stage=position,
+                    # позиція: додаємо в кінець колонки
+                    position_in_stage=allocate_positions(stage.id),
                 )
+                bump_versions([stage.id])
                 StageChangeEvent.objects.create(
                     application=app,
                     from_stage=None,
                     to_stage=stage,
                     changed_by=request.user,
                 )
+                publish(
+                    [
+                        application_event(
+                            APPLICATION_CREATED,
+                            application_id=app.id,
+                            project_id=project.id,
+                            candidate_id=candidate.id,
+                            to_stage_id=stage.id,
+                            user=request.user,
+                        )
+                    ]
+                )
+        except StageGone:
+            return stage_gone_response(project.id)
         except IntegrityError:
             return Response(
                 {"detail": "Candidate already exists in this project"},
@@ -127,7 +228,8 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         to_stage_id = serializer.validated_data["to_stage_id"]
 
-        to_stage = Stage.objects.filter(project=app.project, id=to_stage_id).first()
+        # стадії — з in-process кешу (pipeline/stages.py)
+        to_stage = resolve_stage(app.project_id, stage_id=to_stage_id)
         if not to_stage:
             return Response(
                 {"detail": "Stage not found in this project"}, status=status.HTTP_400_BAD_REQUEST
@@ -145,25 +247,44 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             )
             return Response(ApplicationCardSerializer(app).data, status=status.HTTP_200_OK)
 
-        max_pos = (
-            Application.objects.filter(
-                project=app.project, current_stage=to_stage, is_archived=False
-            )
-            .aggregate(Max("position_in_stage"))
-            .get("position_in_stage__max")
-            or 0
-        )
+        stage_ids = [from_stage_id, to_stage.id]
+        try:
+            with transaction.atomic():
+                # If-Match з версіями колонок: compare-and-set, інакше 409
+                bump_versions(stage_ids, expected_versions(request))
 
-        with transaction.atomic():
-            app.current_stage = to_stage
-            app.position_in_stage = max_pos + 1
-            app.save()  # оновить updated_at
-
-            StageChangeEvent.objects.create(
-                application=app,
-                from_stage=from_stage,
-                to_stage=to_stage,
-                changed_by=request.user,
+                app.current_stage = to_stage
+                app.position_in_stage = allocate_positions(to_stage.id)
+                app.save()  # оновить updated_at
+
+                StageChangeEvent.objects.create(
+                    application=app,
+                    from_stage=from_stage,
+                    to_stage=to_stage,
+                    changed_by=request.user,
+                )
+                publish(
+                    [
+                        application_event(
+                            APPLICATION_MOVED,
+                            application_id=app.id,
+                            project_id=app.project_id,
+                            candidate_id=app.candidate_id,
+                            from_stage_id=from_stage_id,
+                            to_stage_id=to_stage.id,
+                            user=request.user,
+                        )
+                    ]
+                )
+        except StageGone:
+            return stage_gone_response(app.project_id)
+        except StageConflict as exc:
+            current = Application.objects.filter(id=app.id).values(
+                "id", "current_stage_id", "position_in_stage"
+            )
+            return Response(
+                conflict_payload(stage_ids, conflicts=exc.stage_ids, application=current.first()),
+                status=status.HTTP_409_CONFLICT,
             )
 
         app = (
@@ -171,7 +292,275 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             .prefetch_related("candidate__skills")
             .get(id=app.id)
         )
-        return Response(ApplicationCardSerializer(app).data, status=status.HTTP_200_OK)
+        data = ApplicationCardSerializer(app).data
+        data["stage_versions"] = current_versions(stage_ids)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="bulk-create")
+    def bulk_add(self, request):
+        """
+        Масове додавання кандидатів у проєкт (кампанії сорсингу).
+        body: { "project_id": <id>, "candidate_ids": [..] | "candidate_filter": {..},
+                "stage_id"?: <id>, "stage_system_key"?: "new" }
+        Пари (project, candidate), що вже існують, пропускаються через unique constraint.
+        """
+        serializer = ApplicationBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        project = serializer.validated_data["project"]
+        stage = serializer.validated_data["stage"]
+        limit = ApplicationBulkCreateSerializer.MAX_CANDIDATES
+
+        # write permission
+        if not CanWriteProjectPipeline().has_object_permission(request, self, project):
+            return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+        # обидві гілки: лише неархівні кандидати з видимого користувачу scope
+        candidates = CandidateViewSet.limit_to_visible(
+            Candidate.objects.filter(is_archived=False), request.user
+        )
+        if "candidate_ids" in serializer.validated_data:
+            requested = list(dict.fromkeys(serializer.validated_data["candidate_ids"]))
+            found = set(candidates.filter(id__in=requested).values_list("id", flat=True))
+        else:
+            filterset = CandidateFilter(
+                data=serializer.validated_data["candidate_filter"],
+                queryset=CandidateViewSet.annotate_status(candidates),
+                request=request,
+            )
+            if not filterset.is_valid():
+                return Response(
+                    {"candidate_filter": filterset.errors}, status=status.HTTP_400_BAD_REQUEST
+                )
+            requested = list(filterset.qs.order_by("id").values_list("id", flat=True)[: limit + 1])
+            if len(requested) > limit:
+                return Response(
+                    {"detail": f"Filter matches more than {limit} candidates"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            found = set(requested)
+
+        existing = dict(
+            Application.objects.filter(project=project, candidate_id__in=found).values_list(
+                "candidate_id", "id"
+            )
+        )
+        to_insert = [cid for cid in requested if cid in found and cid not in existing]
+
+        created = {}
+        if to_insert:
+            try:
+                with transaction.atomic():
+                    first = allocate_positions(stage.id, len(to_insert))
+                    bump_versions([stage.id])
+                    # ignore_conflicts: паралельно додані пари не валять весь батч
+                    Application.objects.bulk_create(
+                        [
+                            Application(
+                                project=project,
+                                candidate_id=cid,
+                                current_stage=stage,
+                                position_in_stage=first + idx,
+                            )
+                            for idx, cid in enumerate(to_insert)
+                        ],
+                        ignore_conflicts=True,
+                    )
+                    # з ignore_conflicts SQLite не повертає pk — дочитуємо одним запитом.
+                    # Лише рядки з виділеного цьому запиту діапазону позицій: пари,
+                    # які паралельний запит вставив після перевірки existing, — не наші
+                    created = dict(
+                        Application.objects.filter(
+                            project=project,
+                            candidate_id__in=to_insert,
+                            current_stage=stage,
+                            position_in_stage__gte=first,
+                            position_in_stage__lt=first + len(to_insert),
+                        ).values_list("candidate_id", "id")
+                    )
+                    StageChangeEvent.objects.bulk_create(
+                        [
+                            StageChangeEvent(
+                                application_id=app_id,
+                                from_stage=None,
+                                to_stage=stage,
+                                changed_by=request.user,
+                            )
+                            for app_id in created.values()
+                        ]
+                    )
+                    publish(
+                        application_event(
+                            APPLICATION_CREATED,
+                            application_id=app_id,
+                            project_id=project.id,
+                            candidate_id=cid,
+                            to_stage_id=stage.id,
+                            user=request.user,
+                        )
+                        for cid, app_id in created.items()
+                    )
+            except StageGone:
+                return stage_gone_response(project.id)
+
+            # bulk_create не шле сигналів — інвалідовуємо кеш дошки вручну
+            invalidate("project", project.id)
+
+            lost = [cid for cid in to_insert if cid not in created]
+            if lost:
+                existing.update(
+                    Application.objects.filter(project=project, candidate_id__in=lost).values_list(
+                        "candidate_id", "id"
+                    )
+                )
+
+        results = []
+        for cid in requested:
+            if cid not in found:
+                results.append({"candidate_id": cid, "status": "not_found"})
+            elif cid in existing:
+                results.append(
+                    {"candidate_id": cid, "status": "exists", "application_id": existing[cid]}
+                )
+            else:
+                results.append(
+                    {"candidate_id": cid, "status": "created", "application_id": created.get(cid)}
+                )
+
+        return Response(
+            {
+                "project_id": project.id,
+                "stage_id": stage.id,
+                "created": len(created),
+                "results": results,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk-move")
+    def bulk_move(self, request):
+        """
+        Переміщення багатьох карток в одну стадію за один запит.
+        body: { "application_ids": [..], "to_stage_id": <id> }
+        If-Match (опційно): версії цільової/вихідних колонок, інакше 409.
+        Повертає статус для кожного id: moved / unchanged / not_found / wrong_project.
+        """
+        serializer = ApplicationBulkMoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # порядок з запиту = порядок у новій колонці; дублікати прибираємо
+        ids = list(dict.fromkeys(serializer.validated_data["application_ids"]))
+        to_stage_id = serializer.validated_data["to_stage_id"]
+
+        to_stage = Stage.objects.filter(id=to_stage_id).select_related("project").first()
+        if not to_stage:
+            return Response({"detail": "Stage not found"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # write permission (усі картки мають бути в проєкті цільової стадії)
+        if not CanWriteProjectPipeline().has_object_permission(request, self, to_stage.project):
+            return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+
+        # один запит: лише видимі користувачу, неархівні заявки
+        # (get_queryset() з ?is_archived=... архів не відсікає — фільтруємо явно)
+        apps_by_id = {
+            app.id: app
+            for app in self.get_queryset()
+            .select_related(None)
+            .prefetch_related(None)
+            .filter(id__in=ids, is_archived=False)
+            .only("id", "project_id", "candidate_id", "current_stage_id", "position_in_stage")
+        }
+
+        now = timezone.now()
+        results = []
+        to_update = []
+        events = []
+        for aid in ids:
+            app = apps_by_id.get(aid)
+            if app is None:
+                results.append({"id": aid, "status": "not_found"})
+                continue
+            if app.project_id != to_stage.project_id:
+                results.append({"id": aid, "status": "wrong_project"})
+                continue
+            if app.current_stage_id == to_stage.id:
+                results.append(
+                    {"id": aid, "status": "unchanged", "position_in_stage": app.position_in_stage}
+                )
+                continue
+
+            events.append(
+                StageChangeEvent(
+                    application_id=app.id,
+                    from_stage_id=app.current_stage_id,
+                    to_stage_id=to_stage.id,
+                    changed_by=request.user,
+                )
+            )
+            app.current_stage_id = to_stage.id
+            app.updated_at = now
+            to_update.append(app)
+            results.append({"id": aid, "status": "moved", "position_in_stage": None})
+
+        if to_update:
+            # версії перевіряються для цільової і всіх вихідних колонок
+            stage_ids = [to_stage.id, *{event.from_stage_id for event in events}]
+            try:
+                with transaction.atomic():
+                    bump_versions(stage_ids, expected_versions(request))
+
+                    # позиції резервуються одним UPDATE лічильника на всю пачку
+                    first = allocate_positions(to_stage.id, len(to_update))
+                    positions = {app.id: first + idx for idx, app in enumerate(to_update)}
+                    for app in to_update:
+                        app.position_in_stage = positions[app.id]
+
+                    # bulk_update не чіпає auto_now — updated_at виставлено вище
+                    Application.objects.bulk_update(
+                        to_update, ["current_stage", "position_in_stage", "updated_at"]
+                    )
+                    StageChangeEvent.objects.bulk_create(events)
+                    publish(
+                        application_event(
+                            APPLICATION_MOVED,
+                            application_id=app.id,
+                            project_id=app.project_id,
+                            candidate_id=app.candidate_id,
+                            from_stage_id=event.from_stage_id,
+                            to_stage_id=to_stage.id,
+                            user=request.user,
+                        )
+                        for app, event in zip(to_update, events)
+                    )
+            except StageGone:
+                return stage_gone_response(to_stage.project_id)
+            except StageConflict as exc:
+                return Response(
+                    conflict_payload(stage_ids, conflicts=exc.stage_ids),
+                    status=status.HTTP_409_CONFLICT,
+                )
+
+            for result in results:
+                if result["status"] == "moved":
+                    result["position_in_stage"] = positions[result["id"]]
+
+            # bulk_update не шле сигналів — інвалідовуємо кеш дошки вручну
+            invalidate("project", to_stage.project_id)
+
+        return Response(
+            {"to_stage_id": to_stage.id, "moved": len(to_update), "results": results},
+            status=status.HTTP_200_OK,
+        )
+
+    def perform_update(self, serializer):
+        was_archived = serializer.instance.is_archived
+        with transaction.atomic():
+            app = serializer.save()
+            if app.is_archived != was_archived:
+                # архівація через PATCH — для історичних дошок (pipeline/history.py)
+                ApplicationArchiveEvent.objects.create(
+                    application=app, is_archived=app.is_archived, changed_by=self.request.user
+                )
 
     def destroy(self, request, *args, **kwargs):
         app = self.get_object()
@@ -182,6 +571,99 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if not CanWriteProjectPipeline().has_object_permission(request, self, app):
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
-        app.is_archived = True
-        app.save(update_fields=["is_archived"])
+        with transaction.atomic():
+            if not app.is_archived:
+                ApplicationArchiveEvent.objects.create(
+                    application=app, is_archived=True, changed_by=request.user
+                )
+            app.is_archived = True
+            app.save(update_fields=["is_archived", "updated_at"])
+            bump_versions([app.current_stage_id])
+            publish(
+                [
+                    application_event(
+                        APPLICATION_ARCHIVED,
+                        application_id=app.id,
+                        project_id=app.project_id,
+                        candidate_id=app.candidate_id,
+                        to_stage_id=app.current_stage_id,
+                        user=request.user,
+                    )
+                ]
+            )
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PipelineTemplateViewSet(viewsets.ModelViewSet):
+    """
+    Шаблони пайплайна: читати може будь-хто, змінювати і застосовувати — ADMIN/HR.
+    """
+
+    queryset = PipelineTemplate.objects.prefetch_related("stages").order_by("name")
+    serializer_class = PipelineTemplateSerializer
+
+    def get_permissions(self):
+        if self.action in ("list", "retrieve"):
+            return [IsAuthenticated()]
+        return [IsAdminOrHRRole()]
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @action(detail=True, methods=["post"], url_path="reorder")
+    def reorder(self, request, pk=None):
+        """
+        body: { "ordered_stage_ids": [..] } — повний новий порядок стадій шаблону.
+        """
+        template = self.get_object()
+
+        serializer = PipelineTemplateReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ordered_ids = serializer.validated_data["ordered_stage_ids"]
+
+        stages = {stage.id: stage for stage in template.stages.all()}
+        if sorted(ordered_ids) != sorted(stages):
+            return Response(
+                {"detail": "ordered_stage_ids must list every stage of the template once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        for idx, stage_id in enumerate(ordered_ids, start=1):
+            stages[stage_id].order = idx
+        PipelineTemplateStage.objects.bulk_update(stages.values(), ["order"])
+
+        template = self.get_queryset().get(id=template.id)
+        return Response(self.get_serializer(template).data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=["post"], url_path="apply")
+    def apply(self, request, pk=None):
+        """
+        Застосовує шаблон до багатьох проєктів (pipeline/templates.py).
+        body: { "project_ids": [..], "remove_missing"?: false }
+        """
+        template = self.get_object()
+
+        serializer = PipelineTemplateApplySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        requested = list(dict.fromkeys(serializer.validated_data["project_ids"]))
+        found = set(Project.objects.filter(id__in=requested).values_list("id", flat=True))
+
+        report = apply_template(
+            template,
+            [pid for pid in requested if pid in found],
+            remove_missing=serializer.validated_data["remove_missing"],
+        )
+
+        results = [
+            (
+                {"project_id": pid, "status": "applied", **report[pid]}
+                if pid in found
+                else {"project_id": pid, "status": "not_found"}
+            )
+            for pid in requested
+        ]
+        return Response(
+            {"template_id": template.id, "applied": len(report), "results": results},
+            status=status.HTTP_200_OK,
+        )
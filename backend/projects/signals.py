@@ -1,7 +1,8 @@
+from core.cache import invalidate
 from django.apps import apps
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
-from pipeline.defaults import DEFAULT_STAGES
+from pipeline.templates import create_project_stages
 
 from .models import Project, ProjectMember
 
@@ -20,16 +21,80 @@ def create_default_pipeline_and_owner_membership(
         defaults={"role": ProjectMember.Role.OWNER},
     )
 
-    Stage = apps.get_model("pipeline", "Stage")
-
-    # create default stages
-    for idx, stage_def in enumerate(DEFAULT_STAGES, start=1):
-        Stage.objects.get_or_create(
-            project=instance,
-            system_key=stage_def["system_key"],
-            defaults={
-                "name": stage_def["name"],
-                "order": idx,
-                "is_final": stage_def.get("is_final", False),
-            },
-        )
+    # стадії з default-шаблону пайплайна (pipeline/templates.py) одним bulk_create
+    create_project_stages(instance.id)
+
+
+# --- інвалідація кешу payload-ів проєкту (core/cache.py) ---
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_on_project_change(sender, instance: Project, **kwargs):
+    invalidate("project", instance.id)
+
+
+@receiver(post_save, sender="pipeline.Application")
+@receiver(post_delete, sender="pipeline.Application")
+@receiver(post_save, sender="pipeline.Stage")
+@receiver(post_delete, sender="pipeline.Stage")
+def invalidate_project_on_pipeline_change(sender, instance, **kwargs):
+    invalidate("project", instance.project_id)
+
+
+@receiver(post_save, sender="pipeline.Stage")
+@receiver(post_delete, sender="pipeline.Stage")
+def invalidate_stage_cache_on_stage_change(sender, instance, **kwargs):
+    # in-process кеш стадій (pipeline/stages.py)
+    invalidate("stages", instance.project_id)
+
+
+@receiver(post_save, sender="candidates.Candidate")
+@receiver(post_delete, sender="candidates.Candidate")
+def invalidate_projects_on_candidate_change(sender, instance, **kwargs):
+    # картки кандидата є на дошках усіх його проєктів
+    Application = apps.get_model("pipeline", "Application")
+    project_ids = Application.objects.filter(candidate_id=instance.id).values_list(
+        "project_id", flat=True
+    )
+    invalidate("project", *project_ids)
+
+
+@receiver(m2m_changed, sender="candidates.CandidateSkill")
+def invalidate_projects_on_candidate_skills_change(sender, instance, action, **kwargs):
+    if not action.startswith("post_"):
+        return
+    Application = apps.get_model("pipeline", "Application")
+    Candidate = apps.get_model("candidates", "Candidate")
+    if isinstance(instance, Candidate):
+        apps_qs = Application.objects.filter(candidate_id=instance.id)
+    else:
+        apps_qs = Application.objects.filter(candidate__skills=instance)
+    invalidate("project", *apps_qs.values_list("project_id", flat=True).distinct())
+
+
+# поля користувача, які ProjectOwnerSerializer вбудовує в payload проєкту
+OWNER_PAYLOAD_FIELDS = {"email", "first_name", "last_name", "role", "position", "avatar_url"}
+
+
+@receiver(post_save, sender="users.User")
+def invalidate_projects_on_owner_change(sender, instance, created, update_fields, **kwargs):
+    # новий користувач ще нічим не володіє; login оновлює лише last_login
+    if created or (update_fields is not None and not OWNER_PAYLOAD_FIELDS & set(update_fields)):
+        return
+    invalidate(
+        "project", *Project.objects.filter(owner_id=instance.id).values_list("id", flat=True)
+    )
+
+
+@receiver(post_save, sender="candidates.Skill")
+@receiver(pre_delete, sender="candidates.Skill")
+def invalidate_projects_on_skill_change(sender, instance, **kwargs):
+    # назви навичок є на картках kanban; pre_delete — поки звʼязки з кандидатами ще є
+    Application = apps.get_model("pipeline", "Application")
+    project_ids = (
+        Application.objects.filter(candidate__skills=instance)
+        .values_list("project_id", flat=True)
+        .distinct()
+    )
+    invalidate("project", *project_ids)
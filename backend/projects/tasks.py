@@ -0,0 +1,126 @@
+"""
+Фонові задачі проєктів (jobs/registry.py): CSV import/export.
+"""
+
+import csv
+from datetime import datetime
+from io import StringIO
+
+from jobs.registry import job_handler
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from .models import Project
+
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "status",
+    "location",
+    "is_remote",
+    "department",
+    "deadline",
+    "owner_email",
+    "created_at",
+]
+
+IMPORT_STATUS_MAP = {
+    "IN_PROGRESS": Project.Status.IN_PROGRESS,
+    "PENDING": Project.Status.PENDING,
+    "CLOSED": Project.Status.CLOSED,
+    "В процесі": Project.Status.IN_PROGRESS,
+    "Очікують": Project.Status.PENDING,
+    "Закриті": Project.Status.CLOSED,
+}
+
+
+@job_handler("projects.export")
+def export_projects(ctx) -> dict:
+    """
+    params: {"query": query params запиту /projects/export/} — ті самі права і фільтри,
+    що й у списку проєктів автора задачі.
+    """
+    from .views import ProjectViewSet
+
+    request = Request(APIRequestFactory().get("/api/v1/projects/", ctx.params.get("query", {})))
+    request.user = ctx.job.created_by
+    view = ProjectViewSet(request=request, action="export", kwargs={}, format_kwarg=None)
+    qs = view.filter_queryset(view.get_queryset()).order_by("id")
+
+    total = qs.count()
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(EXPORT_COLUMNS)
+
+    for idx, p in enumerate(qs.iterator(chunk_size=500), start=1):
+        writer.writerow(
+            [
+                p.id,
+                p.title,
+                p.status,
+                p.location,
+                "1" if p.is_remote else "0",
+                p.department,
+                p.deadline.isoformat() if p.deadline else "",
+                p.owner.email if p.owner_id else "",
+                p.created_at.isoformat() if p.created_at else "",
+            ]
+        )
+        ctx.progress(idx, total)
+
+    ctx.save_result_file("projects.csv", output.getvalue())
+    return {"exported": total}
+
+
+@job_handler("projects.import", max_attempts=1)
+def import_projects(ctx) -> dict:
+    """
+    Мінімальний CSV import з ctx.job.input_file; власник проєктів — автор задачі.
+    Один прогін (max_attempts=1): повтор після часткового імпорту створив би дублікати.
+    """
+    with ctx.job.input_file.open("rb") as f:
+        content = f.read().decode("utf-8", errors="ignore")
+    rows = list(csv.DictReader(StringIO(content)))
+
+    created = 0
+    errors = []
+
+    for idx, row in enumerate(rows, start=2):  # 1 — header
+        ctx.progress(idx - 1, len(rows))
+
+        title = (row.get("title") or "").strip()
+        if not title:
+            errors.append({"row": idx, "error": "Missing title"})
+            continue
+
+        status_val = (row.get("status") or Project.Status.IN_PROGRESS).strip()
+        status_val = IMPORT_STATUS_MAP.get(status_val, Project.Status.IN_PROGRESS)
+
+        deadline_raw = (row.get("deadline") or "").strip()
+        deadline = None
+        if deadline_raw:
+            try:
+                deadline = datetime.strptime(deadline_raw, "%Y-%m-%d").date()
+            except ValueError:
+                errors.append(
+                    {
+                        "row": idx,
+                        "error": f"Invalid deadline format: {deadline_raw} (use YYYY-MM-DD)",
+                    }
+                )
+                continue
+
+        Project.objects.create(
+            title=title,
+            description=(row.get("description") or "").strip(),
+            status=status_val,
+            location=(row.get("location") or "").strip(),
+            is_remote=(row.get("is_remote") or "").strip() in ("1", "true", "True", "yes", "так"),
+            department=(row.get("department") or "").strip(),
+            deadline=deadline,
+            owner=ctx.job.created_by,
+        )
+        created += 1
+
+    ctx.progress(len(rows), len(rows), force=True)
+    return {"created": created, "errors": errors}
@@ -1 +1,226 @@
-# Create your tests here.
+from candidates.models import Candidate, Skill
+from core.cache import cache_stats, payload_cache
+from core.models import CacheGeneration
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from pipeline.models import Application, Stage
+from pipeline.positions import renumber_stage
+from rest_framework.test import APIClient
+from users.models import User
+
+from .models import Project, ProjectMember
+
+
+class ProjectPageTests(TestCase):
+    """
+    /projects/{id}/page/ збирає секції сторінки проєкту з тих самих payload-ів,
+    що й окремі ендпоінти, з одним пошуком проєкту і однією перевіркою прав.
+    """
+
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        self.user = User.objects.create_user(email="rec@example.com", role=User.Role.RECRUITER)
+        self.project = Project.objects.create(title="Backend", owner=owner)
+        ProjectMember.objects.create(
+            project=self.project, user=self.user, role=ProjectMember.Role.VIEWER
+        )
+        stage = Stage.objects.get(project=self.project, system_key="new")
+        for idx in range(3):
+            candidate = Candidate.objects.create(
+                first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com"
+            )
+            Application.objects.create(
+                project=self.project, candidate=candidate, current_stage=stage
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/v1/projects/{self.project.id}/"
+
+    def project_lookups(self, ctx) -> int:
+        return sum(
+            q["sql"].startswith('SELECT DISTINCT "projects_project"') for q in ctx.captured_queries
+        )
+
+    def test_page_matches_separate_endpoints(self):
+        separate = {
+            "detail": self.client.get(self.url).json(),
+            "summary": self.client.get(self.url + "summary/").json(),
+            "kanban": self.client.get(self.url + "kanban/").json(),
+            "members": self.client.get(self.url + "members/").json(),
+        }
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url + "page/")
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        for section, payload in separate.items():
+            self.assertEqual(data[section], payload, section)
+        self.assertEqual(data["summary"]["total_candidates"], 3)
+        self.assertEqual(data["permissions"], {"read": True, "write": False, "manage": False})
+        self.assertEqual(self.project_lookups(ctx), 1)
+
+        response = self.client.get(self.url + "page/", {"include": "summary,members"})
+        self.assertEqual(set(response.json()), {"project_id", "summary", "members"})
+        etag = response["ETag"]
+        response = self.client.get(
+            self.url + "page/", {"include": "summary,members"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(self.url + "page/", {"include": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_demoted_member_revalidates_permissions(self):
+        owner = User.objects.get(email="hr@example.com")
+        membership = ProjectMember.objects.get(project=self.project, user=self.user)
+        membership.role = ProjectMember.Role.RECRUITER
+        membership.save()
+
+        response = self.client.get(self.url + "page/", {"include": "permissions,summary"})
+        self.assertTrue(response.json()["permissions"]["write"])
+        etag = response["ETag"]
+        summary_etag = self.client.get(self.url + "summary/")["ETag"]
+
+        self.client.force_authenticate(owner)
+        response = self.client.patch(
+            self.url + f"members/{membership.id}/", {"role": ProjectMember.Role.VIEWER}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            self.url + "page/", {"include": "permissions,summary"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["permissions"]["write"])
+        response = self.client.get(self.url + "summary/", HTTP_IF_NONE_MATCH=summary_etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_page_requires_membership(self):
+        outsider = User.objects.create_user(email="o@example.com", role=User.Role.RECRUITER)
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self.client.get(self.url + "page/").status_code, 404)
+
+
+class PayloadCacheTests(TestCase):
+    """
+    Payload-и проєкту кешуються в процесі, а generation у БД інвалідовує їх
+    для всіх процесів при зміні проєкту, власника, навичок чи порядку карток.
+    """
+
+    def setUp(self):
+        payload_cache().clear()
+        self.owner = User.objects.create_user(
+            email="hr@example.com", role=User.Role.HR_MANAGER, first_name="Olena"
+        )
+        self.project = Project.objects.create(title="Backend", owner=self.owner)
+        self.stage = Stage.objects.get(project=self.project, system_key="new")
+        self.skill = Skill.objects.create(name="Python")
+        candidate = Candidate.objects.create(first_name="Ivan", last_name="P", email="i@x.com")
+        candidate.skills.add(self.skill)
+        self.application = Application.objects.create(
+            project=self.project, candidate=candidate, current_stage=self.stage
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f"/api/v1/projects/{self.project.id}/"
+
+    def kanban_cards(self) -> list:
+        data = self.client.get(self.url + "kanban/").json()
+        return [card for stage in data["stages"] for card in stage["applications"]]
+
+    def test_hit_and_cross_process_invalidation(self):
+        self.client.get(self.url + "kanban/")
+        hits = cache_stats().get("kanban", {}).get("hits", 0)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url + "kanban/")
+        self.assertEqual(cache_stats()["kanban"]["hits"], hits + 1)
+        self.assertFalse(any("pipeline_application" in q["sql"] for q in ctx.captured_queries))
+
+        # інший процес змінив дані і підняв generation: локальний payload уже не читається
+        Application.objects.filter(id=self.application.id).update(is_archived=True)
+        CacheGeneration.objects.filter(scope="project", obj_id=self.project.id).update(
+            value=F("value") + 1
+        )
+        self.assertEqual(self.kanban_cards(), [])
+
+    def test_owner_skill_and_renumber_bust_payload(self):
+        self.assertEqual(self.client.get(self.url).json()["owner"]["display_name"], "Olena")
+        self.owner.first_name = "Oksana"
+        self.owner.save()
+        self.assertEqual(self.client.get(self.url).json()["owner"]["display_name"], "Oksana")
+
+        self.assertIn("Python", str(self.kanban_cards()))
+        self.skill.name = "Go"
+        self.skill.save()
+        self.assertIn("Go", str(self.kanban_cards()))
+
+        # update() без сигналів: дошка з кешу ще показує стару позицію
+        Application.objects.filter(id=self.application.id).update(position_in_stage=7)
+        self.assertEqual(self.kanban_cards()[0]["position_in_stage"], 0)
+        renumber_stage(self.stage)
+        self.assertEqual(self.kanban_cards()[0]["position_in_stage"], 1)
+
+
+class ColumnarFormatTests(TestCase):
+    """
+    ?format=columnar: ті самі дані, що й у JSON, але колонками і зі словником навичок.
+    """
+
+    def setUp(self):
+        payload_cache().clear()
+        user = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        self.project = Project.objects.create(title="Backend", owner=user)
+        stage = Stage.objects.get(project=self.project, system_key="new")
+        skills = [Skill.objects.create(name=name) for name in ("Go", "React")]
+        for idx, names in enumerate((skills, skills[:1])):
+            candidate = Candidate.objects.create(
+                first_name="Cand", last_name=str(idx), email=f"c{idx}@x.com"
+            )
+            candidate.skills.set(names)
+            Application.objects.create(
+                project=self.project, candidate=candidate, current_stage=stage
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_kanban_columns_match_json(self):
+        url = f"/api/v1/projects/{self.project.id}/kanban/"
+        plain = self.client.get(url).json()
+        response = self.client.get(url, {"format": "columnar"})
+        self.assertEqual(response["Content-Type"], "application/vnd.nexo.columnar+json")
+        data = response.json()
+
+        self.assertEqual(len(data["stages"]), len(plain["stages"]))
+        for stage, plain_stage in zip(data["stages"], plain["stages"], strict=True):
+            table = stage["applications"]
+            cards = plain_stage["applications"]
+            self.assertEqual(table["length"], len(cards))
+            if not cards:
+                # порожня колонка — без стовпців, а не з порожніми списками
+                self.assertEqual(table["columns"], {})
+                continue
+            columns = table["columns"]
+            self.assertEqual(columns["id"], [card["id"] for card in cards])
+            self.assertEqual(
+                columns["candidate.full_name"], [card["candidate"]["full_name"] for card in cards]
+            )
+            self.assertEqual(
+                [[data["skills"][i] for i in refs] for refs in columns["candidate.skills"]],
+                [card["candidate"]["skills"] for card in cards],
+            )
+        self.assertTrue(any(s["applications"]["length"] == 0 for s in data["stages"]))
+        self.assertEqual(sorted(data["skills"]), ["Go", "React"])
+
+    def test_candidate_list_columns(self):
+        response = self.client.get("/api/v1/candidates/", {"format": "columnar"})
+        data = response.json()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(data["results"]["length"], 2)
+        self.assertEqual(len(data["results"]["columns"]["email"]), 2)
+        self.assertIn("skills", data)
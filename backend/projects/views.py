@@ -1,18 +1,38 @@
 # Create your views here.
-import csv
-from datetime import datetime
-from io import StringIO
 
+from core.cache import cached_payload, get_generation, invalidate
+from core.columnar import ColumnarMixin, kanban_to_columnar
+from core.conditional import ConditionalGetMixin, queryset_fingerprint
+from core.timing import ServerTimingMixin
 from django.db import transaction
 from django.db.models import Count, Q
-from django.http import HttpResponse
+from jobs.queue import enqueue
+from jobs.views import job_accepted
+from pipeline.history import build_board_at
 from pipeline.models import Application, Stage
 from pipeline.permissions import CanWriteProjectPipeline
-from pipeline.serializers import ApplicationCardSerializer, KanbanReorderSerializer
+from pipeline.positions import (
+    StageConflict,
+    apply_moves,
+    bump_versions,
+    conflict_payload,
+    current_versions,
+    ensure_positions_reserved,
+    expected_versions,
+    stage_tag,
+)
+from pipeline.serializers import (
+    APPLICATION_CARD_VALUES,
+    BoardAtQuerySerializer,
+    KanbanReorderSerializer,
+    application_cards,
+)
+from pipeline.stages import project_stages, resolve_stage
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from users.bootstrap import project_permissions
 
 from .filters import ProjectFilter
 from .models import Project, ProjectMember
@@ -27,35 +47,39 @@ from .serializers import (
 )
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ServerTimingMixin, ConditionalGetMixin, ColumnarMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     filterset_class = ProjectFilter
     search_fields = ["title", "description", "location", "department"]
     ordering_fields = ["created_at", "deadline", "title", "status"]
     ordering = ["-created_at"]
 
+    # дії, яким не потрібні count-анотації (retrieve бере їх лише при cache miss)
+    UNANNOTATED_ACTIONS = (
+        "retrieve",
+        "summary",
+        "kanban",
+        "page",
+        "kanban_history",
+        "kanban_reorder",
+        "members",
+        "member_detail",
+    )
+
+    # дії з колонковим форматом (?format=columnar, core/columnar.py)
+    columnar_actions = ("kanban", "page")
+
+    # секції для /projects/{id}/page/?include=...
+    PAGE_SECTIONS = ("detail", "permissions", "summary", "kanban", "members")
+
     def get_queryset(self):
-        user = self.request.user
+        qs = Project.objects.all().select_related("owner")
+        if self.action not in self.UNANNOTATED_ACTIONS:
+            qs = self.annotate_counts(qs)
+        return self.limit_to_visible(qs)
 
-        qs = (
-            Project.objects.all()
-            .select_related("owner")
-            .annotate(
-                candidates_count=Count(
-                    "applications",
-                    filter=Q(applications__is_archived=False),
-                    distinct=True,
-                ),
-                new_count=Count(
-                    "applications",
-                    filter=Q(
-                        applications__is_archived=False,
-                        applications__current_stage__system_key="new",
-                    ),
-                    distinct=True,
-                ),
-            )
-        )
+    def limit_to_visible(self, qs):
+        user = self.request.user
 
         # ADMIN/HR бачать все, інші — тільки свої (учасник)
         if user.is_superuser or getattr(user, "role", None) in ("ADMIN", "HR_MANAGER"):
@@ -63,6 +87,68 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         return qs.filter(memberships__user=user).distinct()
 
+    @staticmethod
+    def annotate_counts(qs):
+        return qs.annotate(
+            candidates_count=Count(
+                "applications",
+                filter=Q(applications__is_archived=False),
+                distinct=True,
+            ),
+            new_count=Count(
+                "applications",
+                filter=Q(
+                    applications__is_archived=False,
+                    applications__current_stage__system_key="new",
+                ),
+                distinct=True,
+            ),
+        )
+
+    def get_object(self):
+        # get_validator() і сама дія беруть той самий проєкт: один запит і одна перевірка прав
+        if getattr(self, "_object", None) is None:
+            self._object = super().get_object()
+        return self._object
+
+    def get_validator(self, request):
+        if self.action == "page":
+            project = self.get_object()
+            sections = self.page_sections()
+            members = role = None
+            if "members" in sections:
+                members = queryset_fingerprint(ProjectMember.objects.filter(project=project))
+            if "permissions" in sections:
+                # make_etag бачить лише глобальну роль; роль у проєкті — тут
+                role = self.member_role(project)
+            return (sections, project.id, get_generation("project", project.id), members, role)
+
+        if self.action in ("retrieve", "summary", "kanban"):
+            # ті самі generation-лічильники, що й у кеші payload-ів
+            project = self.get_object()
+            return (self.action, project.id, get_generation("project", project.id))
+
+        if self.action == "members":
+            project = self.get_object()
+            return queryset_fingerprint(ProjectMember.objects.filter(project=project))
+
+        if self.action in ("list", "stats"):
+            project_ids = self.limit_to_visible(Project.objects.all()).values("id")
+            return (
+                queryset_fingerprint(Project.objects.filter(id__in=project_ids)),
+                queryset_fingerprint(Application.objects.filter(project_id__in=project_ids)),
+            )
+
+        return None
+
+    def cache_variant(self) -> str:
+        # payload однаковий для всіх, хто пройшов перевірку доступу,
+        # але ключ розділяємо за scope видимості
+        user = self.request.user
+        if user.is_superuser or getattr(user, "role", None) in ("ADMIN", "HR_MANAGER"):
+            return "all"
+        return "member"
+
     def get_permissions(self):
         if self.action == "create":
             return [IsAuthenticated(), CanCreateProject()]
@@ -70,7 +156,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if self.action in ("update", "partial_update", "destroy"):
             return [IsAuthenticated(), IsProjectOwnerOrAdminHR()]
 
-        if self.action in ("retrieve", "summary", "members"):
+        if self.action in ("retrieve", "summary", "members", "kanban_history", "page"):
             return [IsAuthenticated(), IsProjectMemberOrAdminHR()]
 
         # list, stats, export, import — фільтруються queryset-ом; доступ лише authenticated
@@ -83,6 +169,18 @@ class ProjectViewSet(viewsets.ModelViewSet):
             return ProjectDetailSerializer
         return ProjectListSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.detail_payload(self.get_object()))
+
+    def detail_payload(self, project) -> dict:
+        def build():
+            annotated = self.annotate_counts(
+                Project.objects.filter(pk=project.pk).select_related("owner")
+            ).get()
+            return ProjectDetailSerializer(annotated).data
+
+        return cached_payload("project", project.id, "detail", self.cache_variant(), build)
+
     @action(detail=False, methods=["get"], url_path="stats")
     def stats(self, request):
         """
@@ -105,26 +203,33 @@ class ProjectViewSet(viewsets.ModelViewSet):
         """
         Для верхнього рядка в Project view: кількість кандидатів у кожній стадії.
         """
-        project = self.get_object()
-
-        stages = (
-            Stage.objects.filter(project=project)
-            .annotate(
-                candidates_count=Count(
-                    "applications",
-                    filter=Q(applications__is_archived=False),
-                    distinct=True,
+        return Response(self.summary_payload(self.get_object()))
+
+    def summary_payload(self, project, kanban=None) -> dict:
+        def build():
+            if kanban is not None:
+                # дошка вже порахована (page) — лічильники беремо з її колонок
+                counts = {s["id"]: s["candidates_count"] for s in kanban["stages"]}
+            else:
+                # лічильники — один GROUP BY по індексу дошки
+                counts = dict(
+                    Application.objects.filter(project=project, is_archived=False)
+                    .order_by()
+                    .values("current_stage_id")
+                    .annotate(total=Count("id"))
+                    .values_list("current_stage_id", "total")
                 )
-            )
-            .order_by("order", "id")
-        )
+            # стадії — з in-process кешу
+            stages = project_stages(project.id)
+            for stage in stages:
+                stage.candidates_count = counts.get(stage.id, 0)
+            return {
+                "project_id": project.id,
+                "stages": StageSummarySerializer(stages, many=True).data,
+                "total_candidates": sum(counts.values()),
+            }
 
-        data = {
-            "project_id": project.id,
-            "stages": StageSummarySerializer(stages, many=True).data,
-            "total_candidates": project.applications.filter(is_archived=False).count(),
-        }
-        return Response(data)
+        return cached_payload("project", project.id, "summary", self.cache_variant(), build)
 
     @action(detail=True, methods=["get"], url_path="kanban")
     def kanban(self, request, pk=None):
@@ -132,19 +237,33 @@ class ProjectViewSet(viewsets.ModelViewSet):
         Повертає дані для Kanban дошки:
         stages[] + applications[] у кожній колонці.
         """
-        project = self.get_object()
+        return Response(self.kanban_payload(self.get_object()))
+
+    def kanban_payload(self, project) -> dict:
+        columnar = self.wants_columnar()
+
+        def build():
+            data = self.build_kanban(project)
+            return kanban_to_columnar(data) if columnar else data
 
+        section = "kanban:columnar" if columnar else "kanban"
+        return cached_payload("project", project.id, section, self.cache_variant(), build)
+
+    @staticmethod
+    def build_kanban(project) -> dict:
         stages = Stage.objects.filter(project=project).order_by("order", "id")
-        apps = (
+        apps = application_cards(
             Application.objects.filter(project=project, is_archived=False)
-            .select_related("candidate", "current_stage")
-            .prefetch_related("candidate__skills")
-            .order_by("current_stage__order", "position_in_stage", "-updated_at", "id")
+            # групуємо по колонках нижче, тож порядок стадій тут не потрібен —
+            # сортування повністю покривається індексом app_active_board_idx
+            .order_by("current_stage_id", "position_in_stage", "-updated_at", "id").values(
+                *APPLICATION_CARD_VALUES
+            )
         )
 
         stage_map = {s.id: [] for s in stages}
-        for app in apps:
-            stage_map.setdefault(app.current_stage_id, []).append(app)
+        for card in apps:
+            stage_map.setdefault(card["current_stage_id"], []).append(card)
 
         result_stages = []
         for stage in stages:
@@ -156,18 +275,35 @@ class ProjectViewSet(viewsets.ModelViewSet):
                     "system_key": stage.system_key,
                     "order": stage.order,
                     "is_final": stage.is_final,
+                    "version": stage.version,
                     "candidates_count": len(items),
-                    "applications": ApplicationCardSerializer(items, many=True).data,
+                    "applications": items,
                 }
             )
 
-        return Response({"project_id": project.id, "stages": result_stages})
+        return {"project_id": project.id, "stages": result_stages}
+
+    @action(detail=True, methods=["get"], url_path=r"kanban/history")
+    def kanban_history(self, request, pk=None):
+        """
+        Дошка на довільний момент у минулому: ?at=2025-01-31T23:59:59Z
+        Відновлюється з найближчого BoardSnapshot + replay StageChangeEvent.
+        """
+        project = self.get_object()
+
+        serializer = BoardAtQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        return Response(build_board_at(project, serializer.validated_data["at"]))
 
     @action(detail=True, methods=["post"], url_path=r"kanban/reorder")
     def kanban_reorder(self, request, pk=None):
         """
         Оновлює position_in_stage для карток у конкретній колонці.
         body: { "stage_id": <id>, "ordered_application_ids": [..] }
+          або delta: { "stage_id": <id>, "moves": [{"application_id": <id>, "after_id": <id|null>}] }
+        If-Match: "stage-<id>-v<version>" (version з kanban) — якщо колонка змінилась,
+        409 з поточним порядком замість тихого перезапису. Пишуться лише змінені позиції.
         """
         project = self.get_object()
 
@@ -179,23 +315,63 @@ class ProjectViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         stage_id = serializer.validated_data["stage_id"]
-        ordered_ids = serializer.validated_data["ordered_application_ids"]
+        ordered_ids = serializer.validated_data.get("ordered_application_ids")
+        moves = serializer.validated_data.get("moves")
 
-        stage = Stage.objects.filter(project=project, id=stage_id).first()
+        stage = resolve_stage(project.id, stage_id=stage_id)
         if not stage:
             return Response(
                 {"detail": "Stage not found in this project"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        qs = Application.objects.filter(
-            project=project, current_stage=stage, is_archived=False
-        ).order_by("position_in_stage", "id")
-        apps = list(qs)
-        apps_by_id = {a.id: a for a in apps}
+        def column_positions() -> dict:
+            return dict(
+                Application.objects.filter(project=project, current_stage=stage, is_archived=False)
+                .order_by("position_in_stage", "-updated_at", "id")
+                .values_list("id", "position_in_stage")
+            )
+
+        def conflict():
+            # rebase: актуальний порядок + різниця складу з тим, що бачив клієнт
+            current = list(column_positions())
+            # ordered_application_ids=[] — валідний повний список (порожня колонка)
+            seen = set(
+                ordered_ids if ordered_ids is not None else [m["application_id"] for m in moves]
+            )
+            payload = conflict_payload(
+                [stage.id],
+                stage_id=stage.id,
+                ordered_application_ids=current,
+                removed=sorted(seen.difference(current)),
+            )
+            if ordered_ids is not None:
+                payload["added"] = [aid for aid in current if aid not in seen]
+            return Response(payload, status=status.HTTP_409_CONFLICT)
+
+        # version не кешується — застарілий If-Match ловить compare-and-set нижче
+        expected = expected_versions(request)
+
+        positions = column_positions()
+        current_ids = list(positions)
+
+        if moves is not None:
+            final_ids, invalid = apply_moves(current_ids, moves)
+        else:
+            # validate ids belong to this stage
+            invalid = [aid for aid in ordered_ids if aid not in positions]
+
+            # ensure uniqueness
+            unique_ordered = list(dict.fromkeys(ordered_ids))
+            seen = set(unique_ordered)
+            final_ids = unique_ordered + [aid for aid in current_ids if aid not in seen]
 
-        # validate ids belong to this stage
-        invalid = [aid for aid in ordered_ids if aid not in apps_by_id]
         if invalid:
+            # клієнт міг бачити стару колонку — тоді це конфлікт, а не помилка запиту
+            if (
+                stage.id in expected
+                and expected[stage.id] != current_versions([stage.id])[stage.id]
+            ):
+                return conflict()
             return Response(
                 {
                     "detail": "Some application ids do not belong to this stage",
@@ -204,24 +380,36 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # ensure uniqueness
-        seen = set()
-        unique_ordered = []
-        for aid in ordered_ids:
-            if aid in seen:
-                continue
-            seen.add(aid)
-            unique_ordered.append(aid)
-
-        remaining = [a.id for a in apps if a.id not in seen]
-        final_ids = unique_ordered + remaining
-
-        with transaction.atomic():
-            for idx, aid in enumerate(final_ids, start=1):
-                Application.objects.filter(id=aid).update(position_in_stage=idx)
-
+        changed = [
+            Application(id=aid, position_in_stage=idx)
+            for idx, aid in enumerate(final_ids, start=1)
+            if positions[aid] != idx
+        ]
+
+        try:
+            with transaction.atomic():
+                # compare-and-set версії: паралельний reorder між читанням і записом → 409
+                bump_versions([stage.id], expected)
+                if changed:
+                    Application.objects.bulk_update(changed, ["position_in_stage"])
+                # наступні create/move мають ставати після перенумерованої колонки
+                ensure_positions_reserved(stage.id, len(final_ids))
+        except StageConflict:
+            return conflict()
+
+        # bulk_update не шле сигналів — інвалідовуємо вручну
+        invalidate("project", project.id)
+
+        version = current_versions([stage.id])[stage.id]
         return Response(
-            {"stage_id": stage.id, "ordered_application_ids": final_ids}, status=status.HTTP_200_OK
+            {
+                "stage_id": stage.id,
+                "ordered_application_ids": final_ids,
+                "updated": len(changed),
+                "version": version,
+                "etag": stage_tag(stage.id, version),
+            },
+            status=status.HTTP_200_OK,
         )
 
     @action(detail=True, methods=["get", "post"], url_path="members")
@@ -233,10 +421,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         project = self.get_object()
 
         if request.method == "GET":
-            memberships = (
-                ProjectMember.objects.filter(project=project).select_related("user").order_by("id")
-            )
-            return Response(ProjectMemberSerializer(memberships, many=True).data)
+            return Response(self.members_payload(project))
 
         # POST
         # Тільки owner/admin/hr
@@ -259,9 +444,76 @@ class ProjectViewSet(viewsets.ModelViewSet):
             # якщо існує — оновимо роль
             member.role = role
             member.save()
+        # payload-и кешуються по варіантах доступу (member/global) — інвалідовуємо
+        invalidate("project", project.id)
 
         return Response(ProjectMemberSerializer(member).data, status=status.HTTP_201_CREATED)
 
+    @staticmethod
+    def members_payload(project) -> list:
+        memberships = (
+            ProjectMember.objects.filter(project=project).select_related("user").order_by("id")
+        )
+        return ProjectMemberSerializer(memberships, many=True).data
+
+    def has_global_access(self) -> bool:
+        user = self.request.user
+        return bool(user.is_superuser or getattr(user, "role", None) in ("ADMIN", "HR_MANAGER"))
+
+    def member_role(self, project):
+        # одним запитом і для ETag (get_validator), і для секції permissions
+        if self.has_global_access():
+            return None
+        if not hasattr(self, "_member_role"):
+            self._member_role = (
+                ProjectMember.objects.filter(project=project, user=self.request.user)
+                .values_list("role", flat=True)
+                .first()
+            )
+        return self._member_role
+
+    def permissions_payload(self, project) -> dict:
+        return project_permissions(
+            self.has_global_access(),
+            self.member_role(project),
+            project.owner_id == self.request.user.id,
+        )
+
+    def page_sections(self) -> tuple:
+        raw = self.request.query_params.get("include")
+        if not raw:
+            return self.PAGE_SECTIONS
+        requested = {part.strip() for part in raw.split(",") if part.strip()}
+        return tuple(name for name in self.PAGE_SECTIONS if name in requested)
+
+    @action(detail=True, methods=["get"], url_path="page")
+    def page(self, request, pk=None):
+        """
+        Сторінка проєкту одним запитом: ?include=detail,permissions,summary,kanban,members
+        (без include — усі секції). Проєкт, перевірка прав і стадії — спільні для секцій.
+        """
+        raw = request.query_params.get("include")
+        sections = self.page_sections()
+        if raw and not sections:
+            return Response(
+                {"detail": f"include: expected any of {', '.join(self.PAGE_SECTIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        project = self.get_object()
+        data = {"project_id": project.id}
+        if "detail" in sections:
+            data["detail"] = self.detail_payload(project)
+        if "permissions" in sections:
+            data["permissions"] = self.permissions_payload(project)
+        if "kanban" in sections:
+            data["kanban"] = self.kanban_payload(project)
+        if "summary" in sections:
+            data["summary"] = self.summary_payload(project, kanban=data.get("kanban"))
+        if "members" in sections:
+            data["members"] = self.members_payload(project)
+        return Response(data)
+
     @action(detail=True, methods=["patch", "delete"], url_path=r"members/(?P<member_id>\d+)")
     def member_detail(self, request, pk=None, member_id=None):
         """
@@ -291,6 +543,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         if request.method == "DELETE":
             membership.delete()
+            invalidate("project", project.id)
             return Response(status=status.HTTP_204_NO_CONTENT)
 
         # PATCH: оновити роль
@@ -300,55 +553,28 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         membership.role = role
         membership.save()
+        invalidate("project", project.id)
         return Response(ProjectMemberSerializer(membership).data)
 
     @action(detail=False, methods=["get"], url_path="export")
     def export(self, request):
         """
-        CSV export проєктів (з урахуванням прав і фільтрів).
+        CSV export проєктів (з урахуванням прав і фільтрів) — фоновою задачею.
+        202 + job; файл: GET /jobs/{id}/result/ (projects/tasks.py).
         """
-        qs = self.filter_queryset(self.get_queryset()).order_by("id")
-
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            [
-                "id",
-                "title",
-                "status",
-                "location",
-                "is_remote",
-                "department",
-                "deadline",
-                "owner_email",
-                "created_at",
-            ]
+        job = enqueue(
+            "projects.export",
+            params={"query": dict(request.query_params.lists())},
+            user=request.user,
         )
-
-        for p in qs:
-            writer.writerow(
-                [
-                    p.id,
-                    p.title,
-                    p.status,
-                    p.location,
-                    "1" if p.is_remote else "0",
-                    p.department,
-                    p.deadline.isoformat() if p.deadline else "",
-                    p.owner.email if p.owner_id else "",
-                    p.created_at.isoformat() if p.created_at else "",
-                ]
-            )
-
-        resp = HttpResponse(output.getvalue(), content_type="text/csv; charset=utf-8")
-        resp["Content-Disposition"] = 'attachment; filename="projects.csv"'
-        return resp
+        return job_accepted(job)
 
     @action(detail=False, methods=["post"], url_path="import")
     def import_projects(self, request):
         """
-        Мінімальний CSV import.
-        Очікує multipart/form-data з файлом у полі "file".
+        Мінімальний CSV import — фоновою задачею.
+        Очікує multipart/form-data з файлом у полі "file"; 202 + job,
+        підсумок {"created", "errors"} — у result задачі.
         """
         if "file" not in request.FILES:
             return Response(
@@ -359,56 +585,5 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if not CanCreateProject().has_permission(request, self):
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
-        f = request.FILES["file"]
-        content = f.read().decode("utf-8", errors="ignore")
-        reader = csv.DictReader(StringIO(content))
-
-        status_map = {
-            "IN_PROGRESS": Project.Status.IN_PROGRESS,
-            "PENDING": Project.Status.PENDING,
-            "CLOSED": Project.Status.CLOSED,
-            "В процесі": Project.Status.IN_PROGRESS,
-            "Очікують": Project.Status.PENDING,
-            "Закриті": Project.Status.CLOSED,
-        }
-
-        created = 0
-        errors = []
-
-        for idx, row in enumerate(reader, start=2):  # 1 — header
-            title = (row.get("title") or "").strip()
-            if not title:
-                errors.append({"row": idx, "error": "Missing title"})
-                continue
-
-            status_val = (row.get("status") or Project.Status.IN_PROGRESS).strip()
-            status_val = status_map.get(status_val, Project.Status.IN_PROGRESS)
-
-            deadline_raw = (row.get("deadline") or "").strip()
-            deadline = None
-            if deadline_raw:
-                try:
-                    deadline = datetime.strptime(deadline_raw, "%Y-%m-%d").date()
-                except ValueError:
-                    errors.append(
-                        {
-                            "row": idx,
-                            "error": f"Invalid deadline format: {deadline_raw} (use YYYY-MM-DD)",
-                        }
-                    )
-                    continue
-
-            Project.objects.create(
-                title=title,
-                description=(row.get("description") or "").strip(),
-                status=status_val,
-                location=(row.get("location") or "").strip(),
-                is_remote=(row.get("is_remote") or "").strip()
-                in ("1", "true", "True", "yes", "так"),
-                department=(row.get("department") or "").strip(),
-                deadline=deadline,
-                owner=request.user,
-            )
-            created += 1
-
-        return Response({"created": created, "errors": errors}, status=status.HTTP_200_OK)
+        job = enqueue("projects.import", user=request.user, input_file=request.FILES["file"])
+        return job_accepted(job)
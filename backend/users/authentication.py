@@ -0,0 +1,51 @@
+"""
+JWT-автентифікація без SELECT users_user на кожен запит.
+
+request.user — ClaimsUser з claims токена (id, email, role, is_superuser, is_staff).
+Claim "ver" (User.token_version) звіряємо з in-process TTL-кешем рядків
+(users/cache.py): після зміни ролі/прав чи деактивації старі access-токени
+відхиляються не пізніше ніж за USER_CACHE_TTL_SECONDS. Фронт отримує
+token_not_valid і оновлює токен через auth/refresh/ — вже з новими claims.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import user_row
+from .models import ClaimsUser
+
+TOKEN_VERSION_CLAIM = "ver"
+
+
+def token_claims(user) -> dict:
+    return {
+        "email": user.email,
+        "role": user.role,
+        "is_superuser": user.is_superuser,
+        "is_staff": user.is_staff,
+        TOKEN_VERSION_CLAIM: user.token_version,
+    }
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            # токени, видані до появи claims, — звичайний шлях із запитом
+            return super().get_user(validated_token)
+
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        row = user_row(user_id)
+        if row is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not row["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if row["token_version"] != validated_token[TOKEN_VERSION_CLAIM]:
+            raise InvalidToken(_("Token is outdated"))
+
+        return ClaimsUser.from_claims(user_id, validated_token)
@@ -0,0 +1,79 @@
+"""
+Payload для auth/bootstrap/: профіль, учасництво в проєктах з матрицею прав
+і глобальні можливості ролі — одним запитом до БД (профіль — з claims і кешу).
+
+Права рахуються за тими самими правилами, що й permission-класи:
+read — IsProjectMemberOrAdminHR, write — CanWriteProjectPipeline,
+manage — IsProjectOwnerOrAdminHR; capabilities — викликом самих класів.
+"""
+
+from candidates.permissions import CanWriteCandidates
+from django.db.models import OuterRef, Q, Subquery
+from projects.models import Project, ProjectMember
+from projects.permissions import CanCreateProject
+
+from .permissions import IsAdminOrHRRole, IsAdminRole
+from .serializers import UserMeSerializer
+
+CAPABILITIES = {
+    "create_projects": CanCreateProject,
+    "write_candidates": CanWriteCandidates,
+    "manage_users": IsAdminOrHRRole,
+    "create_users": IsAdminRole,
+    "manage_pipeline_templates": IsAdminOrHRRole,
+    "run_jobs": IsAdminOrHRRole,
+}
+
+
+def project_permissions(global_access: bool, member_role, is_owner: bool) -> dict:
+    return {
+        "read": global_access or member_role is not None,
+        "write": global_access
+        or (member_role is not None and member_role != ProjectMember.Role.VIEWER),
+        "manage": global_access or is_owner,
+    }
+
+
+def build_bootstrap(request, view) -> dict:
+    user = request.user
+    global_access = bool(
+        user.is_superuser or getattr(user, "role", None) in ("ADMIN", "HR_MANAGER")
+    )
+
+    member_role = ProjectMember.objects.filter(project=OuterRef("pk"), user=user).values("role")[:1]
+    rows = (
+        Project.objects.filter(
+            Q(id__in=ProjectMember.objects.filter(user=user).values("project_id")) | Q(owner=user)
+        )
+        .annotate(member_role=Subquery(member_role))
+        .order_by("id")
+        .values_list("id", "title", "status", "owner_id", "member_role")
+    )
+
+    memberships = []
+    for project_id, title, project_status, owner_id, role in rows:
+        is_owner = owner_id == user.id
+        memberships.append(
+            {
+                "project_id": project_id,
+                "title": title,
+                "status": project_status,
+                "role": role,
+                "is_owner": is_owner,
+                "permissions": project_permissions(global_access, role, is_owner),
+            }
+        )
+
+    capabilities = {
+        name: permission().has_permission(request, view)
+        for name, permission in CAPABILITIES.items()
+    }
+    capabilities["view_all_projects"] = global_access
+
+    return {
+        "user": UserMeSerializer(user).data,
+        "capabilities": capabilities,
+        # права на проєкти поза memberships (ADMIN/HR бачать усі)
+        "project_defaults": project_permissions(global_access, None, False),
+        "memberships": memberships,
+    }
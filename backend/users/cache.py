@@ -0,0 +1,50 @@
+"""
+In-process TTL-кеш рядків користувачів для автентифікації без запиту до БД
+(users/authentication.py) і для ClaimsUser, якому потрібні поля поза claims.
+
+Зміни через User.save() у цьому процесі скидають запис одразу (users/signals.py),
+інші процеси побачать їх не пізніше ніж за USER_CACHE_TTL_SECONDS.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+
+from .models import User
+
+FIELDS = tuple(field.attname for field in User._meta.concrete_fields)
+
+_lock = threading.Lock()
+# user_id -> (expires_at monotonic, рядок або None, якщо користувача немає)
+_entries: dict[int, tuple[float, dict | None]] = {}
+_forgets = 0
+
+
+def user_row(user_id) -> dict | None:
+    now = time.monotonic()
+    entry = _entries.get(user_id)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    forgets = _forgets
+    row = User.objects.filter(id=user_id).values(*FIELDS).first()
+    with _lock:
+        # forget_user() між запитом і записом — рядок міг застаріти, не кешуємо
+        if forgets == _forgets:
+            if len(_entries) >= settings.USER_CACHE_MAX_ENTRIES:
+                _entries.clear()
+            _entries[user_id] = (now + settings.USER_CACHE_TTL_SECONDS, row)
+    return row
+
+
+def forget_user(user_id) -> None:
+    global _forgets
+    with _lock:
+        _forgets += 1
+        _entries.pop(user_id, None)
+
+
+def clear_user_cache() -> None:
+    with _lock:
+        _entries.clear()
@@ -1,5 +1,5 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models
 from django.utils.translation import gettext_lazy as _
 
 
@@ -54,6 +54,8 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=Role.choices, default=Role.RECRUITER)
     position = models.CharField(max_length=100, blank=True, default="")
     avatar_url = models.URLField(blank=True, default="")
+    # росте при зміні ролі/прав/активності: старі access-токени стають недійсними
+    token_version = models.PositiveIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []
@@ -67,3 +69,44 @@ class User(AbstractUser):
 
     def __str__(self) -> str:
         return self.email
+
+
+class ClaimsUser(User):
+    """
+    Користувач, зібраний з claims access-токена (users/authentication.py) без запиту до БД.
+
+    Поля поза claims — deferred: перше звернення до будь-якого з них бере
+    повний рядок з TTL-кешу (users/cache.py). Для FK і фільтрів поводиться як User.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, user_id: int, claims) -> "ClaimsUser":
+        known = {
+            "id": user_id,
+            "email": claims["email"],
+            "role": claims["role"],
+            "is_superuser": claims["is_superuser"],
+            "is_staff": claims["is_staff"],
+            "token_version": claims["ver"],
+            # неактивних відсіює автентифікація
+            "is_active": True,
+        }
+        # from_db очікує значення в порядку полів моделі
+        names = [f.attname for f in cls._meta.concrete_fields if f.attname in known]
+        return cls.from_db(DEFAULT_DB_ALIAS, names, [known[name] for name in names])
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        from .cache import user_row
+
+        row = user_row(self.pk) if fields is not None and from_queryset is None else None
+        if row is None:
+            return super().refresh_from_db(using, fields, from_queryset)
+        for attname, value in row.items():
+            self.__dict__.setdefault(attname, value)
+
+    def save(self, *args, **kwargs):
+        # частина полів могла прийти з кешу, тож зберігати можна лише свіжий User
+        raise TypeError("ClaimsUser is read-only, load User from the database to save it")
@@ -1,6 +1,8 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 
+from .authentication import token_claims
 from .models import User
 
 
@@ -76,11 +78,27 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        token["email"] = user.email
-        token["role"] = user.role
+        token.payload.update(token_claims(user))
         return token
 
     def validate(self, attrs):
         data = super().validate(attrs)
         data["user"] = UserMeSerializer(self.user).data
         return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Claims нового access-токена беремо з актуального рядка, а не копіюємо з
+    refresh-токена: після зміни ролі достатньо оновити токен, без повторного логіну.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(id=refresh.payload.get(api_settings.USER_ID_CLAIM)).first()
+        if user is not None:
+            access = refresh.access_token
+            access.payload.update(token_claims(user))
+            data["access"] = str(access)
+        return data
@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import forget_user
+from .models import User
+
+# поля, що потрапляють у claims access-токена і впливають на доступ
+TOKEN_FIELDS = ("role", "is_active", "is_superuser", "is_staff")
+
+
+@receiver(pre_save, sender=User)
+def detect_token_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._bump_token_version = False
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    fields = [f for f in TOKEN_FIELDS if update_fields is None or f in update_fields]
+    if not fields:
+        return
+    old = User.objects.filter(pk=instance.pk).values(*fields).first()
+    instance._bump_token_version = old is not None and any(
+        old[f] != getattr(instance, f) for f in fields
+    )
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    if getattr(instance, "_bump_token_version", False):
+        instance._bump_token_version = False
+        User.objects.filter(pk=instance.pk).update(token_version=F("token_version") + 1)
+        instance.refresh_from_db(fields=["token_version"])
+
+    user_id = instance.pk
+    forget_user(user_id)
+    # і після коміту: інший потік міг закешувати ще не закомічений стан
+    transaction.on_commit(lambda: forget_user(user_id))
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    forget_user(instance.pk)
@@ -1 +1,158 @@
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from projects.models import Project, ProjectMember
+from rest_framework.test import APIClient
+
+from .models import ClaimsUser, User
+
+
+class ClaimsAuthenticationTests(TestCase):
+    """
+    request.user збирається з claims токена; token_version відкликає старі токени.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="secret-pass", role=User.Role.ADMIN
+        )
+        self.user = User.objects.create_user(
+            email="rec@example.com",
+            password="secret-pass",
+            role=User.Role.RECRUITER,
+            first_name="Olena",
+        )
+        self.client = APIClient()
+
+    def login(self, email):
+        response = self.client.post(
+            "/api/v1/auth/login/", {"email": email, "password": "secret-pass"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def as_token(self, access):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return client
+
+    def user_queries(self, ctx) -> int:
+        return sum('FROM "users_user"' in q["sql"] for q in ctx.captured_queries)
+
+    def test_requests_skip_user_lookup(self):
+        client = self.as_token(self.login("rec@example.com")["access"])
+        self.assertEqual(client.get("/api/v1/auth/me/").json()["first_name"], "Olena")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/v1/auth/me/")
+        self.assertEqual(response.json()["display_name"], "Olena")
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        # FK з request.user працює без завантаження рядка
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post("/api/v1/projects/", {"title": "Backend"}, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(self.user_queries(ctx), 0)
+        self.assertEqual(Project.objects.get().owner_id, self.user.id)
+
+        response = client.patch("/api/v1/auth/me/", {"position": "Lead"}, format="json")
+        self.assertEqual(response.json()["position"], "Lead")
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.position, self.user.first_name), ("Lead", "Olena"))
+
+        claims_user = ClaimsUser.from_claims(
+            self.user.id,
+            {"email": "x", "role": "ADMIN", "is_superuser": True, "is_staff": True, "ver": 0},
+        )
+        with self.assertRaises(TypeError):
+            claims_user.save()
+
+    def test_role_change_and_deactivation_revoke_tokens(self):
+        tokens = self.login("rec@example.com")
+        client = self.as_token(tokens["access"])
+        admin = self.as_token(self.login("admin@example.com")["access"])
+
+        response = admin.patch(f"/api/v1/users/{self.user.id}/", {"role": "VIEWER"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        response = client.get("/api/v1/auth/me/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_not_valid")
+
+        # оновлений токен несе нову роль
+        response = self.client.post(
+            "/api/v1/auth/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        client = self.as_token(response.json()["access"])
+        self.assertEqual(client.get("/api/v1/auth/me/").json()["role"], "VIEWER")
+
+        # зміна профілю токени не відкликає
+        admin.patch(f"/api/v1/users/{self.user.id}/", {"position": "QA"}, format="json")
+        self.assertEqual(client.get("/api/v1/auth/me/").status_code, 200)
+
+        admin.patch(f"/api/v1/users/{self.user.id}/", {"is_active": False}, format="json")
+        self.assertEqual(client.get("/api/v1/auth/me/").status_code, 401)
+        response = self.client.post(
+            "/api/v1/auth/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class BootstrapTests(TestCase):
+    """
+    auth/bootstrap/ — профіль, проєкти з матрицею прав і можливості ролі за один запит.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(email="hr@example.com", role=User.Role.HR_MANAGER)
+        self.user = User.objects.create_user(email="rec@example.com", role=User.Role.RECRUITER)
+        self.own = Project.objects.create(title="Own", owner=self.user)
+        self.viewed = Project.objects.create(title="Viewed", owner=self.owner)
+        Project.objects.create(title="Hidden", owner=self.owner)
+        ProjectMember.objects.create(
+            project=self.viewed, user=self.user, role=ProjectMember.Role.VIEWER
+        )
+        self.client = APIClient()
+
+    def bootstrap(self, user, **extra):
+        self.client.force_authenticate(user)
+        return self.client.get("/api/v1/auth/bootstrap/", **extra)
+
+    def test_memberships_and_permissions(self):
+        with self.assertNumQueries(1):
+            response = self.bootstrap(self.user)
+        data = response.json()
+
+        self.assertEqual(data["user"]["email"], "rec@example.com")
+        self.assertTrue(data["capabilities"]["create_projects"])
+        self.assertFalse(data["capabilities"]["manage_users"])
+        self.assertEqual(data["project_defaults"], {"read": False, "write": False, "manage": False})
+        by_title = {m["title"]: m for m in data["memberships"]}
+        self.assertEqual(set(by_title), {"Own", "Viewed"})
+        self.assertEqual(
+            by_title["Own"]["permissions"], {"read": True, "write": True, "manage": True}
+        )
+        self.assertEqual(
+            (by_title["Viewed"]["role"], by_title["Viewed"]["permissions"]),
+            ("VIEWER", {"read": True, "write": False, "manage": False}),
+        )
+
+        etag = response["ETag"]
+        self.assertEqual(self.bootstrap(self.user, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        ProjectMember.objects.filter(project=self.viewed, user=self.user).update(
+            role=ProjectMember.Role.RECRUITER
+        )
+        self.assertEqual(self.bootstrap(self.user, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # кількість запитів не залежить від кількості проєктів
+        for idx in range(5):
+            Project.objects.create(title=f"P{idx}", owner=self.user)
+        with self.assertNumQueries(1):
+            self.bootstrap(self.user)
+
+    def test_global_roles(self):
+        data = self.bootstrap(self.owner).json()
+        self.assertTrue(data["capabilities"]["view_all_projects"])
+        self.assertFalse(data["capabilities"]["create_users"])
+        self.assertEqual(data["project_defaults"], {"read": True, "write": True, "manage": True})
+        self.assertEqual(len(data["memberships"]), 2)
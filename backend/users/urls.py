@@ -1,15 +1,21 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 
-from .views import CustomTokenObtainPairView, MeView, UserViewSet
+from .views import (
+    BootstrapView,
+    CustomTokenObtainPairView,
+    CustomTokenRefreshView,
+    MeView,
+    UserViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"users", UserViewSet, basename="user")
 
 urlpatterns = [
     path("auth/login/", CustomTokenObtainPairView.as_view(), name="auth_login"),
-    path("auth/refresh/", TokenRefreshView.as_view(), name="auth_refresh"),
+    path("auth/refresh/", CustomTokenRefreshView.as_view(), name="auth_refresh"),
     path("auth/me/", MeView.as_view(), name="auth_me"),
+    path("auth/bootstrap/", BootstrapView.as_view(), name="auth_bootstrap"),
     path("", include(router.urls)),
 ]
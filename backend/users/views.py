@@ -1,13 +1,16 @@
+from core.conditional import ConditionalGetMixin
 from rest_framework import status, viewsets
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from .bootstrap import build_bootstrap
 from .models import User
 from .permissions import IsAdminOrHRRole, IsAdminRole
 from .serializers import (
     CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer,
     MeUpdateSerializer,
     UserCreateSerializer,
     UserListSerializer,
@@ -21,17 +24,43 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
-class MeView(APIView):
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
+
+class MeView(ConditionalGetMixin, APIView):
     permission_classes = [IsAuthenticated]
 
+    def get_validator(self, request):
+        # профіль request.user береться з кешу users/cache.py — відбиток без запитів
+        return sorted(UserMeSerializer(request.user).data.items())
+
     def get(self, request):
         return Response(UserMeSerializer(request.user).data)
 
     def patch(self, request):
-        serializer = MeUpdateSerializer(request.user, data=request.data, partial=True)
+        # зберігаємо свіжий рядок: request.user зібраний з claims і кешу
+        user = User.objects.get(pk=request.user.pk)
+        serializer = MeUpdateSerializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(UserMeSerializer(request.user).data, status=status.HTTP_200_OK)
+        return Response(UserMeSerializer(user).data, status=status.HTTP_200_OK)
+
+
+class BootstrapView(ConditionalGetMixin, APIView):
+    """
+    Усе, що фронту треба після логіну: профіль, проєкти з правами, можливості ролі.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_validator(self, request):
+        # payload коштує один запит — рахуємо його одразу і з нього ж ETag
+        self.payload = build_bootstrap(request, self)
+        return self.payload
+
+    def get(self, request):
+        return Response(self.payload)
 
 
 class UserViewSet(viewsets.ModelViewSet):